@@ -0,0 +1,110 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Headless benchmarks for Lollypop hot paths
+#
+# Usage (from source tree):
+#   python3 -m benchmarks --tracks 100000 --files 300 --output results.json
+#
+# A throw-away XDG environment is created before importing lollypop, so
+# user collection, cache and settings are never touched.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from time import time
+
+
+def setup_environment(root):
+    """
+        Redirect XDG dirs and GSettings to root
+        @param root as str
+    """
+    for name in ["XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_CONFIG_HOME"]:
+        path = os.path.join(root, name.lower())
+        os.makedirs(path, exist_ok=True)
+        os.environ[name] = path
+    schemas = os.path.join(root, "schemas")
+    os.makedirs(schemas, exist_ok=True)
+    source = os.path.join(os.path.dirname(__file__), "..", "data",
+                          "org.gnome.Lollypop.gschema.xml")
+    subprocess.check_call(["glib-compile-schemas",
+                           "--targetdir", schemas,
+                           os.path.dirname(os.path.abspath(source))])
+    os.environ["GSETTINGS_SCHEMA_DIR"] = schemas
+    os.environ["GSETTINGS_BACKEND"] = "memory"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="benchmarks",
+        description="Headless Lollypop benchmarks")
+    parser.add_argument("--tracks", type=int, default=100000,
+                        help="tracks in synthetic database")
+    parser.add_argument("--files", type=int, default=300,
+                        help="tagged audio files for scan benchmarks")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per benchmark, best/median are kept")
+    parser.add_argument("--only", default="",
+                        help="comma separated benchmark names")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file")
+    parser.add_argument("--workdir", default=None,
+                        help="keep generated library in this directory")
+    args = parser.parse_args()
+
+    root = args.workdir or tempfile.mkdtemp(prefix="lollypop-benchmarks-")
+    setup_environment(root)
+
+    # Import after environment setup: paths are computed at import time
+    from benchmarks.application import BenchmarkApplication
+    from benchmarks.library import SyntheticLibrary
+    from benchmarks.cases import BENCHMARKS, run_benchmark
+
+    app = BenchmarkApplication()
+    library = SyntheticLibrary(os.path.join(root, "music"))
+    library.create_files(args.files)
+    app.init(library.uri)
+    only = [name for name in args.only.split(",") if name]
+    results = {}
+    for (name, benchmark) in BENCHMARKS:
+        if only and name not in only:
+            continue
+        if benchmark.FILES:
+            if library.track_count:
+                library.clear_database()
+        elif library.track_count < args.tracks:
+            library.clear_database()
+            library.populate_database(args.tracks)
+        results[name] = run_benchmark(app, library, benchmark, args.repeat)
+        print("%-40s best %9.2fms  median %9.2fms" % (
+              name, results[name]["best_ms"], results[name]["median_ms"]))
+
+    report = {"timestamp": int(time()),
+              "version": app.version,
+              "python": platform.python_version(),
+              "machine": platform.machine(),
+              "tracks": args.tracks,
+              "files": args.files,
+              "results": results}
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import gi
+gi.require_version("Gst", "1.0")
+gi.require_version("GstAudio", "1.0")
+gi.require_version("GstPbutils", "1.0")
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gio, GLib, Gst, GstPbutils
+
+import re
+from os import path
+
+Gst.init(None)
+GstPbutils.pb_utils_init()
+
+from lollypop.settings import Settings
+from lollypop.database import Database
+from lollypop.database_cache import CacheDatabase
+from lollypop.database_albums import AlbumsDatabase
+from lollypop.database_artists import ArtistsDatabase
+from lollypop.database_genres import GenresDatabase
+from lollypop.database_tracks import TracksDatabase
+from lollypop.playlists import Playlists
+from lollypop.player import Player
+from lollypop.art import Art
+from lollypop.helper_task import TaskHelper
+from lollypop.ws_director import DirectorWebService
+from lollypop.collection_scanner import CollectionScanner
+
+
+class HeadlessProgress:
+    """
+        Progress bar replacement used by collection scanner
+    """
+
+    def add(self, parent):
+        pass
+
+    def set_fraction(self, fraction, parent):
+        pass
+
+
+class HeadlessContainer:
+    """
+        Container replacement used by collection scanner
+    """
+
+    def __init__(self):
+        self.progress = HeadlessProgress()
+
+    def add_overlay(self, widget):
+        pass
+
+    def go_home(self):
+        pass
+
+
+class HeadlessWindow:
+    """
+        Window replacement, benchmarks run without a display
+    """
+
+    def __init__(self):
+        self.container = HeadlessContainer()
+        self.folded = False
+
+
+class HeadlessNotify:
+    """
+        Notifications are dropped
+    """
+
+    def send(self, title, body=""):
+        pass
+
+
+class BenchmarkApplication(Gio.Application):
+    """
+        Application object exposing what lollypop modules get from App()
+        without a window
+    """
+
+    def __init__(self):
+        """
+            Init application
+        """
+        Gio.Application.__init__(
+            self,
+            application_id="org.gnome.Lollypop.Benchmarks",
+            flags=Gio.ApplicationFlags.NON_UNIQUE)
+        self.cursors = {}
+        self.debug = False
+        self.animations = False
+        self.window = HeadlessWindow()
+        self.notify = HeadlessNotify()
+        action = Gio.SimpleAction.new("update_db", None)
+        self.add_action(action)
+        self.set_default()
+
+    def init(self, music_uri):
+        """
+            Init lollypop objects
+            @param music_uri as str
+        """
+        self.settings = Settings.new()
+        self.settings.set_value("music-uris", GLib.Variant("as", [music_uri]))
+        self.settings.set_value("network-access", GLib.Variant("b", False))
+        self.db = Database()
+        self.cache = CacheDatabase()
+        self.playlists = Playlists()
+        self.albums = AlbumsDatabase(self.db)
+        self.artists = ArtistsDatabase(self.db)
+        self.genres = GenresDatabase(self.db)
+        self.tracks = TracksDatabase(self.db)
+        self.task_helper = TaskHelper()
+        self.art = Art()
+        self.ws_director = DirectorWebService()
+        self.player = Player()
+        self.scanner = CollectionScanner()
+
+    @property
+    def version(self):
+        """
+            Get version from meson.build
+            @return str
+        """
+        try:
+            filename = path.join(path.dirname(__file__), "..", "meson.build")
+            with open(filename) as f:
+                match = re.search(r"version: '([^']+)'", f.read())
+                if match is not None:
+                    return match.group(1)
+        except Exception:
+            pass
+        return "unknown"
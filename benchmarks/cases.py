@@ -0,0 +1,248 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio, GLib
+
+from random import Random
+from statistics import median
+from time import perf_counter
+
+from lollypop.define import App, ScanType, StorageType, OrderBy
+from lollypop.define import ArtBehaviour
+from lollypop.objects_album import Album
+from lollypop.search_local import LocalSearch
+
+
+# Requests as built by SmartPlaylistView
+SMART_REQUESTS = [
+    "SELECT DISTINCT(tracks.rowid) FROM tracks WHERE\
+     ( ((tracks.popularity >= '50')) ) AND\
+     ( ((tracks.year >= '1990')) ) ORDER BY random() LIMIT 100",
+    "SELECT DISTINCT(tracks.rowid) FROM tracks, genres, album_genres WHERE\
+     (album_genres.genre_id = genres.rowid\
+      AND tracks.album_id = album_genres.album_id\
+      AND ((genres.name LIKE '%Genre 1%' COLLATE NOCASE)) )\
+     ORDER BY random() LIMIT 100",
+    "SELECT DISTINCT(tracks.rowid) FROM tracks WHERE\
+     ( ((tracks.popularity >= '80')) ) UNION\
+     SELECT DISTINCT(tracks.rowid) FROM tracks WHERE\
+     ( ((tracks.year <= '1960')) ) ORDER BY random() LIMIT 100"
+]
+SEARCHES = ["la", "mor ven", "Artist 12", "sun bel ka"]
+
+
+class Benchmark:
+    """
+        A benchmark: prepare() is not timed, run() is
+        FILES benchmarks use scanned audio files, others a large database
+    """
+    FILES = False
+
+    def __init__(self, app, library):
+        """
+            Init benchmark
+            @param app as BenchmarkApplication
+            @param library as SyntheticLibrary
+        """
+        self._app = app
+        self._library = library
+
+    def prepare(self):
+        pass
+
+    def run(self):
+        pass
+
+
+class ScanBenchmark(Benchmark):
+    """
+        Full scan of synthetic files into an empty collection
+    """
+
+    FILES = True
+
+    def prepare(self):
+        self._library.clear_database()
+
+    def run(self):
+        scan(self._app)
+
+
+class NoopScanBenchmark(Benchmark):
+    """
+        Full scan with nothing changed on disk
+    """
+
+    FILES = True
+
+    def __init__(self, app, library):
+        Benchmark.__init__(self, app, library)
+        scan(app)
+
+    def run(self):
+        scan(self._app)
+
+
+class LocalSearchBenchmark(Benchmark):
+    """
+        LocalSearch.get() for a few searches
+    """
+
+    def __init__(self, app, library):
+        Benchmark.__init__(self, app, library)
+        self.__search = LocalSearch()
+
+    def run(self):
+        for search in SEARCHES:
+            self.__search.get(search, StorageType.COLLECTION,
+                              Gio.Cancellable.new())
+
+
+def get_albums_ids_benchmark(orderby):
+    """
+        Get a benchmark for AlbumsDatabase.get_ids() with orderby
+        @param orderby as OrderBy
+        @return class
+    """
+    class AlbumsIdsBenchmark(Benchmark):
+        def run(self):
+            App().albums.get_ids([], [], StorageType.COLLECTION,
+                                 False, orderby)
+    return AlbumsIdsBenchmark
+
+
+class SmartPlaylistBenchmark(Benchmark):
+    """
+        Run smart playlists requests
+    """
+
+    def run(self):
+        for request in SMART_REQUESTS:
+            App().db.execute(request)
+
+
+class ShuffleNextBenchmark(Benchmark):
+    """
+        1000 shuffle next tracks over 500 albums
+    """
+
+    def __init__(self, app, library):
+        Benchmark.__init__(self, app, library)
+        random = Random(42)
+        album_ids = App().albums.get_ids([], [], StorageType.COLLECTION,
+                                         False, OrderBy.NAME)
+        album_ids = random.sample(album_ids, min(500, len(album_ids)))
+        self.__albums = [Album(album_id) for album_id in album_ids]
+        App().settings.set_value("shuffle", GLib.Variant("b", True))
+
+    def prepare(self):
+        App().player.set_albums(list(self.__albums))
+        App().player._current_track = self.__albums[0].tracks[0]
+
+    def run(self):
+        player = App().player
+        for i in range(0, 1000):
+            player.set_next()
+            if player.next_track.id is None:
+                break
+            player._current_track = player.next_track
+
+
+class ArtworkBenchmark(Benchmark):
+    """
+        Load album artwork for scanned albums
+    """
+    FILES = True
+    CACHED = False
+
+    def __init__(self, app, library):
+        Benchmark.__init__(self, app, library)
+        scan(app)
+        album_ids = App().albums.get_ids([], [], StorageType.COLLECTION,
+                                         False, OrderBy.NAME)
+        self.__albums = [Album(album_id) for album_id in album_ids[:20]]
+        if self.CACHED:
+            self.run()
+
+    def prepare(self):
+        if not self.CACHED:
+            App().art.clean_all_cache()
+
+    def run(self):
+        for album in self.__albums:
+            App().art.get_album_artwork(album, 200, 200, 1,
+                                        ArtBehaviour.CACHE |
+                                        ArtBehaviour.CROP_SQUARE)
+
+
+class CachedArtworkBenchmark(ArtworkBenchmark):
+    CACHED = True
+
+
+BENCHMARKS = [
+    ("scan_full", ScanBenchmark),
+    ("scan_noop", NoopScanBenchmark),
+    ("artwork_cache_miss", ArtworkBenchmark),
+    ("artwork_cache_hit", CachedArtworkBenchmark),
+    ("local_search", LocalSearchBenchmark),
+    ("albums_get_ids_artist", get_albums_ids_benchmark(OrderBy.ARTIST)),
+    ("albums_get_ids_name", get_albums_ids_benchmark(OrderBy.NAME)),
+    ("albums_get_ids_year_desc",
+     get_albums_ids_benchmark(OrderBy.YEAR_DESC)),
+    ("albums_get_ids_year_asc", get_albums_ids_benchmark(OrderBy.YEAR_ASC)),
+    ("albums_get_ids_popularity",
+     get_albums_ids_benchmark(OrderBy.POPULARITY)),
+    ("albums_get_ids_genre", get_albums_ids_benchmark(OrderBy.GENRE)),
+    ("smart_playlists", SmartPlaylistBenchmark),
+    ("shuffle_next", ShuffleNextBenchmark),
+]
+
+
+def scan(app):
+    """
+        Run a full scan and wait for it
+        @param app as BenchmarkApplication
+    """
+    finished = []
+    signal_id = app.scanner.connect("scan-finished",
+                                    lambda *ignore: finished.append(True))
+    app.scanner.update(ScanType.FULL)
+    context = GLib.MainContext.default()
+    while not finished:
+        context.iteration(True)
+    app.scanner.disconnect(signal_id)
+
+
+def run_benchmark(app, library, cls, repeat):
+    """
+        Time benchmark
+        @param app as BenchmarkApplication
+        @param library as SyntheticLibrary
+        @param cls as class
+        @param repeat as int
+        @return {}
+    """
+    benchmark = cls(app, library)
+    runs = []
+    for i in range(0, repeat):
+        benchmark.prepare()
+        start = perf_counter()
+        benchmark.run()
+        runs.append((perf_counter() - start) * 1000)
+        # Let idle callbacks queued by benchmark run
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+    return {"runs_ms": runs,
+            "best_ms": min(runs),
+            "median_ms": median(runs),
+            "mean_ms": sum(runs) / len(runs)}
@@ -0,0 +1,238 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib, GdkPixbuf, Gst
+
+import os
+from random import Random
+from time import time
+
+from lollypop.define import App, StorageType
+from lollypop.sqlcursor import SqlCursor
+from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
+
+
+class SyntheticLibrary:
+    """
+        Generate a reproducible music library:
+        tagged audio files for scans and a large database for queries
+    """
+
+    TRACKS_PER_ALBUM = 10
+    ALBUMS_PER_ARTIST = 5
+    GENRES = 50
+    __SYLLABLES = ["la", "mor", "ven", "ti", "ka", "do", "ri", "sun", "bel",
+                   "an", "lo", "mi", "zar", "pe", "qui", "no", "ro", "sta",
+                   "fi", "del", "ur", "ma", "sol", "ne", "gra", "vi", "ta"]
+
+    def __init__(self, directory, seed=42):
+        """
+            Init library
+            @param directory as str
+            @param seed as int
+        """
+        self.__directory = directory
+        self.__seed = seed
+        self.__track_count = 0
+
+    def create_files(self, count):
+        """
+            Create tagged ogg files, existing files are kept
+            @param count as int
+        """
+        for i in range(0, count):
+            album = i // self.TRACKS_PER_ALBUM
+            artist = album // self.ALBUMS_PER_ARTIST
+            artist_name = self.__get_name("Artist", artist)
+            album_name = self.__get_name("Album", album)
+            title = self.__get_name("Track", i)
+            dirname = os.path.join(self.__directory, artist_name, album_name)
+            os.makedirs(dirname, exist_ok=True)
+            cover = os.path.join(dirname, "cover.jpg")
+            color = Random("%s-Cover-%s" % (self.__seed, album)).randint(
+                0, 0xffffff)
+            if not os.path.exists(cover):
+                pixbuf = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB,
+                                              False, 8, 500, 500)
+                pixbuf.fill(color << 8 | 0xff)
+                pixbuf.savev(cover, "jpeg", [], [])
+            filename = os.path.join(
+                dirname,
+                "%02d - %s.ogg" % (i % self.TRACKS_PER_ALBUM + 1, title))
+            if os.path.exists(filename):
+                continue
+            tags = Gst.TagList.new_empty()
+            tags.add_value(Gst.TagMergeMode.APPEND, Gst.TAG_TITLE, title)
+            tags.add_value(Gst.TagMergeMode.APPEND, Gst.TAG_ARTIST,
+                           artist_name)
+            tags.add_value(Gst.TagMergeMode.APPEND, Gst.TAG_ALBUM, album_name)
+            tags.add_value(Gst.TagMergeMode.APPEND, Gst.TAG_GENRE,
+                           "Genre %s" % (album % self.GENRES))
+            tags.add_value(Gst.TagMergeMode.APPEND, Gst.TAG_TRACK_NUMBER,
+                           i % self.TRACKS_PER_ALBUM + 1)
+            self.__encode(filename, tags)
+
+    def populate_database(self, count):
+        """
+            Fill collection database with count tracks
+            @param count as int
+        """
+        random = Random(self.__seed)
+        now = int(time())
+        albums = []
+        album_artists = []
+        album_genres = []
+        tracks = []
+        track_artists = []
+        track_genres = []
+        artists = []
+        genres = [(i + 1, "Genre %s" % i) for i in range(0, self.GENRES)]
+        album_count = max(1, count // self.TRACKS_PER_ALBUM)
+        for album_id in range(1, album_count + 1):
+            artist_id = (album_id - 1) // self.ALBUMS_PER_ARTIST + 1
+            artist_name = self.__get_name("Artist", artist_id)
+            if (album_id - 1) % self.ALBUMS_PER_ARTIST == 0:
+                artists.append((artist_id, artist_name, artist_name, ""))
+            album_name = self.__get_name("Album", album_id)
+            year = random.randint(1950, 2020)
+            timestamp = int(GLib.DateTime.new_utc(
+                year, 1, 1, 0, 0, 0).to_unix())
+            genre_id = random.randint(1, self.GENRES)
+            uri = GLib.filename_to_uri(
+                os.path.join(self.__directory, "db", str(album_id)))
+            albums.append((album_id, album_name, "",
+                           get_lollypop_album_id(album_name, [artist_name]),
+                           False, year, timestamp, uri,
+                           random.randint(0, 100), 0,
+                           random.random() < 0.05, now,
+                           StorageType.COLLECTION, 0))
+            album_artists.append((album_id, artist_id))
+            album_genres.append((album_id, genre_id))
+            for number in range(1, self.TRACKS_PER_ALBUM + 1):
+                track_id = len(tracks) + 1
+                title = self.__get_name("Track", track_id)
+                tracks.append((track_id, title,
+                               "%s/%02d.ogg" % (uri, number),
+                               random.randint(90000, 420000), number, 1, "",
+                               album_id, year, timestamp,
+                               random.randint(0, 100),
+                               random.random() < 0.02, 0,
+                               now - random.randint(0, 31536000)
+                               if random.random() < 0.3 else 0,
+                               now, StorageType.COLLECTION, "",
+                               get_lollypop_track_id(title, [artist_name],
+                                                     album_name),
+                               0))
+                track_artists.append((track_id, artist_id))
+                # Some featuring
+                if random.random() < 0.05:
+                    track_artists.append(
+                        (track_id, random.randint(1, artist_id)))
+                track_genres.append((track_id, genre_id))
+        with SqlCursor(App().db, True) as sql:
+            sql.executemany("INSERT INTO artists (id, name, sortname,\
+                             mb_artist_id) VALUES (?, ?, ?, ?)", artists)
+            sql.executemany("INSERT INTO genres (id, name)\
+                             VALUES (?, ?)", genres)
+            sql.executemany("INSERT INTO albums (id, name, mb_album_id,\
+                             lp_album_id, no_album_artist, year, timestamp,\
+                             uri, popularity, rate, loved, mtime,\
+                             storage_type, synced)\
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,\
+                                     ?, ?)", albums)
+            sql.executemany("INSERT INTO album_artists (album_id, artist_id)\
+                             VALUES (?, ?)", album_artists)
+            sql.executemany("INSERT INTO album_genres (album_id, genre_id)\
+                             VALUES (?, ?)", album_genres)
+            sql.executemany("INSERT INTO tracks (id, name, uri, duration,\
+                             tracknumber, discnumber, discname, album_id,\
+                             year, timestamp, popularity, loved, rate, ltime,\
+                             mtime, storage_type, mb_track_id, lp_track_id,\
+                             bpm)\
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,\
+                                     ?, ?, ?, ?, ?, ?)", tracks)
+            sql.executemany("INSERT INTO track_artists (track_id, artist_id)\
+                             VALUES (?, ?)", track_artists)
+            sql.executemany("INSERT INTO track_genres (track_id, genre_id)\
+                             VALUES (?, ?)", track_genres)
+            for table in ["albums", "artists", "genres"]:
+                sql.execute("UPDATE %s SET escaped_name=sql_escape(name)" %
+                            table)
+        App().artists.rebuild_featuring()
+        App().albums.update_max_count()
+        self.__track_count = len(tracks)
+
+    def clear_database(self):
+        """
+            Remove all collection content from database
+        """
+        with SqlCursor(App().db, True) as sql:
+            for table in ["albums", "artists", "genres", "tracks",
+                          "album_artists", "album_genres", "track_artists",
+                          "track_genres", "featuring"]:
+                sql.execute("DELETE FROM %s" % table)
+        App().cache.clear_table("duration")
+        self.__track_count = 0
+
+    @property
+    def uri(self):
+        """
+            Get library uri
+            @return str
+        """
+        return GLib.filename_to_uri(self.__directory)
+
+    @property
+    def track_count(self):
+        """
+            Get tracks in database
+            @return int
+        """
+        return self.__track_count
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_name(self, prefix, index):
+        """
+            Get a pronounceable name, unique thanks to index
+            Same name for same seed, prefix and index
+            @param prefix as str
+            @param index as int
+            @return str
+        """
+        random = Random("%s-%s-%s" % (self.__seed, prefix, index))
+        words = []
+        for i in range(0, random.randint(1, 3)):
+            word = "".join([random.choice(self.__SYLLABLES)
+                            for j in range(0, random.randint(1, 3))])
+            words.append(word.capitalize())
+        return "%s %s %s" % (" ".join(words), prefix, index)
+
+    def __encode(self, filename, tags):
+        """
+            Encode a short ogg file
+            @param filename as str
+            @param tags as Gst.TagList
+        """
+        pipeline = Gst.parse_launch(
+            "audiotestsrc num-buffers=10 samplesperbuffer=4410 !\
+             audioconvert ! vorbisenc name=encoder ! oggmux !\
+             filesink name=sink")
+        pipeline.get_by_name("sink").set_property("location", filename)
+        pipeline.get_by_name("encoder").merge_tags(
+            tags, Gst.TagMergeMode.REPLACE_ALL)
+        pipeline.set_state(Gst.State.PLAYING)
+        bus = pipeline.get_bus()
+        bus.timed_pop_filtered(Gst.CLOCK_TIME_NONE,
+                               Gst.MessageType.EOS | Gst.MessageType.ERROR)
+        pipeline.set_state(Gst.State.NULL)
@@ -10,6 +10,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from time import perf_counter
+# Startup timeline origin, before loading any module
+STARTUP_TIME = perf_counter()
+
 import gi
 gi.require_version("Gst", "1.0")
 gi.require_version("GstAudio", "1.0")
@@ -20,12 +24,13 @@ from gi.repository import Gtk, Gio, GLib, Gdk, Gst, GstPbutils, Handy
 Gst.init(None)
 GstPbutils.pb_utils_init()
 
-from threading import current_thread
+from threading import Lock, current_thread
 from pickle import dump
 from signal import signal, SIGINT, SIGTERM
 from urllib.parse import urlparse
 
 from lollypop.utils import init_proxy_from_gnome, emit_signal
+from lollypop.tracer import Tracer
 from lollypop.application_actions import ApplicationActions
 from lollypop.utils_file import get_file_type, install_youtube_dl
 from lollypop.define import LOLLYPOP_DATA_PATH, ScanType, StorageType, FileType
@@ -49,6 +54,7 @@ from lollypop.objects_album import Album
 from lollypop.helper_task import TaskHelper
 from lollypop.helper_art import ArtHelper
 from lollypop.collection_scanner import CollectionScanner
+IMPORTED_TIME = perf_counter()
 
 
 class Application(Gtk.Application, ApplicationActions):
@@ -78,6 +84,13 @@ class Application(Gtk.Application, ApplicationActions):
         # We force it to current python 3.6 name, to be sure in case of
         # change in python
         current_thread().setName("MainThread")
+        Tracer.install()
+        self.__add_startup_step("imports", STARTUP_TIME, IMPORTED_TIME)
+        self.__first_draw_id = None
+        # Not needed by first view, created on first use
+        self.__lazy_lock = Lock()
+        self.__similarities = None
+        self.__discoverer_helper = None
         (self.__proxy_host, self.__proxy_port) = init_proxy_from_gnome()
         GLib.setenv("PULSE_PROP_media.role", "music", True)
         GLib.setenv("PULSE_PROP_application.icon_name",
@@ -181,11 +194,8 @@ class Application(Gtk.Application, ApplicationActions):
         self.art_helper = ArtHelper()
         self.art = Art()
         self.art.update_art_size()
+        # Views connect to web services on init, started after first frame
         self.ws_director = DirectorWebService()
-        self.ws_director.start()
-        if not self.settings.get_value("disable-mpris"):
-            from lollypop.mpris import MPRIS
-            MPRIS(self)
 
         settings = Gtk.Settings.get_default()
         self.__gtk_dark = settings.get_property(
@@ -194,11 +204,6 @@ class Application(Gtk.Application, ApplicationActions):
             dark = self.settings.get_value("dark-ui")
             settings.set_property("gtk-application-prefer-dark-theme", dark)
         ApplicationActions.__init__(self)
-        monitor = Gio.NetworkMonitor.get_default()
-        if monitor.get_network_available() and\
-                not monitor.get_network_metered() and\
-                self.settings.get_value("recent-youtube-dl"):
-            self.task_helper.run(install_youtube_dl)
 
     def do_startup(self):
         """
@@ -207,13 +212,17 @@ class Application(Gtk.Application, ApplicationActions):
         Gtk.Application.do_startup(self)
         Handy.init()
         if self.__window is None:
+            start = perf_counter()
             from lollypop.window import Window
             self.init()
             self.__window = Window()
             self.__window.connect("delete-event", self.__hide_on_delete)
+            self.__first_draw_id = self.__window.connect(
+                "draw", self.__on_first_draw)
             self.__window.setup()
             self.__window.show()
             self.player.restore_state()
+            self.__add_startup_step("init", start, perf_counter())
 
     def quit(self, vacuum=False):
         """
@@ -232,6 +241,7 @@ class Application(Gtk.Application, ApplicationActions):
             self.__vacuum()
             self.art.clean_artwork()
         Gio.Application.quit(self)
+        Tracer.export()
         if GLib.environ_getenv(GLib.get_environ(), "DEBUG_LEAK") is not None:
             import gc
             gc.collect()
@@ -257,6 +267,32 @@ class Application(Gtk.Application, ApplicationActions):
         else:
             self.__fs_window.destroy()
 
+    @property
+    def similarities(self):
+        """
+            Get co-listening index
+            @return SimilaritiesDatabase
+        """
+        with self.__lazy_lock:
+            if self.__similarities is not None:
+                return self.__similarities
+            from lollypop.database_similarities import SimilaritiesDatabase
+            self.__similarities = SimilaritiesDatabase()
+            return self.__similarities
+
+    @property
+    def discoverer_helper(self):
+        """
+            Get shared discoverer
+            @return DiscovererHelper
+        """
+        with self.__lazy_lock:
+            if self.__discoverer_helper is not None:
+                return self.__discoverer_helper
+            from lollypop.helper_discoverer import DiscovererHelper
+            self.__discoverer_helper = DiscovererHelper()
+            return self.__discoverer_helper
+
     @property
     def proxy_host(self):
         """
@@ -341,6 +377,71 @@ class Application(Gtk.Application, ApplicationActions):
 #######################
 # PRIVATE             #
 #######################
+    def __add_startup_step(self, name, start, end):
+        """
+            Report a startup step in timeline
+            @param name as str
+            @param start as float (perf_counter())
+            @param end as float (perf_counter())
+        """
+        Logger.info("Startup: %s: %.1fms, at %.1fms", name,
+                    (end - start) * 1000, (end - STARTUP_TIME) * 1000)
+        if Tracer.ENABLED:
+            Tracer.add("startup", name, start, end)
+
+    def __deferred_init(self, steps):
+        """
+            Run one deferred startup step
+            @param steps as [(str, function)]
+            @return bool
+        """
+        if steps:
+            (name, step) = steps.pop(0)
+            start = perf_counter()
+            try:
+                step()
+            except Exception as e:
+                Logger.error("Application::__deferred_init(): %s, %s",
+                             name, e)
+            self.__add_startup_step(name, start, perf_counter())
+            return True
+        self.__add_startup_step("interactive", STARTUP_TIME, perf_counter())
+        return False
+
+    def __init_mpris(self):
+        """
+            Init MPRIS server
+        """
+        if not self.settings.get_value("disable-mpris"):
+            from lollypop.mpris import MPRIS
+            MPRIS(self)
+
+    def __update_youtube_dl(self):
+        """
+            Update youtube-dl if allowed
+        """
+        monitor = Gio.NetworkMonitor.get_default()
+        if monitor.get_network_available() and\
+                not monitor.get_network_metered() and\
+                self.settings.get_value("recent-youtube-dl"):
+            self.task_helper.run(install_youtube_dl)
+
+    def __on_first_draw(self, window, cr):
+        """
+            Report first frame and start deferred initialisation
+            @param window as Gtk.Window
+            @param cr as cairo.Context
+        """
+        window.disconnect(self.__first_draw_id)
+        self.__first_draw_id = None
+        self.__add_startup_step("first frame", STARTUP_TIME, perf_counter())
+        # Not needed by first view, wait for main loop to be idle
+        steps = [("mpris", self.__init_mpris),
+                 ("web services", self.ws_director.start),
+                 ("youtube-dl", self.__update_youtube_dl)]
+        GLib.idle_add(self.__deferred_init, steps,
+                      priority=GLib.PRIORITY_LOW)
+
     def __save_state(self):
         """
             Save player state
@@ -387,6 +488,7 @@ class Application(Gtk.Application, ApplicationActions):
             self.genres.clean(False)
             SqlCursor.remove(self.db)
             self.cache.clean(True)
+            self.similarities.clean(True)
 
             with SqlCursor(self.db) as sql:
                 sql.isolation_level = None
@@ -19,6 +19,7 @@ from lollypop.art_album import AlbumArt
 from lollypop.art_artist import ArtistArt
 from lollypop.art_downloader import DownloaderArt
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 from lollypop.define import CACHE_PATH, ALBUMS_WEB_PATH, ALBUMS_PATH
 from lollypop.define import ARTISTS_PATH, TimeStamp
 from lollypop.define import App
@@ -95,6 +96,7 @@ class Art(BaseArt, AlbumArt, ArtistArt, DownloaderArt):
         except Exception as e:
             Logger.error("Art::remove_artwork_from_cache(): %s" % e)
 
+    @Tracer.trace("art")
     def get_artwork_from_cache(self, name, prefix, width, height):
         """
             Get artwork from cache
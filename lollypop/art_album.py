@@ -16,10 +16,10 @@ from random import choice
 from gettext import gettext as _
 from time import time
 
-from lollypop.tagreader import Discoverer
 from lollypop.define import App, ArtSize, ArtBehaviour, StorageType
 from lollypop.define import CACHE_PATH, ALBUMS_WEB_PATH, ALBUMS_PATH
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 from lollypop.utils_file import is_readonly
 from lollypop.utils import emit_signal
 from lollypop.helper_task import TaskHelper
@@ -101,6 +101,7 @@ class AlbumArt:
             Logger.error("AlbumArt::get_album_artwork_uri(): %s", e)
         return None
 
+    @Tracer.trace("art")
     def get_first_album_artwork(self, album):
         """
             Get first locally available artwork for album
@@ -154,6 +155,7 @@ class AlbumArt:
             Logger.error("AlbumArt::get_album_artworks(): %s", e)
         return uris
 
+    @Tracer.trace("art")
     def get_album_artwork(self, album, width, height, scale_factor,
                           behaviour=ArtBehaviour.CACHE |
                           ArtBehaviour.CROP_SQUARE):
@@ -335,8 +337,7 @@ class AlbumArt:
         if uri.startswith("web:"):
             return
         try:
-            discoverer = Discoverer()
-            info = discoverer.get_info(uri)
+            info = App().discoverer_helper.get_info_sync(uri)
             exist = False
             if info is not None:
                 (exist, sample) = info.get_tags().get_sample_index("image", 0)
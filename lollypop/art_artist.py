@@ -17,6 +17,7 @@ from hashlib import md5
 from lollypop.define import ArtBehaviour, ArtSize, App
 from lollypop.define import CACHE_PATH, ARTISTS_PATH
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 from lollypop.utils import emit_signal, escape, get_default_storage_type
 
 
@@ -71,6 +72,7 @@ class ArtistArt:
             pixbuf.savev(filepath, "jpeg", ["quality"], ["100"])
         emit_signal(self, "artist-artwork-changed", artist)
 
+    @Tracer.trace("art")
     def get_artist_artwork(self, artist, width, height, scale_factor,
                            behaviour=ArtBehaviour.CACHE):
         """
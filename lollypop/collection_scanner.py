@@ -25,6 +25,7 @@ from gettext import gettext as _
 from time import time
 from urllib.parse import urlparse
 from multiprocessing import cpu_count
+from threading import Lock
 
 from lollypop.collection_item import CollectionItem
 from lollypop.inotify import Inotify
@@ -33,12 +34,14 @@ from lollypop.define import FileType
 from lollypop.sqlcursor import SqlCursor
 from lollypop.tagreader import TagReader, Discoverer
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 from lollypop.database_history import History
 from lollypop.objects_track import Track
 from lollypop.utils_file import is_audio, is_pls, get_mtime, get_file_type
 from lollypop.utils_album import tracks_to_albums
 from lollypop.utils import emit_signal, profile, split_list
 from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
+from lollypop.database_sampler import RandomSampler
 
 
 SCAN_QUERY_INFO = "{},{},{},{},{},{}".format(
@@ -69,6 +72,9 @@ class CollectionScanner(GObject.GObject, TagReader):
         self.__tags = {}
         self.__items = []
         self.__pending_new_artist_ids = []
+        # Albums needing a featuring update
+        self.__featuring_album_ids = set()
+        self.__featuring_lock = Lock()
         self.__history = History()
         self.__progress_total = 1
         self.__progress_count = 0
@@ -209,6 +215,7 @@ class CollectionScanner(GObject.GObject, TagReader):
             different artists
             @param item as CollectionItem
         """
+        self.add_featuring_album_ids([item.album_id])
         if item.album_artist_ids:
             App().albums.set_artist_ids(item.album_id, item.album_artist_ids)
         # Set artist ids based on content
@@ -282,6 +289,7 @@ class CollectionScanner(GObject.GObject, TagReader):
                                    album_loved, album_pop, album_rate,
                                    album_synced)
             App().tracks.remove(track_id)
+            self.add_featuring_album_ids([album_id])
             genre_ids = App().tracks.get_genre_ids(track_id)
             App().albums.clean()
             App().genres.clean()
@@ -309,6 +317,24 @@ class CollectionScanner(GObject.GObject, TagReader):
         except Exception as e:
             Logger.error("CollectionScanner::del_from_db: %s" % e)
 
+    def add_featuring_album_ids(self, album_ids):
+        """
+            Mark albums as needing a featuring update
+            @param album_ids as [int]
+        """
+        with self.__featuring_lock:
+            self.__featuring_album_ids.update(album_ids)
+
+    def update_featuring(self):
+        """
+            Update featuring for albums changed since last call
+        """
+        with self.__featuring_lock:
+            album_ids = self.__featuring_album_ids
+            self.__featuring_album_ids = set()
+        if album_ids:
+            App().artists.update_featuring(album_ids)
+
     def is_locked(self):
         """
             True if db locked
@@ -392,10 +418,12 @@ class CollectionScanner(GObject.GObject, TagReader):
             GLib.idle_add(App().window.container.progress.set_fraction,
                           new_fraction, self)
 
-    def __finish(self, items):
+    @Tracer.trace("scanner")
+    def __finish(self, items, scan_type):
         """
             Notify from main thread when scan finished
             @param items as [CollectionItem]
+            @param scan_type as ScanType
         """
         track_ids = [item.track_id for item in items]
         self.__thread = None
@@ -406,8 +434,18 @@ class CollectionScanner(GObject.GObject, TagReader):
         emit_signal(self, "scan-finished", track_ids)
         # Update max count value
         App().albums.update_max_count()
+        # Popularities may have been restored from history
+        App().albums.update_popularities()
+        App().tracks.update_popularities()
+        # Random candidates may have changed
+        RandomSampler.invalidate()
+        # Update co-listening index, at most daily for small scans
+        App().task_helper.run(App().similarities.rebuild,
+                              scan_type == ScanType.FULL)
         # Update featuring
-        App().artists.update_featuring()
+        self.update_featuring()
+        if scan_type == ScanType.FULL:
+            App().task_helper.run(App().artists.check_featuring)
         if App().ws_director.collection_ws is not None:
             App().ws_director.collection_ws.start()
 
@@ -532,20 +570,22 @@ class CollectionScanner(GObject.GObject, TagReader):
             # Start getting files and populating DB
             self.__items = []
             i = 0
-            while threads:
-                thread = threads[i]
-                if not thread.is_alive():
-                    threads.remove(thread)
-                self.__items += self.__save_in_db(storage_type)
-                if i >= len(threads) - 1:
-                    i = 0
-                else:
-                    i += 1
+            with Tracer.span("scanner", "save"):
+                while threads:
+                    thread = threads[i]
+                    if not thread.is_alive():
+                        threads.remove(thread)
+                    self.__items += self.__save_in_db(storage_type)
+                    if i >= len(threads) - 1:
+                        i = 0
+                    else:
+                        i += 1
 
             # Add streams to DB, only happening on command line/m3u files
             self.__items += self.__save_streams_in_db(streams, storage_type)
 
-            self.__remove_old_tracks(db_uris, scan_type)
+            with Tracer.span("scanner", "remove old tracks"):
+                self.__remove_old_tracks(db_uris, scan_type)
 
             if scan_type == ScanType.EXTERNAL:
                 albums = tracks_to_albums(
@@ -553,7 +593,7 @@ class CollectionScanner(GObject.GObject, TagReader):
                 App().player.play_albums(albums)
             else:
                 self.__add_monitor(dirs)
-                GLib.idle_add(self.__finish, self.__items)
+                GLib.idle_add(self.__finish, self.__items, scan_type)
             self.__tags = {}
             self.__items = []
             self.__pending_new_artist_ids = []
@@ -729,6 +769,7 @@ class CollectionScanner(GObject.GObject, TagReader):
                     Logger.warning("Removed, file has been deleted: %s", uri)
                     self.del_from_db(uri, True)
 
+    @Tracer.trace("scanner")
     def __get_tags(self, discoverer, uri, track_mtime):
         """
             Read track tags
@@ -738,10 +779,8 @@ class CollectionScanner(GObject.GObject, TagReader):
             @return ()
         """
         f = Gio.File.new_for_uri(uri)
-        info = discoverer.get_info(uri)
-        tags = info.get_tags()
+        (tags, duration) = discoverer.get_tags(uri)
         name = f.get_basename()
-        duration = int(info.get_duration() / 1000000)
         Logger.debug("CollectionScanner::add2db(): Restore stats")
         # Restore stats
         track_id = App().tracks.get_id_by_uri(uri)
@@ -812,6 +851,7 @@ class CollectionScanner(GObject.GObject, TagReader):
                 mb_album_artist_id, tracknumber, track_pop, track_rate, bpm,
                 track_mtime, track_ltime, track_loved, duration)
 
+    @Tracer.trace("scanner")
     def __add2db(self, uri, name, artists,
                  genres, a_sortnames, aa_sortnames, album_artists, album_name,
                  discname, album_loved, album_mtime, album_synced, album_rate,
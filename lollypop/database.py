@@ -60,6 +60,7 @@ class Database:
     # this make VACUUM not destroy rowids...
     __create_albums = """CREATE TABLE albums (id INTEGER PRIMARY KEY,
                                               name TEXT NOT NULL,
+                                              escaped_name TEXT,
                                               mb_album_id TEXT,
                                               lp_album_id TEXT,
                                               no_album_artist BOOLEAN NOT NULL,
@@ -74,13 +75,15 @@ class Database:
                                               synced INT NOT NULL)"""
     __create_artists = """CREATE TABLE artists (id INTEGER PRIMARY KEY,
                                                name TEXT NOT NULL,
+                                               escaped_name TEXT,
                                                sortname TEXT NOT NULL,
                                                mb_artist_id TEXT)"""
     __create_featuring = """CREATE TABLE featuring (
                                                artist_id INT NOT NULL,
                                                album_id INT NOT NULL)"""
     __create_genres = """CREATE TABLE genres (id INTEGER PRIMARY KEY,
-                                            name TEXT NOT NULL)"""
+                                            name TEXT NOT NULL,
+                                            escaped_name TEXT)"""
     __create_album_artists = """CREATE TABLE album_artists (
                                                 album_id INT NOT NULL,
                                                 artist_id INT NOT NULL)"""
@@ -125,6 +128,12 @@ class Database:
                                                 album_id)"""
     __create_track_genres_idx = """CREATE index idx_tg ON track_genres(
                                                 track_id)"""
+    __create_albums_escaped_idx = """CREATE index idx_albums_escaped
+                                     ON albums(escaped_name)"""
+    __create_artists_escaped_idx = """CREATE index idx_artists_escaped
+                                      ON artists(escaped_name)"""
+    __create_genres_escaped_idx = """CREATE index idx_genres_escaped
+                                     ON genres(escaped_name)"""
 
     def __init__(self):
         """
@@ -154,6 +163,9 @@ class Database:
                     sql.execute(self.__create_track_artists_idx)
                     sql.execute(self.__create_album_genres_idx)
                     sql.execute(self.__create_track_genres_idx)
+                    sql.execute(self.__create_albums_escaped_idx)
+                    sql.execute(self.__create_artists_escaped_idx)
+                    sql.execute(self.__create_genres_escaped_idx)
                     sql.execute("PRAGMA user_version=%s" % upgrade.version)
             except Exception as e:
                 Logger.error("Database::__init__(): %s" % e)
@@ -15,9 +15,11 @@ from time import time
 from random import shuffle
 
 from lollypop.sqlcursor import SqlCursor
+from lollypop.database_popularity import PopularityCache
+from lollypop.database_sampler import RandomSampler
 from lollypop.define import App, Type, OrderBy, StorageType
 from lollypop.logger import Logger
-from lollypop.utils import remove_static, make_subrequest
+from lollypop.utils import remove_static, make_subrequest, sql_escape
 
 
 class AlbumsDatabase:
@@ -32,6 +34,8 @@ class AlbumsDatabase:
         """
         self.__db = db
         self.__max_count = 1
+        self.__popularity_cache = PopularityCache(db, "albums", 1000)
+        self.__sampler = RandomSampler(db)
 
     def add(self, album_name, mb_album_id, lp_album_id, artist_ids,
             uri, loved, popularity, rate, synced, mtime, storage_type):
@@ -53,12 +57,13 @@ class AlbumsDatabase:
         """
         with SqlCursor(self.__db, True) as sql:
             result = sql.execute("INSERT INTO albums\
-                                  (name, mb_album_id, lp_album_id,\
-                                   no_album_artist, uri,\
+                                  (name, escaped_name, mb_album_id,\
+                                   lp_album_id, no_album_artist, uri,\
                                    loved, popularity, rate, mtime, synced,\
                                    storage_type)\
-                                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                                 (album_name, mb_album_id or None, lp_album_id,
+                                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (album_name, sql_escape(album_name),
+                                  mb_album_id or None, lp_album_id,
                                   artist_ids == [], uri, loved, popularity,
                                   rate, mtime, synced, storage_type))
             for artist_id in artist_ids:
@@ -152,6 +157,7 @@ class AlbumsDatabase:
         with SqlCursor(self.__db, True) as sql:
             sql.execute("UPDATE albums SET loved=? WHERE rowid=?",
                         (loved, album_id))
+        RandomSampler.invalidate()
 
     def set_rate(self, album_id, rate):
         """
@@ -206,6 +212,22 @@ class AlbumsDatabase:
             sql.execute("UPDATE albums SET storage_type=?\
                          WHERE rowid=?",
                         (storage_type, album_id))
+        RandomSampler.invalidate()
+
+    def set_storage_type_for_ids(self, album_ids, storage_type,
+                                 commit=True):
+        """
+            Set storage type for albums
+            @param album_ids as [int]
+            @param storage_type as int
+            @param commit as bool
+        """
+        with SqlCursor(self.__db, commit) as sql:
+            sql.executemany("UPDATE albums SET storage_type=?\
+                             WHERE rowid=?",
+                            [(storage_type, album_id)
+                             for album_id in album_ids])
+        RandomSampler.invalidate()
 
     def set_popularity(self, album_id, popularity):
         """
@@ -215,8 +237,13 @@ class AlbumsDatabase:
         """
         with SqlCursor(self.__db, True) as sql:
             try:
+                result = sql.execute("SELECT popularity FROM albums\
+                                      WHERE rowid=?", (album_id,))
+                v = result.fetchone()
                 sql.execute("UPDATE albums set popularity=? WHERE rowid=?",
                             (popularity, album_id))
+                if v is not None:
+                    self.__popularity_cache.update(v[0] or 0, popularity)
             except:  # Database is locked
                 pass
 
@@ -392,6 +419,8 @@ class AlbumsDatabase:
             current += pop_to_add
             sql.execute("UPDATE albums SET popularity=? WHERE rowid=?",
                         (current, album_id))
+            if pop:
+                self.__popularity_cache.update(pop[0], current)
             # Then increment timed popularity
             result = sql.execute("SELECT popularity\
                                   FROM albums_timed_popularity\
@@ -411,34 +440,25 @@ class AlbumsDatabase:
                              VALUES (?, 1, ?)",
                             (album_id, mtime))
 
+    def update_popularities(self):
+        """
+            Reload popularity statistics on next access
+        """
+        self.__popularity_cache.invalidate()
+
     def get_higher_popularity(self):
         """
             Get higher available popularity
             @return int
         """
-        with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT popularity\
-                                  FROM albums\
-                                  ORDER BY POPULARITY DESC LIMIT 1")
-            v = result.fetchone()
-            if v is not None:
-                return v[0]
-            return 0
+        return self.__popularity_cache.get_higher()
 
     def get_avg_popularity(self):
         """
             Return avarage popularity
             @return avarage popularity as int
         """
-        with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT AVG(popularity)\
-                                  FROM (SELECT popularity\
-                                        FROM albums\
-                                        ORDER BY POPULARITY DESC LIMIT 1000)")
-            v = result.fetchone()
-            if v and v[0] is not None and v[0] > 5:
-                return v[0]
-            return 5
+        return self.__popularity_cache.get_avg()
 
     def get_id(self, album_name, mb_album_id, artist_ids):
         """
@@ -489,7 +509,7 @@ class AlbumsDatabase:
         with SqlCursor(self.__db) as sql:
             filters = (album_name,)
             request = "SELECT albums.rowid FROM albums, album_artists\
-                       WHERE sql_escape(name)=? COLLATE NOCASE AND\
+                       WHERE escaped_name=? AND\
                        album_artists.album_id=albums.rowid"
             if artist_ids:
                 request += " AND (1=0 "
@@ -752,6 +772,20 @@ class AlbumsDatabase:
                 return album_ids
         return []
 
+    def get_timed_popularity_artist_ids(self):
+        """
+            Get artists of popular albums, ordered by last listen
+            @return [(int, int)] (mtime, artist id)
+        """
+        with SqlCursor(self.__db) as sql:
+            request = "SELECT albums_timed_popularity.mtime,\
+                              album_artists.artist_id\
+                       FROM albums_timed_popularity, album_artists\
+                       WHERE album_artists.album_id =\
+                             albums_timed_popularity.album_id\
+                       ORDER BY albums_timed_popularity.mtime"
+            return list(sql.execute(request))
+
     def get_loved_albums(self, storage_type):
         """
             Get loved albums
@@ -792,27 +826,23 @@ class AlbumsDatabase:
             @param limit as int
             @return [int]
         """
-        with SqlCursor(self.__db) as sql:
-            if genre_id is not None:
-                filter = (storage_type, genre_id, limit)
-                request = "SELECT DISTINCT albums.rowid\
-                           FROM albums, album_genres\
-                           WHERE albums.storage_type & ? AND\
-                                 album_genres.album_id = albums.rowid AND\
-                                 album_genres.genre_id = ?"
-                if not skipped:
-                    request += " AND loved != -1 "
-                request += "ORDER BY random() LIMIT ?"
-            else:
-                filter = (storage_type, limit)
-                request = "SELECT DISTINCT rowid FROM albums\
-                           WHERE storage_type & ?"
-                if not skipped:
-                    request += " AND loved != -1 "
-                request += "ORDER BY random() LIMIT ?"
-            result = sql.execute(request, filter)
-            albums = list(itertools.chain(*result))
-            return albums
+        if genre_id is not None:
+            filter = (storage_type, genre_id)
+            request = "SELECT DISTINCT albums.rowid\
+                       FROM albums, album_genres\
+                       WHERE albums.storage_type & ? AND\
+                             album_genres.album_id = albums.rowid AND\
+                             album_genres.genre_id = ?"
+            if not skipped:
+                request += " AND loved != -1 "
+        else:
+            filter = (storage_type,)
+            request = "SELECT DISTINCT rowid FROM albums\
+                       WHERE storage_type & ?"
+            if not skipped:
+                request += " AND loved != -1 "
+        result = self.__sampler.get(request, filter, limit)
+        return list(itertools.chain(*result))
 
     def get_randoms_by_artists(self, storage_type, genre_id, skipped, limit):
         """
@@ -823,35 +853,33 @@ class AlbumsDatabase:
             @param limit as int
             @return [int]
         """
-        with SqlCursor(self.__db) as sql:
-            if genre_id is not None:
-                filter = (storage_type, genre_id, limit * 2, limit)
-                request = "SELECT rowid, artist_id FROM (\
-                               SELECT albums.rowid, album_artists.artist_id\
-                               FROM albums, album_genres, album_artists\
-                               WHERE albums.rowid = album_artists.album_id AND\
-                                     albums.storage_type & ? AND\
-                                     album_genres.album_id = albums.rowid AND\
-                                     album_genres.genre_id = ?"
-                if not skipped:
-                    request += " AND loved != -1 "
-                request += "ORDER BY random() LIMIT ?)\
-                            GROUP BY artist_id ORDER BY random() LIMIT ?"
-            else:
-                filter = (storage_type, limit * 2, limit)
-                request = "SELECT rowid, artist_id FROM (\
-                               SELECT albums.rowid, album_artists.artist_id\
-                               FROM albums, album_artists\
-                               WHERE albums.rowid = album_artists.album_id AND\
-                                     albums.storage_type & ?"
-                if not skipped:
-                    request += " AND loved != -1 "
-                request += "ORDER BY random() LIMIT ?)\
-                            GROUP BY artist_id ORDER BY random() LIMIT ?"
-            album_ids = []
-            for (album_id, artist_id) in sql.execute(request, filter):
+        if genre_id is not None:
+            filter = (storage_type, genre_id)
+            request = "SELECT albums.rowid, album_artists.artist_id\
+                       FROM albums, album_genres, album_artists\
+                       WHERE albums.rowid = album_artists.album_id AND\
+                             albums.storage_type & ? AND\
+                             album_genres.album_id = albums.rowid AND\
+                             album_genres.genre_id = ?"
+            if not skipped:
+                request += " AND loved != -1 "
+        else:
+            filter = (storage_type,)
+            request = "SELECT albums.rowid, album_artists.artist_id\
+                       FROM albums, album_artists\
+                       WHERE albums.rowid = album_artists.album_id AND\
+                             albums.storage_type & ?"
+            if not skipped:
+                request += " AND loved != -1 "
+        # One album per artist
+        album_ids = []
+        artist_ids = set()
+        for (album_id, artist_id) in self.__sampler.get(request, filter,
+                                                        limit * 2):
+            if artist_id not in artist_ids:
+                artist_ids.add(artist_id)
                 album_ids.append(album_id)
-            return album_ids
+        return album_ids[:limit]
 
     def get_randoms(self, storage_type, genre_id, skipped, limit):
         """
@@ -918,6 +946,22 @@ class AlbumsDatabase:
             result = sql.execute(request, (album_id,))
             return list(itertools.chain(*result))
 
+    def get_track_ids(self, album_id, storage_type, skipped):
+        """
+            Get track ids for album id
+            @param album_id as int
+            @param storage_type as StorageType
+            @param skipped as bool
+            @return [int]
+        """
+        with SqlCursor(self.__db) as sql:
+            request = "SELECT rowid FROM tracks\
+                       WHERE album_id=? AND storage_type&?"
+            if not skipped:
+                request += " AND loved != -1"
+            result = sql.execute(request, (album_id, storage_type))
+            return list(itertools.chain(*result))
+
     def get_disc_track_ids(self, album_id, genre_ids, artist_ids,
                            disc, storage_type, skipped):
         """
@@ -1436,6 +1480,8 @@ class AlbumsDatabase:
             month = int(time()) - 2678400
             sql.execute("DELETE FROM albums_timed_popularity\
                          WHERE albums_timed_popularity.mtime < ?", (month,))
+        self.update_popularities()
+        RandomSampler.invalidate()
 
     @property
     def max_count(self):
@@ -14,9 +14,11 @@ from gettext import gettext as _
 import itertools
 
 from lollypop.sqlcursor import SqlCursor
+from lollypop.database_sampler import RandomSampler
+from lollypop.logger import Logger
 from lollypop.define import App, Type, StorageType, OrderBy
 from lollypop.utils import get_default_storage_type, make_subrequest
-from lollypop.utils import format_artist_name, remove_static
+from lollypop.utils import format_artist_name, remove_static, sql_escape
 
 
 class ArtistsDatabase:
@@ -24,12 +26,24 @@ class ArtistsDatabase:
         Artists database helper
     """
 
+    # Track artists not in album artists
+    __featuring_select = """SELECT DISTINCT track_artists.artist_id,
+                                            tracks.album_id
+                            FROM tracks, track_artists
+                            WHERE track_artists.track_id = tracks.rowid
+                            AND NOT EXISTS (
+                             SELECT * FROM album_artists WHERE
+                             album_artists.album_id = tracks.album_id AND
+                             album_artists.artist_id =
+                                track_artists.artist_id)"""
+
     def __init__(self, db):
         """
             Init artists database object
             @param db as Database
         """
         self.__db = db
+        self.__sampler = RandomSampler(db)
 
     def add(self, name, sortname, mb_artist_id):
         """
@@ -43,10 +57,11 @@ class ArtistsDatabase:
         if sortname == "":
             sortname = format_artist_name(name)
         with SqlCursor(self.__db, True) as sql:
-            result = sql.execute("INSERT INTO artists (name, sortname,\
-                                  mb_artist_id)\
-                                  VALUES (?, ?, ?)",
-                                 (name, sortname, mb_artist_id))
+            result = sql.execute("INSERT INTO artists (name, escaped_name,\
+                                  sortname, mb_artist_id)\
+                                  VALUES (?, ?, ?, ?)",
+                                 (name, sql_escape(name),
+                                  sortname, mb_artist_id))
             return result.lastrowid
 
     def set_sortname(self, artist_id, sort_name):
@@ -104,7 +119,7 @@ class ArtistsDatabase:
             @return int
         """
         with SqlCursor(self.__db) as sql:
-            request = "SELECT rowid from artists WHERE sql_escape(name)=?"
+            request = "SELECT rowid from artists WHERE escaped_name=?"
             result = sql.execute(request, (name,))
             v = result.fetchone()
             if v is not None:
@@ -142,9 +157,9 @@ class ArtistsDatabase:
         """
         with SqlCursor(self.__db, True) as sql:
             sql.execute("UPDATE artists\
-                         SET name=?\
+                         SET name=?, escaped_name=?\
                          WHERE rowid=?",
-                        (name, artist_id))
+                        (name, sql_escape(name), artist_id))
 
     def set_mb_artist_id(self, artist_id, mb_artist_id):
         """
@@ -235,19 +250,16 @@ class ArtistsDatabase:
             @param limit as int
             @return [int, str, str]
         """
-        with SqlCursor(self.__db) as sql:
-            request = "SELECT DISTINCT artists.rowid,\
-                                       artists.name,\
-                                       artists.sortname\
-                                  FROM artists, albums, album_artists\
-                                  WHERE album_artists.artist_id=artists.rowid\
-                                  AND album_artists.album_id=albums.rowid\
-                                  AND albums.storage_type & ?\
-                                  AND albums.loved != -1\
-                                  ORDER BY random() LIMIT ?\
-                                  COLLATE NOCASE COLLATE LOCALIZED"
-            result = sql.execute(request, (storage_type, limit))
-            return [(row[0], row[1], row[2]) for row in result]
+        request = "SELECT DISTINCT artists.rowid,\
+                                   artists.name,\
+                                   artists.sortname\
+                   FROM artists, albums, album_artists\
+                   WHERE album_artists.artist_id=artists.rowid\
+                   AND album_artists.album_id=albums.rowid\
+                   AND albums.storage_type & ?\
+                   AND albums.loved != -1"
+        result = self.__sampler.get(request, (storage_type,), limit)
+        return [(row[0], row[1], row[2]) for row in result]
 
     def get_ids(self, genre_ids, storage_type):
         """
@@ -307,23 +319,53 @@ class ArtistsDatabase:
             result = sql.execute(request, filters)
             return list(itertools.chain(*result))
 
-    def update_featuring(self):
+    def update_featuring(self, album_ids):
+        """
+            Calculate featuring for albums
+            @param album_ids as [int]
+        """
+        album_ids = list(album_ids)
+        with SqlCursor(self.__db, True) as sql:
+            # Stay under SQLITE_MAX_VARIABLE_NUMBER
+            for i in range(0, len(album_ids), 500):
+                chunk = album_ids[i:i + 500]
+                subrequest = ",".join(["?"] * len(chunk))
+                sql.execute("DELETE FROM featuring\
+                             WHERE album_id IN (%s)" % subrequest, chunk)
+                sql.execute("INSERT INTO featuring (artist_id, album_id) " +
+                            self.__featuring_select +
+                            " AND tracks.album_id IN (%s)" % subrequest,
+                            chunk)
+
+    def rebuild_featuring(self):
         """
             Calculate featuring for current DB
         """
         with SqlCursor(self.__db, True) as sql:
             sql.execute("DELETE FROM featuring")
-            result = sql.execute(
-                        "SELECT track_artists.artist_id, tracks.album_id\
-                         FROM tracks, track_artists\
-                         WHERE track_artists.track_id = tracks.rowid\
-                         AND NOT EXISTS (\
-                          SELECT * FROM album_artists WHERE\
-                          album_artists.album_id = tracks.album_id AND\
-                          album_artists.artist_id = track_artists.artist_id)")
-            for (artist_id, album_id) in result:
-                sql.execute("INSERT INTO featuring (artist_id, album_id)\
-                             VALUES (?, ?)", (artist_id, album_id))
+            sql.execute("INSERT INTO featuring (artist_id, album_id) " +
+                        self.__featuring_select)
+
+    def check_featuring(self):
+        """
+            Rebuild featuring if not consistent with current DB
+            @return True if rebuilt
+        """
+        with SqlCursor(self.__db) as sql:
+            select = self.__featuring_select
+            result = sql.execute("SELECT 1 FROM (%s EXCEPT\
+                                    SELECT artist_id, album_id\
+                                    FROM featuring)\
+                                  UNION ALL\
+                                  SELECT 1 FROM (\
+                                    SELECT artist_id, album_id\
+                                    FROM featuring EXCEPT %s)\
+                                  LIMIT 1" % (select, select))
+            if result.fetchone() is None:
+                return False
+        Logger.info("ArtistsDatabase::check_featuring(): rebuilding")
+        self.rebuild_featuring()
+        return True
 
     def get_featured(self, genre_ids, artist_ids, storage_type, skipped):
         """
@@ -438,3 +480,4 @@ class ArtistsDatabase:
                             FROM album_artists) AND artists.rowid NOT IN (\
                                 SELECT track_artists.artist_id\
                                 FROM track_artists)")
+        RandomSampler.invalidate()
@@ -13,6 +13,7 @@
 import itertools
 
 from lollypop.sqlcursor import SqlCursor
+from lollypop.database_sampler import RandomSampler
 from lollypop.define import App, Type, OrderBy
 from lollypop.utils import get_network_available, sql_escape
 
@@ -28,6 +29,7 @@ class GenresDatabase:
             @param db as Database
         """
         self.__db = db
+        self.__sampler = RandomSampler(db)
 
     def add(self, name):
         """
@@ -37,8 +39,9 @@ class GenresDatabase:
             @warning: commit needed
         """
         with SqlCursor(self.__db, True) as sql:
-            result = sql.execute("INSERT INTO genres (name) VALUES (?)",
-                                 (name,))
+            result = sql.execute("INSERT INTO genres (name, escaped_name)\
+                                  VALUES (?, ?)",
+                                 (name, sql_escape(name)))
             return result.lastrowid
 
     def get_id(self, name):
@@ -51,7 +54,7 @@ class GenresDatabase:
             # Escape string to fix mixed tags:
             # Alternative Rock, Aternative-Rock, alternative rock
             result = sql.execute("SELECT rowid FROM genres\
-                                  WHERE sql_escape(name)=?",
+                                  WHERE escaped_name=?",
                                  (sql_escape(name),))
             v = result.fetchone()
             if v is not None:
@@ -160,20 +163,16 @@ class GenresDatabase:
             Return a random genre
             @return [int]
         """
-        with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT genres.rowid, genres.name\
-                                  FROM genres\
-                                  WHERE EXISTS (\
-                                    SELECT albums.rowid\
-                                    FROM albums, album_genres\
-                                    WHERE albums.loved != -1 AND\
-                                          albums.rowid =\
-                                            album_genres.album_id AND\
-                                          album_genres.genre_id =\
-                                            genres.rowid)\
-                                  ORDER BY random() LIMIT 1")
-            genres = list(result)
-            return genres[0] if genres else (None, "")
+        request = "SELECT genres.rowid, genres.name\
+                   FROM genres\
+                   WHERE EXISTS (\
+                     SELECT albums.rowid\
+                     FROM albums, album_genres\
+                     WHERE albums.loved != -1 AND\
+                           albums.rowid = album_genres.album_id AND\
+                           album_genres.genre_id = genres.rowid)"
+        genres = self.__sampler.get(request, (), 1)
+        return genres[0] if genres else (None, "")
 
     def clean(self, commit=True):
         """
@@ -185,3 +184,4 @@ class GenresDatabase:
                             SELECT album_genres.genre_id FROM album_genres)")
             sql.execute("DELETE FROM genres WHERE genres.rowid NOT IN (\
                             SELECT track_genres.genre_id FROM track_genres)")
+        RandomSampler.invalidate()
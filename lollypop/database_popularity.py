@@ -0,0 +1,112 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+from bisect import bisect_left, insort
+from threading import Lock
+
+from lollypop.sqlcursor import SqlCursor
+
+
+class PopularityCache:
+    """
+        Keep highest popularities of a table in memory
+        Used to get average and higher popularity without SQL
+    """
+
+    def __init__(self, db, table, limit):
+        """
+            Init cache
+            @param db as Database
+            @param table as str
+            @param limit as int
+        """
+        self.__db = db
+        self.__table = table
+        self.__limit = limit
+        # Sorted highest popularities, None if needs to be loaded
+        self.__popularities = None
+        self.__lock = Lock()
+
+    def get_avg(self):
+        """
+            Get average of highest popularities
+            @return float
+        """
+        with self.__lock:
+            popularities = self.__get_popularities()
+            if popularities:
+                avg = sum(popularities) / len(popularities)
+                if avg > 5:
+                    return avg
+            return 5
+
+    def get_higher(self):
+        """
+            Get higher popularity
+            @return int
+        """
+        with self.__lock:
+            popularities = self.__get_popularities()
+            if popularities:
+                return popularities[-1]
+            return 0
+
+    def update(self, old, new):
+        """
+            Update cache for an item popularity change
+            @param old as int
+            @param new as int
+        """
+        with self.__lock:
+            popularities = self.__popularities
+            if popularities is None:
+                return
+            index = bisect_left(popularities, old)
+            if index < len(popularities) and popularities[index] == old:
+                lowest = popularities[0]
+                del popularities[index]
+                # An unknown popularity may now be higher
+                if new < lowest and len(popularities) >= self.__limit - 1:
+                    self.__popularities = None
+                    return
+                insort(popularities, new)
+            elif len(popularities) < self.__limit:
+                insort(popularities, new)
+            elif new > popularities[0]:
+                del popularities[0]
+                insort(popularities, new)
+
+    def invalidate(self):
+        """
+            Reload cache on next access
+        """
+        with self.__lock:
+            self.__popularities = None
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_popularities(self):
+        """
+            Get highest popularities, load them if needed
+            @return [int]
+        """
+        if self.__popularities is None:
+            with SqlCursor(self.__db) as sql:
+                result = sql.execute("SELECT popularity FROM %s\
+                                      ORDER BY popularity DESC\
+                                      LIMIT ?" % self.__table,
+                                     (self.__limit,))
+                self.__popularities = sorted(
+                    v for v in itertools.chain(*result) if v is not None)
+        return self.__popularities
@@ -0,0 +1,86 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from random import sample
+from threading import Lock
+from time import time
+
+from lollypop.sqlcursor import SqlCursor
+
+
+class RandomSampler:
+    """
+        Random rows from cached candidates, replace ORDER BY random()
+        Candidates are loaded once per request and filters
+    """
+
+    # Shared by all samplers, see invalidate()
+    __generation = 0
+    # Candidates lists kept per sampler
+    __SIZE = 20
+    # Safety for changes not calling invalidate()
+    __TTL = 600
+
+    def __init__(self, db):
+        """
+            Init sampler
+            @param db as Database
+        """
+        self.__db = db
+        self.__candidates = OrderedDict()
+        self.__lock = Lock()
+
+    @staticmethod
+    def invalidate():
+        """
+            Reload candidates on next access, for all samplers
+        """
+        RandomSampler.__generation += 1
+
+    def get(self, request, filters, limit):
+        """
+            Get random rows for request
+            @param request as str without ORDER BY and LIMIT
+            @param filters as tuple
+            @param limit as int
+            @return [tuple]
+        """
+        rows = self.__get_candidates(request, filters)
+        return sample(rows, min(limit, len(rows)))
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_candidates(self, request, filters):
+        """
+            Get candidates rows, load them if needed
+            @param request as str
+            @param filters as tuple
+            @return [tuple]
+        """
+        key = (request, filters)
+        generation = RandomSampler.__generation
+        with self.__lock:
+            entry = self.__candidates.get(key, None)
+            if entry is not None and entry[0] == generation and\
+                    time() - entry[1] < self.__TTL:
+                self.__candidates.move_to_end(key)
+                return entry[2]
+        with SqlCursor(self.__db) as sql:
+            rows = list(sql.execute(request, filters))
+        with self.__lock:
+            self.__candidates[key] = (generation, time(), rows)
+            self.__candidates.move_to_end(key)
+            while len(self.__candidates) > self.__SIZE:
+                self.__candidates.popitem(last=False)
+        return rows
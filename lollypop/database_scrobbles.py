@@ -0,0 +1,206 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio
+
+import sqlite3
+from pickle import load
+from threading import Lock
+from time import time
+
+from lollypop.define import LOLLYPOP_DATA_PATH
+from lollypop.sqlcursor import SqlCursor
+from lollypop.logger import Logger
+
+
+class ScrobblesDatabase:
+    """
+        Scrobble journal shared by scrobbling services
+        A listen is stored once with fields needed for submission,
+        delivery state is tracked per service
+    """
+    DB_PATH = "%s/scrobbles.db" % LOLLYPOP_DATA_PATH
+
+    # Retry delay in seconds is BACKOFF << attempts, up to BACKOFF_MAX
+    BACKOFF = 60
+    BACKOFF_MAX = 86400
+
+    # SQLite documentation:
+    # In SQLite, a column with type INTEGER PRIMARY KEY
+    # is an alias for the ROWID.
+    # Here, we define an id INT PRIMARY KEY but never feed it,
+    # this make VACUUM not destroy rowids...
+    __create_listens = """CREATE TABLE listens (
+                            id INTEGER PRIMARY KEY,
+                            timestamp INT NOT NULL,
+                            artist TEXT NOT NULL,
+                            title TEXT NOT NULL,
+                            album TEXT NOT NULL,
+                            mb_artist_ids TEXT NOT NULL,
+                            mb_album_id TEXT,
+                            mb_track_id TEXT,
+                            tracknumber INT,
+                            duration INT,
+                            UNIQUE(timestamp, artist, title))"""
+    __create_deliveries = """CREATE TABLE deliveries (
+                            listen_id INT NOT NULL,
+                            service TEXT NOT NULL,
+                            attempts INT NOT NULL DEFAULT 0,
+                            next_try INT NOT NULL DEFAULT 0,
+                            PRIMARY KEY(listen_id, service))"""
+
+    def __init__(self):
+        """
+            Create database tables
+        """
+        self.thread_lock = Lock()
+        f = Gio.File.new_for_path(self.DB_PATH)
+        if not f.query_exists():
+            try:
+                d = Gio.File.new_for_path(LOLLYPOP_DATA_PATH)
+                if not d.query_exists():
+                    d.make_directory_with_parents()
+                # Create db schema
+                with SqlCursor(self, True) as sql:
+                    sql.execute(self.__create_listens)
+                    sql.execute(self.__create_deliveries)
+            except Exception as e:
+                Logger.error("ScrobblesDatabase::__init__(): %s" % e)
+
+    def add(self, service, track, timestamp):
+        """
+            Add a listen to deliver to service
+            @param service as str
+            @param track as Track
+            @param timestamp as int
+        """
+        try:
+            mb_artist_ids = ";".join([mbid for mbid in track.mb_artist_ids
+                                      if mbid])
+            with SqlCursor(self, True) as sql:
+                sql.execute("INSERT OR IGNORE INTO listens (\
+                                timestamp, artist, title, album,\
+                                mb_artist_ids, mb_album_id, mb_track_id,\
+                                tracknumber, duration)\
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (timestamp, track.artists[0], track.title,
+                             track.album_name, mb_artist_ids,
+                             track.album.mb_album_id, track.mb_track_id,
+                             track.number, track.duration))
+                result = sql.execute("SELECT id FROM listens\
+                                      WHERE timestamp=? AND artist=?\
+                                      AND title=?",
+                                     (timestamp, track.artists[0],
+                                      track.title))
+                v = result.fetchone()
+                if v is not None:
+                    sql.execute("INSERT OR IGNORE INTO deliveries\
+                                    (listen_id, service)\
+                                 VALUES (?, ?)", (v[0], service))
+        except Exception as e:
+            Logger.error("ScrobblesDatabase::add(): %s", e)
+
+    def import_queue(self, service):
+        """
+            Import queue saved by previous versions for service
+            @param service as str
+        """
+        path = LOLLYPOP_DATA_PATH + "/%s_queue.bin" % service
+        f = Gio.File.new_for_path(path)
+        if f.query_exists():
+            try:
+                for (track, timestamp) in load(open(path, "rb")):
+                    self.add(service, track, timestamp)
+                f.delete(None)
+            except Exception as e:
+                Logger.info("ScrobblesDatabase::import_queue(): %s", e)
+
+    def get_pending(self, service, limit):
+        """
+            Get listens ready to be delivered to service, oldest first
+            @param service as str
+            @param limit as int
+            @return [{}]
+        """
+        try:
+            with SqlCursor(self) as sql:
+                result = sql.execute("SELECT listens.id, timestamp,\
+                                      artist, title, album, mb_artist_ids,\
+                                      mb_album_id, mb_track_id,\
+                                      tracknumber, duration\
+                                      FROM listens, deliveries\
+                                      WHERE listens.id=deliveries.listen_id\
+                                      AND deliveries.service=?\
+                                      AND deliveries.next_try<=?\
+                                      ORDER BY timestamp LIMIT ?",
+                                     (service, int(time()), limit))
+                keys = ["id", "timestamp", "artist", "title", "album",
+                        "mb_artist_ids", "mb_album_id", "mb_track_id",
+                        "tracknumber", "duration"]
+                listens = []
+                for row in result:
+                    listen = dict(zip(keys, row))
+                    listen["mb_artist_ids"] =\
+                        [mbid for mbid in listen["mb_artist_ids"].split(";")
+                         if mbid]
+                    listens.append(listen)
+                return listens
+        except Exception as e:
+            Logger.error("ScrobblesDatabase::get_pending(): %s", e)
+        return []
+
+    def set_delivered(self, service, listen_ids):
+        """
+            Mark listens as delivered to service
+            @param service as str
+            @param listen_ids as [int]
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.executemany("DELETE FROM deliveries\
+                                 WHERE listen_id=? AND service=?",
+                                [(listen_id, service)
+                                 for listen_id in listen_ids])
+                sql.execute("DELETE FROM listens WHERE NOT EXISTS (\
+                                SELECT 1 FROM deliveries\
+                                WHERE deliveries.listen_id=listens.id)")
+        except Exception as e:
+            Logger.error("ScrobblesDatabase::set_delivered(): %s", e)
+
+    def set_failed(self, service, listen_ids):
+        """
+            Delay next delivery to service with an exponential backoff
+            @param service as str
+            @param listen_ids as [int]
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.executemany("UPDATE deliveries\
+                                 SET next_try=? +\
+                                     MIN(?, ? << MIN(attempts, 16)),\
+                                     attempts=attempts + 1\
+                                 WHERE listen_id=? AND service=?",
+                                [(int(time()), self.BACKOFF_MAX,
+                                  self.BACKOFF, listen_id, service)
+                                 for listen_id in listen_ids])
+        except Exception as e:
+            Logger.error("ScrobblesDatabase::set_failed(): %s", e)
+
+    def get_cursor(self):
+        """
+            Return a new sqlite cursor
+        """
+        try:
+            c = sqlite3.connect(self.DB_PATH, 600.0)
+            return c
+        except:
+            exit(-1)
@@ -0,0 +1,303 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio
+
+import itertools
+import sqlite3
+from threading import Lock
+from time import time
+
+from lollypop.define import App, LOLLYPOP_DATA_PATH
+from lollypop.sqlcursor import SqlCursor
+from lollypop.database import Database
+from lollypop.logger import Logger
+from lollypop.utils import make_subrequest
+
+
+class SimilaritiesDatabase:
+    """
+        Artists co-listening index built from local data
+        Scores come from two sources:
+            - library: recomputed by rebuild() from listening times,
+              timed popularity and playlists
+            - listens: incremented by add_listen() as tracks finish
+        Also cache similar artists returned by web providers
+    """
+    DB_PATH = "%s/similarities.db" % LOLLYPOP_DATA_PATH
+
+    # Artists listened in less than SESSION_GAP seconds are similar
+    SESSION_GAP = 1800
+    # Albums popular the same day are similar
+    DAY_GAP = 86400
+    # Previous listens an artist is compared to
+    WINDOW = 10
+    # Playlists with more artists are not meaningful
+    PLAYLIST_MAX_ARTISTS = 50
+    # Minimal delay between two rebuilds if not forced
+    REBUILD_INTERVAL = 86400
+
+    __create_similarities = """CREATE TABLE similarities (
+                                artist_id INT NOT NULL,
+                                similar_id INT NOT NULL,
+                                listens REAL NOT NULL DEFAULT 0,
+                                library REAL NOT NULL DEFAULT 0,
+                                PRIMARY KEY(artist_id, similar_id))"""
+    __create_web_similars = """CREATE TABLE web_similars (
+                                artist TEXT NOT NULL,
+                                provider TEXT NOT NULL,
+                                similar TEXT NOT NULL,
+                                similar_id INT,
+                                PRIMARY KEY(artist, provider, similar))"""
+    __create_web_mtimes = """CREATE TABLE web_mtimes (
+                                artist TEXT NOT NULL,
+                                provider TEXT NOT NULL,
+                                mtime INT NOT NULL,
+                                PRIMARY KEY(artist, provider))"""
+
+    def __init__(self):
+        """
+            Create database tables
+        """
+        self.thread_lock = Lock()
+        # Last listens as [(timestamp, [int])]
+        self.__listens = []
+        self.__rebuild_time = 0
+        f = Gio.File.new_for_path(self.DB_PATH)
+        if not f.query_exists():
+            try:
+                d = Gio.File.new_for_path(LOLLYPOP_DATA_PATH)
+                if not d.query_exists():
+                    d.make_directory_with_parents()
+                # Create db schema
+                with SqlCursor(self, True) as sql:
+                    sql.execute(self.__create_similarities)
+                    sql.execute(self.__create_web_similars)
+                    sql.execute(self.__create_web_mtimes)
+            except Exception as e:
+                Logger.error("SimilaritiesDatabase::__init__(): %s" % e)
+
+    def add_listen(self, artist_ids, timestamp):
+        """
+            Make artist ids similar to artists listened in same session
+            @param artist_ids as [int]
+            @param timestamp as int
+        """
+        self.__listens = [(t, ids) for (t, ids) in self.__listens
+                          if timestamp - t <= self.SESSION_GAP]
+        scores = {}
+        for (t, ids) in self.__listens[-self.WINDOW:]:
+            for (artist_id, similar_id) in itertools.product(ids,
+                                                             artist_ids):
+                self.__add_score(scores, artist_id, similar_id, 1)
+        self.__listens.append((timestamp, list(artist_ids)))
+        if not scores:
+            return
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.executemany("INSERT OR IGNORE INTO similarities\
+                                    (artist_id, similar_id)\
+                                 VALUES (?, ?)", list(scores.keys()))
+                sql.executemany("UPDATE similarities\
+                                 SET listens=listens + ?\
+                                 WHERE artist_id=? AND similar_id=?",
+                                [(score, artist_id, similar_id)
+                                 for ((artist_id, similar_id), score)
+                                 in scores.items()])
+        except Exception as e:
+            Logger.error("SimilaritiesDatabase::add_listen(): %s", e)
+
+    def rebuild(self, force=True):
+        """
+            Recompute library scores from collection
+            @param force as bool, ignore REBUILD_INTERVAL
+        """
+        if not force and time() - self.__rebuild_time < self.REBUILD_INTERVAL:
+            return
+        self.__rebuild_time = time()
+        try:
+            scores = {}
+            self.__add_sessions(scores,
+                                App().tracks.get_listened_artist_ids(),
+                                self.SESSION_GAP, 1)
+            self.__add_sessions(scores,
+                                App().albums.get_timed_popularity_artist_ids(),
+                                self.DAY_GAP, 0.5)
+            self.__add_playlists(scores)
+            with SqlCursor(self, True) as sql:
+                sql.execute("UPDATE similarities SET library=0")
+                sql.executemany("INSERT OR IGNORE INTO similarities\
+                                    (artist_id, similar_id)\
+                                 VALUES (?, ?)", list(scores.keys()))
+                sql.executemany("UPDATE similarities SET library=?\
+                                 WHERE artist_id=? AND similar_id=?",
+                                [(score, artist_id, similar_id)
+                                 for ((artist_id, similar_id), score)
+                                 in scores.items()])
+                sql.execute("DELETE FROM similarities\
+                             WHERE listens=0 AND library=0")
+            Logger.info("SimilaritiesDatabase::rebuild(): %s pairs",
+                        len(scores))
+        except Exception as e:
+            Logger.error("SimilaritiesDatabase::rebuild(): %s", e)
+
+    def get_similar_artist_ids(self, artist_ids, limit):
+        """
+            Get artists listened with artist ids, most similar first
+            @param artist_ids as [int]
+            @param limit as int
+            @return [int]
+        """
+        if not artist_ids:
+            return []
+        try:
+            with SqlCursor(self) as sql:
+                filters = tuple(artist_ids) * 2 + (limit,)
+                request = "SELECT similar_id FROM similarities WHERE "
+                request += make_subrequest("artist_id=?", "OR",
+                                           len(artist_ids))
+                request += " AND NOT "
+                request += make_subrequest("similar_id=?", "OR",
+                                           len(artist_ids))
+                request += " GROUP BY similar_id\
+                             ORDER BY SUM(listens + library) DESC LIMIT ?"
+                result = sql.execute(request, filters)
+                return list(itertools.chain(*result))
+        except Exception as e:
+            Logger.error("SimilaritiesDatabase::get_similar_artist_ids(): %s",
+                         e)
+        return []
+
+    def get_web_similars(self, artist, provider):
+        """
+            Get cached similar artists
+            @param artist as str
+            @param provider as str
+            @return (int, [(str, int)]) as (mtime, [(similar, artist id)])
+                    mtime is None if not cached
+        """
+        try:
+            with SqlCursor(self) as sql:
+                result = sql.execute("SELECT mtime FROM web_mtimes\
+                                      WHERE artist=? AND provider=?",
+                                     (artist, provider))
+                v = result.fetchone()
+                if v is None:
+                    return (None, [])
+                result = sql.execute("SELECT similar, similar_id\
+                                      FROM web_similars\
+                                      WHERE artist=? AND provider=?",
+                                     (artist, provider))
+                return (v[0], list(result))
+        except Exception as e:
+            Logger.error("SimilaritiesDatabase::get_web_similars(): %s", e)
+        return (None, [])
+
+    def set_web_similars(self, artist, provider, similars, mtime):
+        """
+            Cache similar artists
+            @param artist as str
+            @param provider as str
+            @param similars as [(str, int)] as [(similar, artist id)]
+            @param mtime as int
+        """
+        try:
+            with SqlCursor(self, True) as sql:
+                sql.execute("DELETE FROM web_similars\
+                             WHERE artist=? AND provider=?",
+                            (artist, provider))
+                sql.executemany("INSERT OR IGNORE INTO web_similars\
+                                    (artist, provider, similar, similar_id)\
+                                 VALUES (?, ?, ?, ?)",
+                                [(artist, provider, similar, similar_id)
+                                 for (similar, similar_id) in similars])
+                sql.execute("INSERT OR REPLACE INTO web_mtimes\
+                                (artist, provider, mtime)\
+                             VALUES (?, ?, ?)", (artist, provider, mtime))
+        except Exception as e:
+            Logger.error("SimilaritiesDatabase::set_web_similars(): %s", e)
+
+    def clean(self, commit=True):
+        """
+            Remove artists not in collection anymore
+            @param commit as bool
+        """
+        with SqlCursor(self, commit) as sql:
+            sql.execute('ATTACH DATABASE "%s" AS music' % Database.DB_PATH)
+            sql.execute("DELETE FROM similarities\
+                         WHERE artist_id NOT IN (\
+                            SELECT artists.rowid FROM music.artists)\
+                         OR similar_id NOT IN (\
+                            SELECT artists.rowid FROM music.artists)")
+            sql.execute("DELETE FROM web_similars\
+                         WHERE similar_id IS NOT NULL\
+                         AND similar_id NOT IN (\
+                            SELECT artists.rowid FROM music.artists)")
+
+    def get_cursor(self):
+        """
+            Return a new sqlite cursor
+        """
+        try:
+            c = sqlite3.connect(self.DB_PATH, 600.0)
+            return c
+        except:
+            exit(-1)
+
+#######################
+# PRIVATE             #
+#######################
+    def __add_score(self, scores, artist_id, similar_id, score):
+        """
+            Add score in both directions
+            @param scores as {(int, int): float}
+            @param artist_id as int
+            @param similar_id as int
+            @param score as float
+        """
+        if artist_id == similar_id:
+            return
+        for key in [(artist_id, similar_id), (similar_id, artist_id)]:
+            scores[key] = scores.get(key, 0) + score
+
+    def __add_sessions(self, scores, rows, gap, score):
+        """
+            Add score for artists close in time
+            @param scores as {(int, int): float}
+            @param rows as [(int, int)] (timestamp, artist id) sorted
+            @param gap as int
+            @param score as float
+        """
+        window = []
+        for (timestamp, artist_id) in rows:
+            window = [(t, a) for (t, a) in window[-self.WINDOW:]
+                      if timestamp - t <= gap]
+            for (t, similar_id) in window:
+                self.__add_score(scores, artist_id, similar_id, score)
+            window.append((timestamp, artist_id))
+
+    def __add_playlists(self, scores):
+        """
+            Add score for artists in same playlist
+            @param scores as {(int, int): float}
+        """
+        playlists = {}
+        for (playlist_id, artist_id) in\
+                App().playlists.get_artist_ids_by_playlist():
+            playlists.setdefault(playlist_id, set()).add(artist_id)
+        for artist_ids in playlists.values():
+            if len(artist_ids) > self.PLAYLIST_MAX_ARTISTS:
+                continue
+            score = 1 / max(1, len(artist_ids) - 1)
+            for (artist_id, similar_id) in itertools.combinations(
+                    artist_ids, 2):
+                self.__add_score(scores, artist_id, similar_id, score)
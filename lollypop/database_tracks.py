@@ -15,6 +15,8 @@ from gettext import gettext as _
 import itertools
 
 from lollypop.sqlcursor import SqlCursor
+from lollypop.database_popularity import PopularityCache
+from lollypop.database_sampler import RandomSampler
 from lollypop.define import App, StorageType
 from lollypop.utils import noaccents, make_subrequest
 
@@ -31,6 +33,8 @@ class TracksDatabase:
             @param db as database
         """
         self.__db = db
+        self.__popularity_cache = PopularityCache(db, "tracks", 100)
+        self.__sampler = RandomSampler(db)
 
     def add(self, name, uri, duration, tracknumber, discnumber, discname,
             album_id, year, timestamp, popularity, rate, loved, ltime, mtime,
@@ -303,6 +307,7 @@ class TracksDatabase:
             sql.execute("UPDATE tracks SET storage_type=?\
                          WHERE rowid=?",
                         (storage_type, track_id))
+        RandomSampler.invalidate()
 
     def set_rate(self, track_id, rate):
         """
@@ -470,6 +475,16 @@ class TracksDatabase:
         with SqlCursor(self.__db, commit) as sql:
             sql.execute("DELETE FROM tracks WHERE album_id=?", (album_id,))
 
+    def remove_albums(self, album_ids, commit=True):
+        """
+            Remove albums
+            @param album_ids as [int]
+            @param commit as bool
+        """
+        with SqlCursor(self.__db, commit) as sql:
+            sql.executemany("DELETE FROM tracks WHERE album_id=?",
+                            [(album_id,) for album_id in album_ids])
+
     def del_non_persistent(self, commit=True):
         """
             Delete non persistent tracks
@@ -691,34 +706,25 @@ class TracksDatabase:
                 track_ids += list(itertools.chain(*result))
             return list(set(track_ids))
 
+    def update_popularities(self):
+        """
+            Reload popularity statistics on next access
+        """
+        self.__popularity_cache.invalidate()
+
     def get_higher_popularity(self):
         """
             Get higher available popularity
             @return int
         """
-        with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT popularity\
-                                  FROM tracks\
-                                  ORDER BY POPULARITY DESC LIMIT 1")
-            v = result.fetchone()
-            if v is not None:
-                return v[0]
-            return 0
+        return self.__popularity_cache.get_higher()
 
     def get_avg_popularity(self):
         """
             Return avarage popularity
             @return avarage popularity as int
         """
-        with SqlCursor(self.__db) as sql:
-            result = sql.execute("SELECT AVG(popularity)\
-                                  FROM (SELECT popularity\
-                                        FROM tracks\
-                                        ORDER BY POPULARITY DESC LIMIT 100)")
-            v = result.fetchone()
-            if v and v[0] is not None and v[0] > 5:
-                return v[0]
-            return 5
+        return self.__popularity_cache.get_avg()
 
     def set_more_popular(self, track_id):
         """
@@ -737,6 +743,8 @@ class TracksDatabase:
             current += 1
             sql.execute("UPDATE tracks set popularity=? WHERE rowid=?",
                         (current, track_id))
+            if pop:
+                self.__popularity_cache.update(pop[0], current)
 
     def set_listened_at(self, track_id, time):
         """
@@ -790,25 +798,22 @@ class TracksDatabase:
             @param limit as int
             @return track ids as [int]
         """
-        with SqlCursor(self.__db) as sql:
-            filters = (storage_type,)
-            request = "SELECT tracks.rowid FROM tracks"
-            if genre_ids:
-                request += ",track_genres"
-            request += " WHERE storage_type & ? "
-            if not skipped:
-                request += " AND loved != -1 "
-            if genre_ids:
-                request += "AND tracks.rowid=track_genres.track_id"
-                filters += tuple(genre_ids)
-                request += " AND "
-                request += make_subrequest("track_genres.genre_id=?",
-                                           "OR",
-                                           len(genre_ids))
-            request += " ORDER BY random() LIMIT ?"
-            filters += (limit,)
-            result = sql.execute(request, filters)
-            return list(itertools.chain(*result))
+        filters = (storage_type,)
+        request = "SELECT DISTINCT tracks.rowid FROM tracks"
+        if genre_ids:
+            request += ",track_genres"
+        request += " WHERE storage_type & ? "
+        if not skipped:
+            request += " AND loved != -1 "
+        if genre_ids:
+            request += "AND tracks.rowid=track_genres.track_id"
+            filters += tuple(genre_ids)
+            request += " AND "
+            request += make_subrequest("track_genres.genre_id=?",
+                                       "OR",
+                                       len(genre_ids))
+        result = self.__sampler.get(request, filters, limit)
+        return list(itertools.chain(*result))
 
     def set_popularity(self, track_id, popularity):
         """
@@ -817,8 +822,13 @@ class TracksDatabase:
             @param popularity as int
         """
         with SqlCursor(self.__db, True) as sql:
+            result = sql.execute("SELECT popularity FROM tracks\
+                                  WHERE rowid=?", (track_id,))
+            v = result.fetchone()
             sql.execute("UPDATE tracks set popularity=? WHERE rowid=?",
                         (popularity, track_id))
+            if v is not None:
+                self.__popularity_cache.update(v[0] or 0, popularity)
 
     def get_popularity(self, track_id):
         """
@@ -863,6 +873,19 @@ class TracksDatabase:
                 return v[0]
             return 0
 
+    def get_listened_artist_ids(self):
+        """
+            Get artists of listened tracks, ordered by listen time
+            @return [(int, int)] (listen time, artist id)
+        """
+        with SqlCursor(self.__db) as sql:
+            result = sql.execute("SELECT tracks.ltime, track_artists.artist_id\
+                                  FROM tracks, track_artists\
+                                  WHERE tracks.ltime != 0 AND\
+                                        track_artists.track_id = tracks.rowid\
+                                  ORDER BY tracks.ltime")
+            return list(result)
+
     def get_mtime(self, track_id):
         """
             Get modification time
@@ -898,6 +921,7 @@ class TracksDatabase:
         with SqlCursor(self.__db, True) as sql:
             sql.execute("UPDATE tracks SET loved=? WHERE rowid=?",
                         (loved, track_id))
+        RandomSampler.invalidate()
 
     def count(self):
         """
@@ -925,6 +949,8 @@ class TracksDatabase:
             sql.execute("DELETE FROM track_genres\
                          WHERE track_genres.track_id NOT IN (\
                             SELECT tracks.rowid FROM tracks)")
+        self.update_popularities()
+        RandomSampler.invalidate()
 
     def search(self, searched, storage_type):
         """
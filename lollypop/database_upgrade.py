@@ -173,7 +173,8 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
             44: self.__upgrade_44,
             45: self.__upgrade_45,
             46: self.__upgrade_46,
-            47: self.__upgrade_47
+            47: self.__upgrade_47,
+            48: self.__upgrade_48
         }
 
 #######################
@@ -824,3 +825,15 @@ class DatabaseAlbumsUpgrade(DatabaseUpgrade):
         """
         from lollypop.art import clean_all_cache
         clean_all_cache()
+
+    def __upgrade_48(self, db):
+        """
+            Add indexed escaped names, avoid calling sql_escape() on each row
+        """
+        with SqlCursor(db, True) as sql:
+            for table in ["albums", "artists", "genres"]:
+                sql.execute("ALTER TABLE %s ADD escaped_name TEXT" % table)
+                sql.execute("UPDATE %s SET escaped_name=sql_escape(name)" %
+                            table)
+                sql.execute("CREATE index idx_%s_escaped ON %s(escaped_name)"
+                            % (table, table))
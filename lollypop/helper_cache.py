@@ -0,0 +1,76 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+
+class LRUCacheHelper:
+    """
+        Small thread safe LRU cache with expiration
+    """
+
+    def __init__(self, size, ttl):
+        """
+            Init cache
+            @param size as int
+            @param ttl as int (seconds)
+        """
+        self.__size = size
+        self.__ttl = ttl
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key):
+        """
+            Get value for key
+            @param key as object
+            @return object/None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if entry is None:
+                return None
+            if time() > entry[0]:
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def get_prefix(self, key, min_length):
+        """
+            Get value for longest cached key that key starts with
+            @param key as str
+            @param min_length as int
+            @return object/None
+        """
+        for i in range(len(key) - 1, min_length - 1, -1):
+            value = self.get(key[:i])
+            if value is not None:
+                return value
+        return None
+
+    def set(self, key, value, ttl=None):
+        """
+            Set value for key
+            @param key as object
+            @param value as object
+            @param ttl as int (seconds), default cache ttl if None
+        """
+        if ttl is None:
+            ttl = self.__ttl
+        with self.__lock:
+            self.__entries[key] = (time() + ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
@@ -0,0 +1,196 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gio, GLib, Gst, GstPbutils
+
+from collections import OrderedDict
+from threading import Event, Lock, current_thread
+
+from lollypop.logger import Logger
+
+
+class DiscovererHelper:
+    """
+        Shared discovery service
+        Files are discovered asynchronously on main loop, results are
+        cached by uri and mtime so art, lyrics and duration checks on the
+        same file share a single parse
+    """
+
+    # Discoverers running in parallel
+    __MAX_RUNNING = 2
+    __CACHE_SIZE = 20
+    __TIMEOUT = 10
+
+    def __init__(self):
+        """
+            Init helper
+        """
+        # Available and running discoverers
+        self.__discoverers = []
+        self.__running = {}
+        # Callbacks waiting for an uri: {uri: [(callback, args)]}
+        self.__callbacks = OrderedDict()
+        self.__cache = OrderedDict()
+        self.__lock = Lock()
+        self.__sync_discoverer = None
+
+    def get_info(self, uri, callback, *args):
+        """
+            Discover uri, run callback when done
+            Should be called from main thread
+            @param uri as str
+            @param callback as function
+            @callback (GstPbutils.DiscovererInfo/None, *args)
+        """
+        key = self.__get_key(uri)
+        info = self.__get_cached(key)
+        if info is not None:
+            GLib.idle_add(callback, info, *args)
+        elif uri in self.__callbacks.keys():
+            self.__callbacks[uri].append((callback, args))
+        else:
+            self.__callbacks[uri] = [(callback, args)]
+            self.__discover_next()
+
+    def get_info_sync(self, uri):
+        """
+            Discover uri and wait for result
+            @param uri as str
+            @return GstPbutils.DiscovererInfo/None
+        """
+        key = self.__get_key(uri)
+        info = self.__get_cached(key)
+        if info is not None:
+            return info
+        # Main loop is not running while we wait, discover here
+        if current_thread().getName() == "MainThread":
+            return self.__discover_sync(uri, key)
+        event = Event()
+        result = []
+
+        def on_info(info):
+            result.append(info)
+            event.set()
+
+        GLib.idle_add(self.get_info, uri, on_info)
+        if event.wait(self.__TIMEOUT * 2) and result:
+            return result[0]
+        return None
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_key(self, uri):
+        """
+            Get cache key for uri
+            @param uri as str
+            @return (str, int)
+        """
+        mtime = 0
+        if uri.startswith("file:"):
+            try:
+                info = Gio.File.new_for_uri(uri).query_info(
+                    "time::modified", Gio.FileQueryInfoFlags.NONE, None)
+                mtime = info.get_attribute_uint64("time::modified")
+            except Exception as e:
+                Logger.warning("DiscovererHelper::__get_key(): %s", e)
+        return (uri, mtime)
+
+    def __get_cached(self, key):
+        """
+            Get cached info
+            @param key as (str, int)
+            @return GstPbutils.DiscovererInfo/None
+        """
+        with self.__lock:
+            info = self.__cache.get(key, None)
+            if info is not None:
+                self.__cache.move_to_end(key)
+            return info
+
+    def __set_cached(self, key, info):
+        """
+            Cache info
+            @param key as (str, int)
+            @param info as GstPbutils.DiscovererInfo
+        """
+        with self.__lock:
+            self.__cache[key] = info
+            self.__cache.move_to_end(key)
+            while len(self.__cache) > self.__CACHE_SIZE:
+                self.__cache.popitem(last=False)
+
+    def __discover_sync(self, uri, key):
+        """
+            Discover uri in current thread
+            @param uri as str
+            @param key as (str, int)
+            @return GstPbutils.DiscovererInfo/None
+        """
+        try:
+            if self.__sync_discoverer is None:
+                self.__sync_discoverer = GstPbutils.Discoverer.new(
+                    self.__TIMEOUT * Gst.SECOND)
+            info = self.__sync_discoverer.discover_uri(uri)
+            self.__set_cached(key, info)
+            return info
+        except Exception as e:
+            Logger.warning("DiscovererHelper::__discover_sync(): %s", e)
+        return None
+
+    def __discover_next(self):
+        """
+            Start discovering waiting uris if a discoverer is available
+        """
+        waiting = [uri for uri in self.__callbacks.keys()
+                   if uri not in self.__running.values()]
+        for uri in waiting:
+            available = [d for d in self.__discoverers
+                         if d not in self.__running.keys()]
+            if available:
+                discoverer = available[0]
+            elif len(self.__discoverers) < self.__MAX_RUNNING:
+                discoverer = GstPbutils.Discoverer.new(
+                    self.__TIMEOUT * Gst.SECOND)
+                discoverer.connect("discovered", self.__on_discovered)
+                discoverer.start()
+                self.__discoverers.append(discoverer)
+            else:
+                return
+            self.__running[discoverer] = uri
+            if not discoverer.discover_uri_async(uri):
+                del self.__running[discoverer]
+                self.__on_discovered(discoverer, None, None, uri)
+
+    def __on_discovered(self, discoverer, info, error, uri=None):
+        """
+            Cache info and run callbacks
+            @param discoverer as GstPbutils.Discoverer
+            @param info as GstPbutils.DiscovererInfo
+            @param error as GLib.Error
+            @param uri as str if discovery did not start
+        """
+        if uri is None:
+            uri = self.__running.pop(discoverer, None)
+        if error is not None:
+            Logger.warning("DiscovererHelper::__on_discovered(): %s, %s",
+                           uri, error.message)
+            info = None
+        elif info is not None:
+            self.__set_cached(self.__get_key(uri), info)
+        for (callback, args) in self.__callbacks.pop(uri, []):
+            try:
+                callback(info, *args)
+            except Exception as e:
+                Logger.error("DiscovererHelper::__on_discovered(): %s", e)
+        self.__discover_next()
@@ -12,6 +12,8 @@
 
 from gi.repository import GLib, Gtk
 
+from bisect import bisect_left, bisect_right
+
 from lollypop.define import ViewType, App
 from lollypop.utils import noaccents
 from lollypop.utils_album import tracks_to_albums
@@ -28,63 +30,58 @@ class FilteringHelper():
             Init helper
         """
         self.__last_scrolled = None
+        # Snapshot of filtered children and their folded names
+        self.__children = []
+        self.__folded = []
+        self.__folded_cache = {}
+        # Positions of children matching current text
+        self.__text = ""
+        self.__matches = []
+        self.__position = None
 
     def search_for_child(self, text):
         """
             Search child and scroll
             @param text as str
         """
-        for child in self.filtered:
-            style_context = child.get_style_context()
-            style_context.remove_class("typeahead")
+        self.__set_typeahead(None)
         if not text:
+            self.__text = ""
+            self.__matches = []
             return
-        for child in self.filtered:
-            if noaccents(child.name).find(noaccents(text)) != -1:
-                style_context = child.get_style_context()
-                style_context.add_class("typeahead")
-                GLib.idle_add(self._scroll_to_child, child)
-                break
+        self.__update_matches(noaccents(text))
+        if self.__matches:
+            self.__set_typeahead(self.__matches[0])
 
     def search_prev(self, text):
         """
             Search previous child and scroll
             @param text as str
         """
-        previous_children = []
-        found_child = None
-        for child in self.filtered:
-            style_context = child.get_style_context()
-            if style_context.has_class("typeahead"):
-                found_child = child
-                break
-            previous_children.insert(0, child)
-        if previous_children and found_child is not None:
-            for child in previous_children:
-                if noaccents(child.name).find(noaccents(text)) != -1:
-                    found_child.get_style_context().remove_class("typeahead")
-                    child.get_style_context().add_class("typeahead")
-                    GLib.idle_add(self._scroll_to_child, child)
-                    break
+        self.__update_matches(noaccents(text))
+        # No typeahead child anymore, restart from first match
+        if self.__position is None:
+            if self.__matches:
+                self.__set_typeahead(self.__matches[0])
+            return
+        index = bisect_left(self.__matches, self.__position) - 1
+        if index >= 0:
+            self.__set_typeahead(self.__matches[index])
 
     def search_next(self, text):
         """
             Search previous child and scroll
             @param text as str
         """
-        found = False
-        previous_style_context = None
-        for child in self.filtered:
-            style_context = child.get_style_context()
-            if style_context.has_class("typeahead"):
-                previous_style_context = style_context
-                found = True
-                continue
-            if found and noaccents(child.name).find(noaccents(text)) != -1:
-                previous_style_context.remove_class("typeahead")
-                style_context.add_class("typeahead")
-                GLib.idle_add(self._scroll_to_child, child)
-                break
+        self.__update_matches(noaccents(text))
+        # No typeahead child anymore, restart from first match
+        if self.__position is None:
+            if self.__matches:
+                self.__set_typeahead(self.__matches[0])
+            return
+        index = bisect_right(self.__matches, self.__position)
+        if index < len(self.__matches):
+            self.__set_typeahead(self.__matches[index])
 
     def activate_child(self):
         """
@@ -97,14 +94,10 @@ class FilteringHelper():
 
         try:
             # Search typeahead child
-            typeahead_child = None
-            for child in self.filtered:
-                style_context = child.get_style_context()
-                if style_context.has_class("typeahead"):
-                    typeahead_child = child
-                    break
-            if typeahead_child is None:
+            if self.__position is None or\
+                    self.__position >= len(self.__children):
                 return
+            typeahead_child = self.__children[self.__position]
             from lollypop.view_current_albums import CurrentAlbumsView
             from lollypop.view_playlists import PlaylistsView
             # Play child without reseting player
@@ -180,3 +173,68 @@ class FilteringHelper():
 #######################
 # PRIVATE             #
 #######################
+    def __update_snapshot(self):
+        """
+            Update children snapshot if children changed
+            @return True if snapshot changed
+        """
+        children = self.filtered
+        if children == self.__children:
+            return False
+        folded = []
+        folded_cache = {}
+        for child in children:
+            name = child.name
+            cached = self.__folded_cache.get(child, None)
+            if cached is None or cached[0] != name:
+                cached = (name, noaccents(name))
+            folded_cache[child] = cached
+            folded.append(cached[1])
+        self.__children = children
+        self.__folded = folded
+        self.__folded_cache = folded_cache
+        return True
+
+    def __update_matches(self, text):
+        """
+            Update matching positions for text
+            @param text as str (folded)
+        """
+        typeahead_child = None
+        if self.__position is not None and\
+                self.__position < len(self.__children):
+            typeahead_child = self.__children[self.__position]
+        changed = self.__update_snapshot()
+        if changed:
+            self.__position = None
+            # Follow typeahead child to its new position
+            if typeahead_child in self.__children:
+                self.__position = self.__children.index(typeahead_child)
+            elif typeahead_child is not None:
+                typeahead_child.get_style_context().remove_class(
+                    "typeahead")
+        if not changed and text == self.__text:
+            return
+        # Narrow previous result if user continues typing
+        if not changed and self.__text and text.startswith(self.__text):
+            candidates = self.__matches
+        else:
+            candidates = range(0, len(self.__folded))
+        folded = self.__folded
+        self.__matches = [i for i in candidates if folded[i].find(text) != -1]
+        self.__text = text
+
+    def __set_typeahead(self, position):
+        """
+            Mark child at position as typeahead child and scroll to it
+            @param position as int/None
+        """
+        if self.__position is not None and\
+                self.__position < len(self.__children):
+            child = self.__children[self.__position]
+            child.get_style_context().remove_class("typeahead")
+        self.__position = position
+        if position is not None:
+            child = self.__children[position]
+            child.get_style_context().add_class("typeahead")
+            GLib.idle_add(self._scroll_to_child, child)
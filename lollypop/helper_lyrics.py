@@ -12,11 +12,14 @@
 
 from gi.repository import Gio, GLib
 
+from bisect import bisect_left
+
 from lollypop.logger import Logger
+from lollypop.helper_cache import LRUCacheHelper
 from lollypop.helper_task import TaskHelper
 from lollypop.utils import escape, get_network_available
 from lollypop.utils_file import create_dir
-from lollypop.define import LYRICS_PATH
+from lollypop.define import LYRICS_PATH, App
 
 
 class LyricsHelper:
@@ -24,11 +27,19 @@ class LyricsHelper:
         Sync lyrics helper
     """
 
+    # Shared by all helpers: (timestamps, synced lyrics, lyrics) per uri
+    # and web lyrics per track
+    __CACHE = LRUCacheHelper(50, 3600)
+    # Web lyrics not found
+    __FAILURE_TTL = 60
+
     def __init__(self):
         """
             Init helper
         """
-        self.__timestamps = {}
+        self.__timestamps = []
+        self.__synced_lyrics = []
+        self.__lyrics = ""
         self.__cancellable = Gio.Cancellable.new()
         create_dir(LYRICS_PATH)
 
@@ -38,23 +49,17 @@ class LyricsHelper:
             @param track as Track
         """
         self.__track = track
-        self.__timestamps = {}
-        uri_no_ext = ".".join(track.uri.split(".")[:-1])
-        self.__lrc_file = Gio.File.new_for_uri(uri_no_ext + ".lrc")
-        if self.__lrc_file.query_exists():
-            self.__get_timestamps()
-        else:
-            from lollypop.tagreader import Discoverer, TagReader
-            discoverer = Discoverer()
-            tagreader = TagReader()
-            try:
-                info = discoverer.get_info(track.uri)
-            except:
-                info = None
-            if info is not None:
-                tags = info.get_tags()
-                for (lyrics, timestamp) in tagreader.get_synced_lyrics(tags):
-                    self.__timestamps[timestamp] = lyrics
+        (self.__timestamps,
+         self.__synced_lyrics,
+         self.__lyrics) = self.__get_local_lyrics(track)
+
+    def prefetch(self, track):
+        """
+            Load lyrics for track in cache
+            @param track as Track
+        """
+        if self.__CACHE.get(track.uri) is None:
+            App().task_helper.run(self.__get_local_lyrics, track)
 
     def get_lyrics_for_timestamp(self, timestamp):
         """
@@ -62,23 +67,20 @@ class LyricsHelper:
             @param timestamp as int
             @return ([str], str, [str])
         """
-        previous = []
-        next = []
-        current = None
-        for key in self.__timestamps.keys():
-            if timestamp > key and current is None:
-                if len(previous) == 5:
-                    previous.pop(0)
-                previous.append(self.__timestamps[key])
-            elif current is None and previous:
-                current = previous.pop(-1)
-                next.append(self.__timestamps[key])
-            elif timestamp < key and len(next) != 5:
-                next.append(self.__timestamps[key])
-            else:
-                break
-        if current is None:
+        lines = self.__synced_lyrics
+        index = bisect_left(self.__timestamps, timestamp)
+        if index == 0:
+            previous = []
+            current = ""
+            next = lines[0:5]
+        elif index == len(lines):
+            previous = lines[-5:]
             current = ""
+            next = []
+        else:
+            previous = lines[max(0, index - 5):index - 1]
+            current = lines[index - 1]
+            next = lines[index:index + 5]
         return (previous, [" ", current, " "], next)
 
     def get_lyrics_from_web(self, track, callback, *args):
@@ -88,6 +90,10 @@ class LyricsHelper:
             @param callback as function
         """
         self.__cancellable = Gio.Cancellable.new()
+        lyrics = self.__CACHE.get(self.__get_web_key(track))
+        if lyrics is not None:
+            callback(lyrics, *args)
+            return
         methods = []
         if get_network_available("WIKIA"):
             methods.append(self.__download_wikia_lyrics)
@@ -110,7 +116,15 @@ class LyricsHelper:
             True if lyrics available
             @return bool
         """
-        return len(self.__timestamps.keys()) != 0
+        return len(self.__timestamps) != 0
+
+    @property
+    def lyrics(self):
+        """
+            Get unsynced lyrics from tags
+            @return str
+        """
+        return self.__lyrics
 
 ############
 # PRIVATE  #
@@ -128,14 +142,43 @@ class LyricsHelper:
         timestamp += minutes * 60000
         return timestamp
 
-    def __get_timestamps(self):
+    def __get_local_lyrics(self, track):
+        """
+            Get lyrics from .lrc file or tags, cached by uri
+            @param track as Track
+            @return ([int], [str], str)
+        """
+        value = self.__CACHE.get(track.uri)
+        if value is not None:
+            return value
+        timestamps = {}
+        lyrics = ""
+        uri_no_ext = ".".join(track.uri.split(".")[:-1])
+        lrc_file = Gio.File.new_for_uri(uri_no_ext + ".lrc")
+        if lrc_file.query_exists():
+            self.__get_timestamps(lrc_file, timestamps)
+        else:
+            from lollypop.tagreader import TagReader
+            tagreader = TagReader()
+            info = App().discoverer_helper.get_info_sync(track.uri)
+            if info is not None:
+                tags = info.get_tags()
+                for (line, timestamp) in tagreader.get_synced_lyrics(tags):
+                    timestamps[timestamp] = line
+                lyrics = tagreader.get_lyrics(tags)
+        keys = sorted(timestamps.keys())
+        value = (keys, [timestamps[key] for key in keys], lyrics)
+        self.__CACHE.set(track.uri, value)
+        return value
+
+    def __get_timestamps(self, lrc_file, timestamps):
         """
             Get timestamps from file
+            @param lrc_file as Gio.File
+            @param timestamps as {int: str}
         """
         try:
-            status = False
-            if self.__lrc_file.query_exists():
-                (status, content, tag) = self.__lrc_file.load_contents()
+            (status, content, tag) = lrc_file.load_contents()
             if status:
                 data = content.decode("utf-8").split("\n")
                 for line in data:
@@ -145,12 +188,20 @@ class LyricsHelper:
                         str_timestamp = line.split("]")[0].split("[")[1]
                         timestamp = self.__str_to_timestamp(str_timestamp)
                         lyrics = " ".join(line.split("]")[1:])
-                        self.__timestamps[timestamp] = lyrics
+                        timestamps[timestamp] = lyrics
                     except:
                         continue
         except Exception as e:
             Logger.error("SyncLyricsHelper::__get_timestamps(): %s", e)
 
+    def __get_web_key(self, track):
+        """
+            Get cache key for web lyrics
+            @param track as Track
+            @return str
+        """
+        return "web:%s:%s" % (track.uri, track.name)
+
     def __get_lyrics_from_web(self, track, methods, callback, *args):
         """
             Get lyrics from web for track
@@ -162,6 +213,12 @@ class LyricsHelper:
             method = methods.pop(0)
             method(track, methods, callback, *args)
         else:
+            # Web errors are not distinguished from missing lyrics,
+            # retry soon
+            if not self.__cancellable.is_cancelled() and\
+                    get_network_available():
+                self.__CACHE.set(self.__get_web_key(track), "",
+                                 self.__FAILURE_TTL)
             callback("", *args)
 
     def __get_title(self, track, escape=False):
@@ -259,6 +316,7 @@ class LyricsHelper:
                 soup = BeautifulSoup(data, 'html.parser')
                 lyrics = soup.find_all(
                     "div", class_=cls)[0].get_text(separator=separator)
+                self.__CACHE.set(self.__get_web_key(track), lyrics)
                 callback(lyrics, *args)
                 return
             except Exception as e:
@@ -14,12 +14,13 @@ import gi
 gi.require_version("Soup", "2.4")
 from gi.repository import GLib, Soup
 
-from threading import Thread
+from threading import Lock, Thread
 from urllib.parse import urlparse
 from time import time, sleep
 
 from lollypop.define import App
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 
 
 class TaskHelper:
@@ -48,6 +49,36 @@ class TaskHelper:
         thread.start()
         return thread
 
+    def map_sync(self, command, items, max_threads, *args):
+        """
+            Run command for each item in a few threads and wait for results
+            @param command as function
+            @param items as [object]
+            @param max_threads as int
+            @param *args as command arguments after item
+            @return [object] as results, None if command failed
+        """
+        results = [None] * len(items)
+        indexes = iter(range(len(items)))
+        lock = Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    index = next(indexes, None)
+                if index is None:
+                    return
+                try:
+                    results[index] = command(items[index], *args)
+                except Exception as e:
+                    Logger.warning("TaskHelper::map_sync(): %s", e)
+
+        threads = [self.run(worker)
+                   for i in range(min(max_threads, len(items)))]
+        for thread in threads:
+            thread.join()
+        return results
+
     def load_uri_content(self, uri, cancellable, callback, *args):
         """
             Load uri content async
@@ -298,7 +329,9 @@ class TaskHelper:
             @param kwd as { "callback": (function, *args) }
         """
         try:
-            result = command(*args)
+            with Tracer.span("task", getattr(command, "__qualname__",
+                                             str(command))):
+                result = command(*args)
             if "callback" in kwd.keys():
                 (callback, *callback_args) = kwd["callback"]
                 if callback is not None:
@@ -13,9 +13,11 @@
 from gi.repository import GLib, GObject
 
 from time import time
+from threading import Lock
 import json
 
 from lollypop.logger import Logger
+from lollypop.sqlcursor import SqlCursor
 from lollypop.utils import emit_signal
 from lollypop.utils import get_lollypop_album_id, get_lollypop_track_id
 from lollypop.objects_album import Album
@@ -35,6 +37,12 @@ class SaveWebHelper(GObject.Object):
         "finished": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
+    # Shared by all helpers: one writer at a time, one artwork downloader
+    __save_lock = Lock()
+    __artworks_lock = Lock()
+    __artworks = []
+    __artworks_running = False
+
     def __init__(self):
         """
             Init helper
@@ -78,15 +86,71 @@ class SaveWebHelper(GObject.Object):
             if notify:
                 emit_signal(self, "match-album", album_id, storage_type)
             return album.collection_item
-        item = self.__save_album(payload, storage_type)
-        album = Album(item.album_id)
+        with SaveWebHelper.__save_lock:
+            item = self.__save_album(payload, storage_type)
         if notify:
-            self.save_artwork(album,
-                              payload["artwork-uri"],
-                              cancellable)
-            emit_signal(self, "match-album", album.id, storage_type)
+            self.queue_artwork(Album(item.album_id),
+                               payload["artwork-uri"],
+                               cancellable)
+            emit_signal(self, "match-album", item.album_id, storage_type)
         return item
 
+    def save_album_payloads_to_db(self, payloads, storage_type,
+                                  notify, cancellable):
+        """
+            Save albums to DB in one transaction
+            @param payloads as [{}]
+            @param storage_type as StorageType
+            @param notify as bool
+            @param cancellable as Gio.Cancellable
+            @return [CollectionItem]
+        """
+        items = []
+        saved = []
+        with SaveWebHelper.__save_lock:
+            SqlCursor.add(App().db)
+            try:
+                for payload in payloads:
+                    if cancellable.is_cancelled():
+                        break
+                    lp_album_id = get_lollypop_album_id(payload["name"],
+                                                        payload["artists"])
+                    album_id = App().albums.get_id_for_lp_album_id(
+                        lp_album_id)
+                    if album_id >= 0:
+                        items.append(Album(album_id).collection_item)
+                    else:
+                        item = self.__save_album(payload, storage_type)
+                        items.append(item)
+                        saved.append((item, payload["artwork-uri"]))
+            finally:
+                SqlCursor.remove(App().db)
+        # Albums are visible to other threads only after commit
+        for item in items:
+            if notify:
+                emit_signal(self, "match-album", item.album_id, storage_type)
+        for (item, artwork_uri) in saved:
+            self.queue_artwork(Album(item.album_id),
+                               artwork_uri,
+                               cancellable)
+        return items
+
+    def queue_artwork(self, album, cover_uri, cancellable):
+        """
+            Save artwork for album in background
+            @param album as Album
+            @param cover_uri/mbid as str
+            @param cancellable as Gio.Cancellable
+        """
+        if not cover_uri:
+            return
+        with SaveWebHelper.__artworks_lock:
+            SaveWebHelper.__artworks.append((album, cover_uri, cancellable))
+            if SaveWebHelper.__artworks_running:
+                return
+            SaveWebHelper.__artworks_running = True
+        App().task_helper.run(self.__download_artworks)
+
     def save_artwork(self, obj, cover_uri, cancellable):
         """
             Save artwork for obj
@@ -122,6 +186,24 @@ class SaveWebHelper(GObject.Object):
 #######################
 # PRIVATE             #
 #######################
+    def __download_artworks(self):
+        """
+            Save queued artworks
+        """
+        while True:
+            with SaveWebHelper.__artworks_lock:
+                if not SaveWebHelper.__artworks:
+                    SaveWebHelper.__artworks_running = False
+                    return
+                (album, cover_uri,
+                 cancellable) = SaveWebHelper.__artworks.pop(0)
+            if cancellable.is_cancelled():
+                continue
+            try:
+                self.save_artwork(album, cover_uri, cancellable)
+            except Exception as e:
+                Logger.warning("SaveWebHelper::__download_artworks(): %s", e)
+
     def __get_date_from_payload(self, payload):
         """
             Get date from payload
@@ -170,6 +170,9 @@ class MPRIS(Server):
     __MPRIS_LOLLYPOP = "org.mpris.MediaPlayer2.Lollypop"
     __MPRIS_PATH = "/org/mpris/MediaPlayer2"
 
+    # Delay in ms used to coalesce PropertiesChanged emissions
+    __PROPERTIES_DELAY = 100
+
     def __init__(self, app):
         self.__app = app
         self.__rating = None
@@ -177,6 +180,10 @@ class MPRIS(Server):
         self.__metadata = {"mpris:trackid": GLib.Variant(
             "o",
             "/org/mpris/MediaPlayer2/TrackList/NoTrack")}
+        # Metadata for current and next tracks, built off main loop
+        self.__metadata_cache = {}
+        self.__changed_properties = {}
+        self.__properties_timeout_id = None
         self.__track_id = self.__get_media_id(0)
         self.__bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
         Gio.bus_own_name_on_connection(self.__bus,
@@ -186,12 +193,18 @@ class MPRIS(Server):
                                        None)
         Server.__init__(self, self.__bus, self.__MPRIS_PATH)
         App().player.connect("current-changed", self.__on_current_changed)
+        App().player.connect("next-changed", self.__on_next_changed)
+        App().player.connect("duration-changed", self.__on_duration_changed)
         App().player.connect("seeked", self.__on_seeked)
         App().player.connect("status-changed", self.__on_status_changed)
         App().player.connect("volume-changed", self.__on_volume_changed)
         App().player.connect("rate-changed", self.__on_rate_changed)
         App().settings.connect("changed::shuffle", self.__on_shuffle_changed)
         App().settings.connect("changed::repeat", self.__on_repeat_changed)
+        # Player state may have been restored before we were created
+        self.__on_current_changed(App().player)
+        self.__on_next_changed(App().player)
+        self.__on_status_changed()
 
     def Raise(self):
         self.__app.window.present_with_time(Gtk.get_current_event_time())
@@ -375,65 +388,124 @@ class MPRIS(Server):
         else:
             return "Stopped"
 
+    def __get_metadata(self, track):
+        """
+            Build metadata for track, artwork is rendered if needed
+            @param track as Track
+            @return {}
+            @thread safe
+        """
+        metadata = {}
+        track_number = track.number
+        if track_number is None:
+            track_number = 1
+        metadata["xesam:trackNumber"] = GLib.Variant("i", track_number)
+        metadata["xesam:title"] = GLib.Variant("s", track.name)
+        metadata["xesam:album"] = GLib.Variant("s", track.album.name)
+        metadata["xesam:artist"] = GLib.Variant("as", track.artists)
+        metadata["xesam:albumArtist"] = GLib.Variant("as",
+                                                     track.album_artists)
+        metadata["mpris:length"] = GLib.Variant("x", track.duration * 1000)
+        metadata["xesam:genre"] = GLib.Variant("as", track.genres)
+        metadata["xesam:url"] = GLib.Variant("s", track.uri)
+        metadata["xesam:userRating"] = GLib.Variant("d", track.rate / 5)
+        cover_path = App().art.get_album_cache_path(
+                track.album, ArtSize.MPRIS, ArtSize.MPRIS)
+        if cover_path is not None:
+            metadata["mpris:artUrl"] = GLib.Variant("s",
+                                                    "file://" + cover_path)
+        return metadata
+
+    def __cache_metadata(self, track):
+        """
+            Build metadata for track in background
+            @param track as Track
+        """
+        if track.id is None or track.id in self.__metadata_cache.keys():
+            return
+        App().task_helper.run(self.__get_metadata, track,
+                              callback=(self.__on_metadata, track.id))
+
     def __update_metadata(self):
-        self.__metadata = {}
+        """
+            Update metadata for current track
+            @return bool => True if full metadata available
+        """
         if App().player.current_track.id is None or\
                 self.__get_status() == "Stopped":
             self.__metadata = {"mpris:trackid": GLib.Variant(
                 "o",
                 "/org/mpris/MediaPlayer2/TrackList/NoTrack")}
-        else:
-            self.__metadata["mpris:trackid"] = self.__track_id
-            track_number = App().player.current_track.number
-            if track_number is None:
-                track_number = 1
-            self.__metadata["xesam:trackNumber"] = GLib.Variant(
-                "i",
-                track_number)
-            self.__metadata["xesam:title"] = GLib.Variant(
-                "s",
-                App().player.current_track.name)
-            self.__metadata["xesam:album"] = GLib.Variant(
-                "s",
-                App().player.current_track.album.name)
-            self.__metadata["xesam:artist"] = GLib.Variant(
-                "as",
-                App().player.current_track.artists)
-            self.__metadata["xesam:albumArtist"] = GLib.Variant(
-                "as",
-                App().player.current_track.album_artists)
-            self.__metadata["mpris:length"] = GLib.Variant(
-                "x",
-                App().player.current_track.duration * 1000)
-            self.__metadata["xesam:genre"] = GLib.Variant(
-                "as",
-                App().player.current_track.genres)
-            self.__metadata["xesam:url"] = GLib.Variant(
-                "s",
-                App().player.current_track.uri)
+            return True
+        metadata = self.__metadata_cache.get(self.__lollypop_id, None)
+        if metadata is None:
+            # Do not keep previous track metadata while building
+            self.__metadata = {
+                "mpris:trackid": self.__track_id,
+                "xesam:title": GLib.Variant(
+                    "s", App().player.current_track.title)}
+            return False
+        self.__metadata = dict(metadata)
+        self.__metadata["mpris:trackid"] = self.__track_id
+        if self.__rating is not None:
             self.__metadata["xesam:userRating"] = GLib.Variant(
-                "d",
-                App().player.current_track.rate / 5)
-            cover_path = App().art.get_album_cache_path(
-                    App().player.current_track.album,
-                    ArtSize.MPRIS, ArtSize.MPRIS)
-            if cover_path is not None:
-                self.__metadata["mpris:artUrl"] = GLib.Variant(
-                    "s",
-                    "file://" + cover_path)
+                "d", self.__rating / 5)
+        return True
+
+    def __queue_properties_changed(self, properties):
+        """
+            Emit PropertiesChanged for player interface, changes in a short
+            delay are merged in one emission
+            @param properties as {}
+        """
+        self.__changed_properties.update(properties)
+        if self.__properties_timeout_id is None:
+            self.__properties_timeout_id = GLib.timeout_add(
+                self.__PROPERTIES_DELAY, self.__emit_properties_changed)
+
+    def __emit_properties_changed(self):
+        """
+            Emit pending PropertiesChanged
+        """
+        self.__properties_timeout_id = None
+        properties = self.__changed_properties
+        self.__changed_properties = {}
+        try:
+            self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
+        except Exception as e:
+            Logger.error("MPRIS::__emit_properties_changed(): %s" % e)
+
+    def __on_metadata(self, metadata, track_id):
+        """
+            Cache metadata, update current metadata if needed
+            @param metadata as {}
+            @param track_id as int
+        """
+        if metadata is None:
+            return
+        # Only keep current and next tracks
+        keep = [self.__lollypop_id, App().player.next_track.id]
+        for key in list(self.__metadata_cache.keys()):
+            if key not in keep:
+                del self.__metadata_cache[key]
+        if track_id not in keep:
+            return
+        self.__metadata_cache[track_id] = metadata
+        if track_id == self.__lollypop_id:
+            self.__update_metadata()
+            self.__queue_properties_changed(
+                {"Metadata": GLib.Variant("a{sv}", self.__metadata)})
 
     def __on_seeked(self, player, position):
         self.Seeked(position * 1000)
 
     def __on_volume_changed(self, player, data=None):
-        self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE,
-                               {"Volume": GLib.Variant("d",
-                                                       App().player.volume), },
-                               [])
+        self.__queue_properties_changed(
+            {"Volume": GLib.Variant("d", App().player.volume)})
 
     def __on_shuffle_changed(self, settings, value):
         properties = {"Shuffle": App().settings.get_value("shuffle")}
-        self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
+        self.__queue_properties_changed(properties)
 
     def __on_repeat_changed(self, settings, value):
         repeat = App().settings.get_enum("repeat")
@@ -444,15 +516,16 @@ class MPRIS(Server):
         else:
             value = "None"
         properties = {"LoopStatus": GLib.Variant("s", value)}
-        self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
+        self.__queue_properties_changed(properties)
 
     def __on_rate_changed(self, player, rated_track_id, rating):
         # We only care about the current Track's rating.
         if rated_track_id == self.__lollypop_id:
             self.__rating = rating
-            self.__update_metadata()
-            properties = {"Metadata": GLib.Variant("a{sv}", self.__metadata)}
-            self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
+            if self.__update_metadata():
+                properties = {"Metadata": GLib.Variant("a{sv}",
+                                                       self.__metadata)}
+                self.__queue_properties_changed(properties)
 
     def __on_current_changed(self, player):
         if App().player.current_track.id is None:
@@ -462,17 +535,31 @@ class MPRIS(Server):
         # We only need to recalculate a new trackId at song changes.
         self.__track_id = self.__get_media_id(self.__lollypop_id)
         self.__rating = None
-        self.__update_metadata()
-        properties = {"Metadata": GLib.Variant("a{sv}", self.__metadata),
-                      "CanPlay": GLib.Variant("b", True),
+        properties = {"CanPlay": GLib.Variant("b", True),
                       "CanPause": GLib.Variant("b", True),
                       "CanGoNext": GLib.Variant("b", True),
                       "CanGoPrevious": GLib.Variant("b", True)}
-        try:
-            self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
-        except Exception as e:
-            Logger.error("MPRIS::__on_current_changed(): %s" % e)
+        # Metadata is usually already built as track was next track
+        if not self.__update_metadata():
+            self.__cache_metadata(App().player.current_track)
+        properties["Metadata"] = GLib.Variant("a{sv}", self.__metadata)
+        self.__queue_properties_changed(properties)
+
+    def __on_next_changed(self, player):
+        self.__cache_metadata(App().player.next_track)
+
+    def __on_duration_changed(self, player, track_id):
+        # Cached metadata has a wrong length, __on_metadata() emits new one
+        if track_id in self.__metadata_cache.keys():
+            del self.__metadata_cache[track_id]
+        if track_id == self.__lollypop_id:
+            self.__cache_metadata(App().player.current_track)
+        elif track_id == App().player.next_track.id:
+            self.__cache_metadata(App().player.next_track)
 
     def __on_status_changed(self, data=None):
         properties = {"PlaybackStatus": GLib.Variant("s", self.__get_status())}
-        self.PropertiesChanged(self.__MPRIS_PLAYER_IFACE, properties, [])
+        # Metadata depends on status
+        if self.__update_metadata():
+            properties["Metadata"] = GLib.Variant("a{sv}", self.__metadata)
+        self.__queue_properties_changed(properties)
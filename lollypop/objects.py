@@ -68,7 +68,7 @@ class Base:
         popularity = 0
         avg_popularity = self.db.get_avg_popularity()
         if avg_popularity > 0:
-            popularity = self.db.get_popularity(self.id)
+            popularity = self.popularity
         return popularity * 5 / avg_popularity + 0.5
 
     def set_popularity(self, new_rate):
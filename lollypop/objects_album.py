@@ -138,6 +138,7 @@ class Album(Base):
         self.genre_ids = genre_ids
         self._tracks = []
         self._discs = []
+        self.__track_positions = None
         self.__skipped = skipped
         self.__one_disc = None
         self.__tracks_storage_type = self.storage_type
@@ -178,6 +179,7 @@ class Album(Base):
             @param tracks as [Track]
             @param clone as bool
         """
+        self.__track_positions = None
         if clone:
             self._tracks = []
             for track in tracks:
@@ -201,6 +203,7 @@ class Album(Base):
             @param track as Track
             @param clone as bool
         """
+        self.__track_positions = None
         if clone:
             self._tracks.append(Track(track.id, self))
         else:
@@ -226,13 +229,28 @@ class Album(Base):
         for _track in self.tracks:
             if track.id == _track.id:
                 self._tracks.remove(_track)
+        self.__track_positions = None
         return len(self._tracks) == 0
 
+    def get_track_position(self, track_id):
+        """
+            Get track position in album
+            @param track_id as int
+            @return int, tracks count if track missing
+        """
+        tracks = self.tracks
+        if self.__track_positions is None:
+            self.__track_positions = {}
+            for (position, track) in enumerate(tracks):
+                self.__track_positions.setdefault(track.id, position)
+        return self.__track_positions.get(track_id, len(tracks))
+
     def reset_tracks(self):
         """
             Reset album tracks, useful for tracks loaded async
         """
         self._tracks = []
+        self.__track_positions = None
         # Needed for album switching from Spotify, Deezer multi-artists to
         # Lollypop way of handling compilations
         self._artists = []
@@ -412,6 +430,7 @@ class Album(Base):
         if not self._tracks and self.id is not None:
             for disc in self.discs:
                 self._tracks += disc.tracks
+            self.__track_positions = None
         return self._tracks
 
     @property
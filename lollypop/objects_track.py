@@ -97,6 +97,13 @@ class Track(Base):
         """
         self._number = number
 
+    def set_duration(self, duration):
+        """
+            Set duration
+            @param duration as int (ms)
+        """
+        self._duration = duration
+
     def set_name(self, name):
         """
             Set name
@@ -145,12 +152,7 @@ class Track(Base):
             Get track position for album
             @return int
         """
-        i = 0
-        for track_id in self.__album.track_ids:
-            if track_id == self.id:
-                break
-            i += 1
-        return i
+        return self.__album.get_track_position(self.id)
 
     @property
     def first(self):
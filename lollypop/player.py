@@ -271,6 +271,7 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
             self.__scrobble(track, self._start_time)
             if track.id >= 0:
                 App().tracks.set_listened_at(track.id, int(time()))
+                App().similarities.add_listen(track.artist_ids, int(time()))
                 # Increment popularity
                 App().tracks.set_more_popular(track.id)
                 # In party mode, linear popularity
@@ -281,6 +282,8 @@ class Player(GObject.GObject, AlbumsPlayer, BinPlayer, AutoRandomPlayer,
                     count = track.album.tracks_count
                     pop_to_add = int(App().albums.max_count / count)
                 App().albums.set_more_popular(track.album_id, pop_to_add)
+                track.reset("popularity")
+                track.album.reset("popularity")
 
     def _on_stream_start(self, bus, message):
         """
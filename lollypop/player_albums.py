@@ -23,6 +23,120 @@ from lollypop.define import App, Repeat
 from lollypop.utils import emit_signal
 
 
+class PlaybackAlbums(list):
+    """
+        Albums in playback, indexed for fast lookups
+        Index is rebuilt on first lookup after a change
+    """
+
+    def __init__(self, albums=[]):
+        """
+            Init albums
+            @param albums as [Album]
+        """
+        list.__init__(self, albums)
+        self.__positions = None
+        self.__albums_by_id = None
+
+    def index(self, album, *args):
+        """
+            Get album position
+            @param album as Album
+            @return int
+            @raise ValueError if album missing
+        """
+        if args:
+            return list.index(self, album, *args)
+        self.__update_index()
+        position = self.__positions.get(id(album), None)
+        if position is None:
+            raise ValueError("Album not in playback")
+        return position
+
+    def get_by_id(self, album_id):
+        """
+            Get albums for id
+            @param album_id as int
+            @return [Album]
+        """
+        self.__update_index()
+        return list(self.__albums_by_id.get(album_id, []))
+
+    def __contains__(self, album):
+        self.__update_index()
+        return id(album) in self.__positions
+
+    def append(self, album):
+        list.append(self, album)
+        self.__invalidate()
+
+    def extend(self, albums):
+        list.extend(self, albums)
+        self.__invalidate()
+
+    def insert(self, position, album):
+        list.insert(self, position, album)
+        self.__invalidate()
+
+    def remove(self, album):
+        list.remove(self, album)
+        self.__invalidate()
+
+    def pop(self, *args):
+        album = list.pop(self, *args)
+        self.__invalidate()
+        return album
+
+    def clear(self):
+        list.clear(self)
+        self.__invalidate()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self.__invalidate()
+
+    def reverse(self):
+        list.reverse(self)
+        self.__invalidate()
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, key, value)
+        self.__invalidate()
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self.__invalidate()
+
+    def __iadd__(self, albums):
+        list.extend(self, albums)
+        self.__invalidate()
+        return self
+
+#######################
+# PRIVATE             #
+#######################
+    def __invalidate(self):
+        """
+            Invalidate index
+        """
+        self.__positions = None
+        self.__albums_by_id = None
+
+    def __update_index(self):
+        """
+            Build index if needed
+        """
+        if self.__positions is not None:
+            return
+        positions = {}
+        albums_by_id = {}
+        for (position, album) in enumerate(self):
+            positions.setdefault(id(album), position)
+            albums_by_id.setdefault(album.id, []).append(album)
+        self.__positions = positions
+        self.__albums_by_id = albums_by_id
+
+
 class AlbumsPlayer:
     """
         Handle player albums
@@ -101,10 +215,9 @@ class AlbumsPlayer:
         """
         try:
             for album_id in album_ids:
-                for album in self._albums:
-                    if album.id == album_id:
-                        self.remove_album(album)
-                        emit_signal(self, "playback-removed", album)
+                for album in self._albums.get_by_id(album_id):
+                    self.remove_album(album)
+                    emit_signal(self, "playback-removed", album)
             self.update_next_prev()
         except Exception as e:
             Logger.error("Player::remove_album_by_ids(): %s" % e)
@@ -237,11 +350,10 @@ class AlbumsPlayer:
             @param track as Track
             @return Track/None
         """
-        for album in self._albums:
-            if album.id == track.album.id:
-                for _track in album.tracks:
-                    if track.id == _track.id:
-                        return _track
+        for album in self._albums.get_by_id(track.album.id):
+            for _track in album.tracks:
+                if track.id == _track.id:
+                    return _track
         return None
 
     def get_albums_for_id(self, album_id):
@@ -250,7 +362,23 @@ class AlbumsPlayer:
             @param album_id as int
             @return [Album]
         """
-        return [album for album in self._albums if album.id == album_id]
+        return self._albums.get_by_id(album_id)
+
+    @property
+    def _albums(self):
+        """
+            Get albums in playback
+            @return PlaybackAlbums
+        """
+        return self.__albums
+
+    @_albums.setter
+    def _albums(self, albums):
+        """
+            Set albums in playback
+            @param albums as [Album]
+        """
+        self.__albums = PlaybackAlbums(albums)
 
     @property
     def albums(self):
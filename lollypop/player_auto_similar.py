@@ -28,6 +28,8 @@ class AutoSimilarPlayer:
         Manage playback when going to end
     """
 
+    __SIMILARS_LIMIT = 20
+
     def __init__(self):
         """
             Init player
@@ -53,14 +55,26 @@ class AutoSimilarPlayer:
     def play_radio_from_collection(self, artist_ids):
         """
             Play a radio from collection for artist ids
+            Artists listened together first, then artists genres
             @param artist_ids as [int]
         """
-        genre_ids = App().artists.get_genre_ids(artist_ids,
-                                                StorageType.COLLECTION)
-        track_ids = App().tracks.get_randoms(genre_ids,
-                                             StorageType.COLLECTION,
-                                             False,
-                                             100)
+        similar_artist_ids = App().similarities.get_similar_artist_ids(
+            artist_ids, self.__SIMILARS_LIMIT)
+        track_ids = []
+        if similar_artist_ids:
+            track_ids = App().tracks.get_populars(
+                artist_ids + similar_artist_ids,
+                StorageType.COLLECTION, False, 100)
+            shuffle(track_ids)
+        if len(track_ids) < 100:
+            genre_ids = App().artists.get_genre_ids(artist_ids,
+                                                    StorageType.COLLECTION)
+            for track_id in App().tracks.get_randoms(genre_ids,
+                                                     StorageType.COLLECTION,
+                                                     False,
+                                                     100 - len(track_ids)):
+                if track_id not in track_ids:
+                    track_ids.append(track_id)
         albums = tracks_to_albums(
             [Track(track_id) for track_id in track_ids], False)
         self.play_albums(albums)
@@ -215,14 +229,13 @@ class AutoSimilarPlayer:
             Logger.info("Found a similar album")
             self.add_album(album)
 
-    def __on_get_similar_artists(self, artists):
+    def __on_get_similar_artist_ids(self, similar_artist_ids):
         """
             Add one album from artists to player
-            @param artists as []
+            @param similar_artist_ids as [int]
         """
         if self.__next_cancellable.is_cancelled():
             return
-        similar_artist_ids = self.__get_artist_ids(artists)
         album = None
         if similar_artist_ids:
             album = self.__get_album_from_artists(similar_artist_ids)
@@ -253,13 +266,35 @@ class AutoSimilarPlayer:
                 player.current_track.id is not None and\
                 player.current_track.id >= 0 and\
                 player.current_track.artist_ids:
+            artist_ids = player.current_track.artist_ids
+            App().task_helper.run(
+                App().similarities.get_similar_artist_ids,
+                artist_ids,
+                self.__SIMILARS_LIMIT,
+                callback=(self.__on_get_colistened_artist_ids, artist_ids))
+
+    def __on_get_colistened_artist_ids(self, similar_artist_ids, artist_ids):
+        """
+            Add one album from artists to player, search on web if none
+            @param similar_artist_ids as [int]
+            @param artist_ids as [int]
+        """
+        if self.__next_cancellable.is_cancelled():
+            return
+        album = None
+        if similar_artist_ids:
+            album = self.__get_album_from_artists(similar_artist_ids)
+        if album is None:
             from lollypop.similars import Similars
             similars = Similars()
             App().task_helper.run(
-                similars.get_similar_artists,
-                player.current_track.artist_ids,
+                similars.get_similar_artist_ids,
+                artist_ids,
                 self.__next_cancellable,
-                callback=(self.__on_get_similar_artists,))
+                callback=(self.__on_get_similar_artist_ids,))
+        else:
+            Logger.info("Found a co-listened album")
+            self.add_album(album)
 
     def __on_match_track(self, similars, track_id, storage_type):
         """
@@ -15,12 +15,13 @@ from gi.repository import Gst, GstAudio, GstPbutils, GLib, Gio
 from time import time
 from gettext import gettext as _
 
-from lollypop.tagreader import TagReader, Discoverer
+from lollypop.tagreader import TagReader
 from lollypop.player_plugins import PluginsPlayer
 from lollypop.define import GstPlayFlags, App, StorageType
 from lollypop.codecs import Codecs
 from lollypop.logger import Logger
 from lollypop.objects_track import Track
+from lollypop.sqlcursor import SqlCursor
 from lollypop.utils import emit_signal, get_network_available
 
 
@@ -29,6 +30,11 @@ class BinPlayer:
         Gstreamer bin player
     """
 
+    # Duration differences ignored (ms)
+    __DURATION_TOLERANCE = 1000
+    # Delay before saving durations (s)
+    __DURATIONS_DELAY = 5
+
     def __init__(self):
         """
             Init playbin
@@ -62,7 +68,14 @@ class BinPlayer:
             bus.connect("message::element", self._on_bus_element)
             bus.connect("message::stream-start", self._on_stream_start)
             bus.connect("message::tag", self._on_bus_message_tag)
+            bus.connect("message::duration-changed",
+                        self.__on_bus_duration, playbin)
+            bus.connect("message::async-done",
+                        self.__on_bus_duration, playbin)
         self._start_time = 0
+        # Durations to save: {track_id: (album_id, duration)}
+        self.__durations = {}
+        self.__durations_timeout_id = None
 
     def load(self, track):
         """
@@ -114,6 +127,14 @@ class BinPlayer:
         # Stop
         self._playbin1.set_state(Gst.State.NULL)
         self._playbin2.set_state(Gst.State.NULL)
+        # Save pending durations
+        if self.__durations_timeout_id is not None:
+            GLib.source_remove(self.__durations_timeout_id)
+            self.__durations_timeout_id = None
+            durations = self.__durations
+            self.__durations = {}
+            track_ids = self.__save_durations_in_db(durations)
+            self.__on_durations_saved(track_ids)
 
     def play_pause(self):
         """
@@ -380,20 +401,68 @@ class BinPlayer:
         """
         return playbin.query_position(Gst.Format.TIME)[1] / 1000000
 
-    def __update_current_duration(self, track):
+    def __save_durations(self):
         """
-            Update current track duration
-            @param track as Track
+            Save pending durations in a thread
+        """
+        self.__durations_timeout_id = None
+        durations = self.__durations
+        self.__durations = {}
+        App().task_helper.run(self.__save_durations_in_db, durations,
+                              callback=(self.__on_durations_saved,))
+
+    def __save_durations_in_db(self, durations):
+        """
+            Save durations and invalidate album durations
+            @param durations as {int: (int, int)}
+            @return [int] as track ids
         """
         try:
-            discoverer = Discoverer()
-            duration = discoverer.get_info(track.uri).get_duration() / 1000000
-            if duration != track.duration and duration > 0:
-                App().tracks.set_duration(track.id, int(duration))
-                track.reset("duration")
-                emit_signal(self, "duration-changed", track.id)
+            SqlCursor.add(App().db)
+            try:
+                for (track_id, (album_id, duration)) in durations.items():
+                    App().tracks.set_duration(track_id, duration)
+            finally:
+                SqlCursor.remove(App().db)
+            for album_id in set([v[0] for v in durations.values()]):
+                App().cache.clear_durations(album_id)
         except Exception as e:
-            Logger.error("BinPlayer::__update_current_duration(): %s" % e)
+            Logger.error("BinPlayer::__save_durations_in_db(): %s" % e)
+        return list(durations.keys())
+
+    def __on_durations_saved(self, track_ids):
+        """
+            Notify durations changes
+            @param track_ids as [int]
+        """
+        for track_id in track_ids:
+            emit_signal(self, "duration-changed", track_id)
+
+    def __on_bus_duration(self, bus, message, playbin):
+        """
+            Reconcile current track duration with playbin one
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+            @param playbin as Gst.Bin
+        """
+        track = self._current_track
+        if playbin != self._playbin or track.id is None or track.id < 0:
+            return
+        # Message may come from previous stream while in gapless
+        if playbin.get_property("current-uri") != track.uri:
+            return
+        (status, duration) = playbin.query_duration(Gst.Format.TIME)
+        if not status or duration <= 0:
+            return
+        duration = int(duration / 1000000)
+        # Ignore rounding from tags and estimations from VBR streams
+        if abs(duration - track.duration) < self.__DURATION_TOLERANCE:
+            return
+        track.set_duration(duration)
+        self.__durations[track.id] = (track.album_id, duration)
+        if self.__durations_timeout_id is None:
+            self.__durations_timeout_id = GLib.timeout_add_seconds(
+                self.__DURATIONS_DELAY, self.__save_durations)
 
     def __on_volume_changed(self, playbin, sink):
         """
@@ -417,7 +486,6 @@ class BinPlayer:
         if uri:
             track.set_uri(uri)
             self.load(track)
-            App().task_helper.run(self.__update_current_duration, track)
         else:
             GLib.idle_add(
                 App().notify.send,
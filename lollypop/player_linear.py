@@ -35,7 +35,7 @@ class LinearPlayer:
         """
         repeat = App().settings.get_enum("repeat")
         # No album in playback
-        if not self.albums:
+        if not self._albums:
             return Track()
         # User want us to repeat current track
         elif repeat == Repeat.TRACK:
@@ -49,7 +49,7 @@ class LinearPlayer:
         # next album
         if new_track_position >= len(album.track_ids):
             try:
-                pos = self.albums.index(album)
+                pos = self._albums.index(album)
                 albums_count = len(self._albums)
                 new_pos = 0
                 # Search for a next album
@@ -95,7 +95,7 @@ class LinearPlayer:
         # Previous album
         if new_track_position < 0:
             try:
-                pos = self.albums.index(album)
+                pos = self._albums.index(album)
                 albums_count = len(self._albums)
                 new_pos = 0
                 # Search for a prev album
@@ -24,6 +24,7 @@ class QueuePlayer:
             Init queue
         """
         self.__queue = []
+        self.__queue_ids = set()
         self._queue_current_track = None
 
     def set_queue(self, queue):
@@ -32,6 +33,7 @@ class QueuePlayer:
             @param queue as [int]
         """
         self.__queue = queue
+        self.__queue_ids = set(queue)
 
     def append_to_queue(self, track_id, notify=True):
         """
@@ -40,9 +42,10 @@ class QueuePlayer:
             @param track_id as int
             @param notify as bool
         """
-        if track_id in self.__queue:
+        if track_id in self.__queue_ids:
             self.__queue.remove(track_id)
         self.__queue.append(track_id)
+        self.__queue_ids.add(track_id)
         self.set_next()
         self.set_prev()
         if notify:
@@ -56,9 +59,10 @@ class QueuePlayer:
             @param pos as int
             @param notify as bool
         """
-        if track_id in self.__queue:
+        if track_id in self.__queue_ids:
             self.__queue.remove(track_id)
         self.__queue.insert(pos, track_id)
+        self.__queue_ids.add(track_id)
         self.set_next()
         self.set_prev()
         if notify:
@@ -70,8 +74,9 @@ class QueuePlayer:
             @param track_id as int
             @param notify as bool
         """
-        if track_id in self.__queue:
+        if track_id in self.__queue_ids:
             self.__queue.remove(track_id)
+            self.__queue_ids.discard(track_id)
         if notify:
             emit_signal(self, "queue-changed")
 
@@ -82,6 +87,7 @@ class QueuePlayer:
             @param notify as bool
         """
         self.__queue = []
+        self.__queue_ids = set()
         if notify:
             emit_signal(self, "queue-changed")
 
@@ -91,10 +97,7 @@ class QueuePlayer:
             @param track_id as int
             @return bool
         """
-        if self.__queue:
-            return track_id in self.__queue
-        else:
-            return False
+        return track_id in self.__queue_ids
 
     def album_in_queue(self, album):
         """
@@ -103,8 +106,9 @@ class QueuePlayer:
             @return bool
         """
         if self.__queue:
-            union = set(self.__queue) & set(album.track_ids)
-            return len(union) == len(album.track_ids)
+            track_ids = set(album.track_ids)
+            return track_ids <= self.__queue_ids and\
+                len(track_ids) == len(album.track_ids)
         else:
             return False
 
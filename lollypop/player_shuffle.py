@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from random import shuffle, random
+from random import shuffle, random, choice
 
 from lollypop.define import Repeat, App
 from lollypop.objects_track import Track
@@ -25,6 +25,8 @@ class ShufflePlayer:
         Shuffle player
         Manage shuffle tracks and party mode
     """
+    # Party albums kept in playback, others are only ids
+    __PARTY_ALBUMS = 10
 
     def __init__(self):
         """
@@ -40,6 +42,9 @@ class ShufflePlayer:
         self.__already_played_tracks = {}
         # Party mode
         self._is_party = False
+        # Shuffled album ids for party mode and current position
+        self.__party_ids = []
+        self.__party_position = 0
         App().settings.connect("changed::shuffle", self.__set_shuffle)
         self.connect("playback-added", self.__on_playback_added)
         self.connect("playback-setted", self.__on_playback_setted)
@@ -55,7 +60,7 @@ class ShufflePlayer:
             return self._current_track
         if self.shuffle_has_next:
             track = self.__history.next.value
-        elif self._albums:
+        elif self._albums or self._is_party:
             track = self.__get_next()
         else:
             track = Track()
@@ -82,10 +87,10 @@ class ShufflePlayer:
             @param party as bool
         """
         def start_party(*ignore):
-            if self._albums:
+            if self.__party_ids:
                 # Start a new song if not playing
                 if self._current_track.id is None:
-                    track = self.__get_tracks_random()
+                    track = self.__get_party_track()
                     self.load(track)
                 elif not self.is_playing:
                     self.play()
@@ -98,6 +103,7 @@ class ShufflePlayer:
         if party:
             App().task_helper.run(self.set_party_ids, callback=(start_party,))
         else:
+            self.__party_ids = []
             # We want current album to continue playback
             self._albums = [self._current_track.album]
             emit_signal(self, "playback-setted", [])
@@ -113,17 +119,10 @@ class ShufflePlayer:
         """
         if not self._is_party:
             return
-        party_ids = App().settings.get_value("party-ids")
-        storage_type = get_default_storage_type()
-        album_ids = App().albums.get_ids(party_ids, [], storage_type, False)
         emit_signal(self, "playback-setted", [])
+        # Albums are added to playback when one of their tracks is chosen
         self._albums = []
-        if album_ids:
-            emit_signal(self, "loading-changed", True, Track())
-        for album_id in album_ids:
-            album = Album(album_id, [], [], False)
-            self._albums.append(album)
-        emit_signal(self, "playback-setted", list(self._albums))
+        self.__load_party_ids()
 
     @property
     def is_party(self):
@@ -159,6 +158,8 @@ class ShufflePlayer:
         if self._current_track.id is None or\
                 self._current_track.id < 0:
             return
+        if self._is_party:
+            self.__update_party(self._current_track)
         # Add track to shuffle history if needed
         if App().settings.get_value("shuffle") or self._is_party:
             self.__add_to_shuffle_history(self._current_track)
@@ -207,7 +208,24 @@ class ShufflePlayer:
             @return track as Track
         """
         try:
-            if App().settings.get_value("shuffle") or self._is_party:
+            if self._is_party:
+                # Restored party or all tracks done
+                if not self.__party_ids:
+                    self.__load_party_ids()
+                track = self.__get_party_track()
+                # All tracks done
+                # Try to get another one track after reseting history
+                if track.id is None:
+                    repeat = App().settings.get_enum("repeat")
+                    if repeat not in [Repeat.AUTO_SIMILAR,
+                                      Repeat.AUTO_RANDOM]:
+                        self.__history = []
+                        self.__already_played_tracks = {}
+                    if repeat == Repeat.ALL:
+                        self.__load_party_ids()
+                        track = self.__get_party_track()
+                return track
+            elif App().settings.get_value("shuffle"):
                 if self._albums:
                     track = self.__get_tracks_random()
                     # All tracks done
@@ -251,6 +269,70 @@ class ShufflePlayer:
         else:
             return Track()
 
+    def __load_party_ids(self):
+        """
+            Load a shuffled album ids pool for party mode
+        """
+        party_ids = App().settings.get_value("party-ids")
+        storage_type = get_default_storage_type()
+        album_ids = App().albums.get_ids(party_ids, [], storage_type, False)
+        shuffle(album_ids)
+        self.__party_ids = album_ids
+        self.__party_position = 0
+
+    def __get_party_track(self):
+        """
+            Get a random track never played from album at party position
+            Playback and position are updated once track starts
+            @return Track
+        """
+        storage_type = get_default_storage_type()
+        while self.__party_ids:
+            if self.__party_position >= len(self.__party_ids):
+                self.__party_position = 0
+            album_id = self.__party_ids[self.__party_position]
+            played = self.__already_played_tracks.get(album_id, [])
+            track_ids = [track_id
+                         for track_id in App().albums.get_track_ids(
+                             album_id, storage_type, False)
+                         if track_id not in played]
+            if track_ids:
+                track_id = choice(track_ids)
+                for album in self._albums.get_by_id(album_id):
+                    track = album.get_track(track_id)
+                    if track.id is not None:
+                        return track
+                return Track(track_id, Album(album_id, [], [], False))
+            # Album done, remove it from pool, order does not matter
+            self.__party_ids[self.__party_position] = self.__party_ids[-1]
+            self.__party_ids.pop()
+        return Track()
+
+    def __update_party(self, track):
+        """
+            Add started track album to playback, move party position
+            @param track as Track
+        """
+        album_id = track.album.id
+        if self.__party_position < len(self.__party_ids) and\
+                self.__party_ids[self.__party_position] == album_id:
+            self.__party_position += 1
+        if not self._albums.get_by_id(album_id):
+            self.__add_party_album(track.album)
+
+    def __add_party_album(self, album):
+        """
+            Add album to playback, remove oldest albums not playing
+            @param album as Album
+        """
+        self._albums.append(album)
+        emit_signal(self, "playback-added", album)
+        current_album_id = self._current_track.album.id
+        for old_album in self._albums[:-self.__PARTY_ALBUMS]:
+            if old_album.id != current_album_id:
+                self._albums.remove(old_album)
+                emit_signal(self, "playback-removed", old_album)
+
     def __in_shuffle_history(self, track):
         """
             True if track in shuffle history
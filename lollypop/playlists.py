@@ -318,6 +318,21 @@ class Playlists(GObject.GObject):
                 track_ids = list(itertools.chain(*result))
         return track_ids
 
+    def get_artist_ids_by_playlist(self):
+        """
+            Get artist ids for all playlists tracks
+            @return [(int, int)] as [(playlist id, artist id)]
+        """
+        with SqlCursor(self) as sql:
+            result = sql.execute("SELECT DISTINCT tracks.playlist_id,\
+                                         music.track_artists.artist_id\
+                                  FROM tracks, music.tracks,\
+                                       music.track_artists\
+                                  WHERE music.tracks.uri=main.tracks.uri\
+                                  AND music.track_artists.track_id=\
+                                  music.tracks.rowid")
+            return list(result)
+
     def get_tracks(self, playlist_id):
         """
             Return availables tracks for playlist
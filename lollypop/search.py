@@ -10,16 +10,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import GObject
+from gi.repository import GObject, GLib
 
 from lollypop.define import StorageType, App
-from lollypop.utils import emit_signal, get_network_available
+from lollypop.helper_cache import LRUCacheHelper
+from lollypop.utils import emit_signal, get_network_available, noaccents
 from lollypop.search_local import LocalSearch
 
 
 class Search(GObject.Object):
     """
         Local search
+        Web results are cached by query, a query extending a cached one is
+        filtered locally without calling the web service
     """
     __gsignals__ = {
         "match-artist": (GObject.SignalFlags.RUN_FIRST, None, (int, int)),
@@ -28,6 +31,11 @@ class Search(GObject.Object):
         "finished": (GObject.SignalFlags.RUN_FIRST, None, (bool,)),
     }
 
+    # Shared by all search views: (match type, id, storage type) per query
+    __CACHE = LRUCacheHelper(100, 1800)
+    # Do not filter results for very short queries, they are truncated
+    __MIN_PREFIX_LENGTH = 3
+
     def __init__(self):
         """
             Init search
@@ -37,6 +45,10 @@ class Search(GObject.Object):
         self.__local_search = LocalSearch()
         self.__connect_search_signals(self.__local_search)
         self.__web_search = None
+        self.__web_search_name = None
+        self.__web_matches = []
+        self.__web_pending = False
+        self.__cancellable = None
 
     def set_web_search(self, name):
         """
@@ -44,25 +56,26 @@ class Search(GObject.Object):
             @param name as str
         """
         self.__web_search = None
+        self.__web_search_name = None
         if not get_network_available("YOUTUBE"):
             return
 
         if name == "SPOTIFY":
             from lollypop.search_spotify import SpotifySearch
-            self.__web_search = SpotifySearch()
-            self.__connect_search_signals(self.__web_search)
+            self.__web_search_name = name
+            self.__web_search = SpotifySearch
         elif name == "LASTFM":
             from lollypop.search_lastfm import LastFMSearch
-            self.__web_search = LastFMSearch()
-            self.__connect_search_signals(self.__web_search)
+            self.__web_search_name = name
+            self.__web_search = LastFMSearch
         elif name == "MUSICBRAINZ":
             from lollypop.search_musicbrainz import MusicBrainzSearch
-            self.__web_search = MusicBrainzSearch()
-            self.__connect_search_signals(self.__web_search)
+            self.__web_search_name = name
+            self.__web_search = MusicBrainzSearch
         elif name == "DEEZER":
             from lollypop.search_deezer import DeezerSearch
-            self.__web_search = DeezerSearch()
-            self.__connect_search_signals(self.__web_search)
+            self.__web_search_name = name
+            self.__web_search = DeezerSearch
 
     def load_tracks(self, album, cancellable):
         """
@@ -90,6 +103,15 @@ class Search(GObject.Object):
             @param search as str
             @param cancellable as Gio.Cancellable
         """
+        # Previous search is superseded
+        if self.__cancellable is not None and\
+                self.__cancellable != cancellable:
+            self.__cancellable.cancel()
+        self.__cancellable = cancellable
+        # A cancelled web search never finishes
+        if self.__web_pending:
+            self.__web_pending = False
+            self.__search_count -= 1
         # Only local items
         storage_type = StorageType.COLLECTION |\
             StorageType.SAVED |\
@@ -98,14 +120,105 @@ class Search(GObject.Object):
                               search, storage_type, cancellable)
         self.__search_count += 1
         if self.__web_search is not None:
-            storage_type = StorageType.SEARCH | StorageType.EPHEMERAL
-            App().task_helper.run(self.__web_search.get,
-                                  search, storage_type, cancellable)
+            self.__web_pending = True
             self.__search_count += 1
+            self.__get_web(search, cancellable)
 
 #######################
 # PRIVATE             #
 #######################
+    def __get_web(self, search, cancellable):
+        """
+            Get web matches for search, from cache if possible
+            @param search as str
+            @param cancellable as Gio.Cancellable
+        """
+        words = noaccents(search).split()
+        key = "%s:%s" % (self.__web_search_name, " ".join(words))
+        matches = self.__CACHE.get(key)
+        if matches is not None:
+            App().task_helper.run(self.__get_cached,
+                                  matches, [], cancellable)
+            return
+        # Query extends a cached query, filter its matches
+        min_length = len(self.__web_search_name) + 1 +\
+            self.__MIN_PREFIX_LENGTH
+        matches = self.__CACHE.get_prefix(key, min_length)
+        if matches is not None:
+            App().task_helper.run(self.__get_cached,
+                                  matches, words, cancellable)
+            return
+        storage_type = StorageType.SEARCH | StorageType.EPHEMERAL
+        web_search = self.__web_search()
+        self.__web_matches = []
+        for match in ["match-artist", "match-album", "match-track"]:
+            web_search.connect(match, self.__on_web_match,
+                               match, cancellable)
+        web_search.connect("finished", self.__on_web_finished,
+                           key, cancellable)
+        App().task_helper.run(web_search.get,
+                              search, storage_type, cancellable)
+
+    def __get_cached(self, matches, words, cancellable):
+        """
+            Emit cached matches still in DB and containing words
+            @param matches as [(str, int, int)]
+            @param words as [str]
+            @param cancellable as Gio.Cancellable
+            @thread safe
+        """
+        for (match, object_id, storage_type) in matches:
+            if cancellable.is_cancelled():
+                return
+            if match == "match-track":
+                name = App().tracks.get_name(object_id)
+                names = App().tracks.get_artists(object_id)
+            elif match == "match-album":
+                name = App().albums.get_name(object_id)
+                names = App().albums.get_artists(object_id)
+            else:
+                name = App().artists.get_name(object_id)
+                names = []
+            # Removed from DB
+            if not name:
+                continue
+            if words:
+                haystack = noaccents(" ".join([name] + names))
+                if [word for word in words if word not in haystack]:
+                    continue
+            emit_signal(self, match, object_id, storage_type)
+        GLib.idle_add(self.__on_web_finished, None, None, cancellable)
+
+    def __on_web_match(self, web_search, object_id, storage_type,
+                       match, cancellable):
+        """
+            Store and forward web search match
+            @param web_search as Search provider
+            @param object_id as int
+            @param storage_type as int
+            @param match as str
+            @param cancellable as Gio.Cancellable
+        """
+        if cancellable.is_cancelled():
+            return
+        self.__web_matches.append((match, object_id, storage_type))
+        self.emit(match, object_id, storage_type)
+
+    def __on_web_finished(self, web_search, key, cancellable):
+        """
+            Cache web search matches
+            @param web_search as Search provider
+            @param key as str/None
+            @param cancellable as Gio.Cancellable
+        """
+        if cancellable.is_cancelled():
+            return
+        if key is not None:
+            self.__CACHE.set(key, self.__web_matches)
+        self.__web_matches = []
+        self.__web_pending = False
+        self.__on_finished(web_search)
+
     def __on_finished(self, search):
         """
             Emit finished signals if all search are finished
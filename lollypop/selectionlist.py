@@ -258,6 +258,9 @@ class SelectionList(LazyLoadingView, GesturesHelper):
             @param base_mask as SelectionListMask
         """
         LazyLoadingView.__init__(self, StorageType.ALL, ViewType.DEFAULT)
+        # Rows by id
+        self.__rows = {}
+        self.__fastscroll_idle_id = None
         self.__selection_pending_ids = []
         self.__base_mask = base_mask
         self.__mask = SelectionListMask.NONE
@@ -337,10 +340,9 @@ class SelectionList(LazyLoadingView, GesturesHelper):
             Remove id from list
             @param object_id as int
         """
-        for child in self._box.get_children():
-            if child.id == object_id:
-                child.destroy()
-                break
+        row = self.__rows.pop(object_id, None)
+        if row is not None:
+            row.destroy()
 
     def add_value(self, value):
         """
@@ -350,9 +352,7 @@ class SelectionList(LazyLoadingView, GesturesHelper):
         self._box.set_sort_func(self.__sort_func)
         child = self._get_child(value)
         child.populate()
-        if self.mask & SelectionListMask.ARTISTS:
-            self.__fastscroll.clear()
-            self.__fastscroll.populate()
+        self.__queue_fastscroll_update()
 
     def update_value(self, object_id, name):
         """
@@ -360,37 +360,27 @@ class SelectionList(LazyLoadingView, GesturesHelper):
             @param object_id as int
             @param name as str
         """
-        found = False
-        for child in self._box.get_children():
-            if child.id == object_id:
-                child.set_label(name)
-                found = True
-                break
-        if not found:
-            if self.__base_mask & SelectionListMask.FASTSCROLL:
-                self.__fastscroll.clear()
+        row = self.__rows.get(object_id, None)
+        if row is None:
             self.add_value((object_id, name, name))
+        else:
+            row.set_label(name)
 
     def update_values(self, values):
         """
             Update view with values
             @param [(int, str, optional str)]
         """
-        if self.mask & SelectionListMask.FASTSCROLL:
-            self.__fastscroll.clear()
-        # Remove not found items
         value_ids = set([v[0] for v in values])
-        for child in self._box.get_children():
-            if child.id not in value_ids:
-                self.remove_value(child.id)
+        # Remove not found items
+        for object_id in set(self.__rows.keys()) - value_ids:
+            self.remove_value(object_id)
         # Add items which are not already in the list
-        item_ids = set([child.id for child in self._box.get_children()])
         for value in values:
-            if not value[0] in item_ids:
+            if value[0] not in self.__rows.keys():
                 row = self._get_child(value)
                 row.populate()
-        if self.mask & SelectionListMask.ARTISTS:
-            self.__fastscroll.populate()
+        self.__queue_fastscroll_update()
 
     def select_ids(self, ids=[], activate=True):
         """
@@ -399,10 +389,9 @@ class SelectionList(LazyLoadingView, GesturesHelper):
             @param activate as bool
         """
         if ids:
-            rows = []
-            for row in self._box.get_children():
-                if row.id in ids:
-                    rows.append(row)
+            rows = [self.__rows[object_id] for object_id in ids
+                    if object_id in self.__rows.keys()]
+            rows.sort(key=lambda row: row.get_index())
             if rows:
                 self._box.unselect_all()
                 for row in rows:
@@ -419,6 +408,7 @@ class SelectionList(LazyLoadingView, GesturesHelper):
         self.stop()
         for child in self._box.get_children():
             child.destroy()
+        self.__rows = {}
         if self.__base_mask & SelectionListMask.FASTSCROLL:
             self.__fastscroll.clear()
             self.__fastscroll.clear_chars()
@@ -550,6 +540,7 @@ class SelectionList(LazyLoadingView, GesturesHelper):
                                self.mask, self.__height)
         row.show()
         self._box.add(row)
+        self.__rows[rowid] = row
         return row
 
     def _scroll_to_child(self, row):
@@ -609,6 +600,23 @@ class SelectionList(LazyLoadingView, GesturesHelper):
         else:
             self.__scrolled.set_hexpand(False)
 
+    def __queue_fastscroll_update(self):
+        """
+            Rebuild fastscroll once current batch of changes is done
+        """
+        if self.mask & SelectionListMask.ARTISTS and\
+                self.__fastscroll_idle_id is None:
+            self.__fastscroll_idle_id = GLib.idle_add(
+                self.__update_fastscroll)
+
+    def __update_fastscroll(self):
+        """
+            Rebuild fastscroll
+        """
+        self.__fastscroll_idle_id = None
+        self.__fastscroll.clear()
+        self.__fastscroll.populate()
+
     def __sort_func(self, row_a, row_b):
         """
             Sort rows
@@ -10,8 +10,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from gi.repository import Gio
+
+from time import time
+
 from lollypop.define import App
-from lollypop.utils import get_network_available
+from lollypop.logger import Logger
+from lollypop.utils import get_network_available, sql_escape
 from lollypop.similars_local import LocalSimilars
 from lollypop.similars_spotify import SpotifySimilars
 from lollypop.similars_lastfm import LastFMSimilars
@@ -21,7 +26,15 @@ from lollypop.similars_deezer import DeezerSimilars
 class Similars():
     """
         Search similar artists
+        Similar artists are cached per provider, see get_cached()
     """
+
+    # Seconds before refreshing cached similar artists
+    TTL = {"DEEZER": 604800, "SPOTIFY": 604800, "LASTFM": 2592000,
+           "SPOTIFY_IDS": 604800}
+    # Empty results may come from a network error
+    EMPTY_TTL = 86400
+
     def __init__(self):
         """
             Init similars
@@ -56,3 +69,119 @@ class Similars():
             result = self.__local_helper.get_similar_artists(
                 artist_names, cancellable)
         return result
+
+    def get_similar_artist_ids(self, artist_ids, cancellable):
+        """
+            Get similar artists with albums in collection
+            Providers are queried at most once per artist and TTL
+            @param artist_ids as [int]
+            @param cancellable as Gio.Cancellable
+            @return [int]
+        """
+        providers = [("DEEZER", self.__deezer_helper),
+                     ("SPOTIFY", self.__spotify_helper),
+                     ("LASTFM", self.__lastfm_helper)]
+        for (provider, helper) in providers:
+            if not get_network_available(provider):
+                continue
+            result = []
+            for artist_id in artist_ids:
+                artist_name = App().artists.get_name(artist_id)
+                similars = self.get_cached(artist_name, provider,
+                                           self.__get_local_similars,
+                                           cancellable, helper)
+                for (similar, similar_id) in similars:
+                    if similar_id not in result:
+                        result.append(similar_id)
+            if result:
+                return result
+        return []
+
+    def get_cached(self, artist_name, provider, load, cancellable, *args):
+        """
+            Get similar artists from cache, load them if needed
+            Outdated entries are returned and refreshed in background
+            @param artist_name as str
+            @param provider as str
+            @param load as function
+            @param cancellable as Gio.Cancellable
+            @param args as load() arguments
+            @return [(str, int)] as [(similar, artist id)]
+            @load (artist_name as str, cancellable, *args) -> [(str, int)]
+        """
+        key = artist_name.lower()
+        (mtime, similars) = App().similarities.get_web_similars(key,
+                                                                provider)
+        if mtime is None:
+            similars = self.__load(key, provider, load, cancellable, *args)
+        else:
+            ttl = self.TTL.get(provider, 0) if similars else self.EMPTY_TTL
+            if time() - mtime > ttl:
+                App().task_helper.run(self.__refresh, key, provider,
+                                      similars, load, *args)
+        return similars
+
+#######################
+# PRIVATE             #
+#######################
+    def __load(self, key, provider, load, cancellable, *args):
+        """
+            Load similar artists and cache them
+            @param key as str
+            @param provider as str
+            @param load as function
+            @param cancellable as Gio.Cancellable
+            @param args as load() arguments
+            @return [(str, int)]
+        """
+        similars = load(key, cancellable, *args)
+        if not cancellable.is_cancelled():
+            Logger.info("Similars::__load(): %s, %s: %s similars",
+                        provider, key, len(similars))
+            App().similarities.set_web_similars(key, provider,
+                                                similars, int(time()))
+        return similars
+
+    def __refresh(self, key, provider, similars, load, *args):
+        """
+            Refresh outdated similar artists
+            Providers return nothing on network errors, keep cached
+            similars then and retry later
+            @param key as str
+            @param provider as str
+            @param similars as [(str, int)] cached similars
+            @param load as function
+            @param args as load() arguments
+        """
+        if not similars:
+            self.__load(key, provider, load, Gio.Cancellable(), *args)
+            return
+        refreshed = load(key, Gio.Cancellable(), *args)
+        if refreshed:
+            mtime = int(time())
+        else:
+            Logger.info("Similars::__refresh(): %s, %s: no result",
+                        provider, key)
+            refreshed = similars
+            # Retry in EMPTY_TTL seconds
+            mtime = int(time()) - self.TTL.get(provider, 0) + self.EMPTY_TTL
+        App().similarities.set_web_similars(key, provider,
+                                            refreshed, mtime)
+
+    def __get_local_similars(self, artist_name, cancellable, helper):
+        """
+            Get similar artists from helper, only artists with albums
+            @param artist_name as str
+            @param cancellable as Gio.Cancellable
+            @param helper as object
+            @return [(str, int)]
+        """
+        similars = []
+        for (similar, cover_uri) in helper.get_similar_artists([artist_name],
+                                                               cancellable):
+            similar_id = App().artists.get_id_for_escaped_string(
+                sql_escape(similar.lower()))
+            if similar_id is not None and\
+                    App().artists.has_albums(similar_id):
+                similars.append((similar, similar_id))
+        return similars
@@ -19,7 +19,10 @@ from lollypop.logger import Logger
 class LocalSimilars:
     """
         Search similar artists locally
+        Artists listened together first, then artists sharing a genre
     """
+    __LIMIT = 20
+
     def __init__(self):
         """
             Init provider
@@ -36,11 +39,18 @@ class LocalSimilars:
         artist_ids = []
         for artist_name in artist_names:
             artist_ids.append(App().artists.get_id(artist_name)[0])
+        similar_ids = App().similarities.get_similar_artist_ids(
+            artist_ids, self.__LIMIT)
+        # Artists removed since last clean have no name
+        names = [App().artists.get_name(similar_id)
+                 for similar_id in similar_ids]
+        result = [(name, None) for name in names if name]
         genre_ids = App().artists.get_genre_ids(artist_ids,
                                                 StorageType.COLLECTION)
         artists = App().artists.get(genre_ids, StorageType.COLLECTION)
         shuffle(artists)
-        result = [(name, None) for (artist_id, name, sortname) in artists]
+        result += [(name, None) for (artist_id, name, sortname) in artists
+                   if name and artist_id not in similar_ids]
         if result:
             Logger.info("Found similar artists with LocalSimilars")
         return result
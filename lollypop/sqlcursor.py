@@ -14,6 +14,7 @@
 from threading import current_thread
 
 from lollypop.define import App
+from lollypop.tracer import Tracer
 
 
 class SqlCursor:
@@ -66,10 +67,10 @@ class SqlCursor:
         name = current_thread().getName() + self.__obj.__class__.__name__
         if name in App().cursors.keys():
             cursor = App().cursors[name]
-            return cursor
+            return Tracer.wrap_sql(cursor)
         else:
             self.__cursor = self.__obj.get_cursor()
-            return self.__cursor
+            return Tracer.wrap_sql(self.__cursor)
 
     def __exit__(self, type, value, traceback):
         """
@@ -12,16 +12,18 @@
 
 from gi.repository import GLib, Gio, Gst, GObject
 
-from time import sleep
+from time import sleep, time
 from re import match
 from random import shuffle
+from hashlib import md5
 import json
 import os
 import tempfile
 
 from lollypop.logger import Logger
 from lollypop.utils import escape, emit_signal
-from lollypop.define import App, Type
+from lollypop.utils_file import create_dir
+from lollypop.define import App, Type, CACHE_PATH
 from lollypop.objects_track import Track
 from lollypop.objects_album import Album
 
@@ -37,8 +39,14 @@ class MtpSyncDb:
         The storage format is a simple JSON dump.
         It also implements the context manager interface, ensuring database is
         loaded before entering the scope and saving it when exiting.
+
+        Changes are journaled: db is saved every few changes, so an
+        interrupted sync can resume where it stopped.
     """
 
+    __JOURNAL_CHANGES = 50
+    __JOURNAL_DELAY = 60
+
     def __init__(self):
         """
             Constructor for MtpSyncDb
@@ -46,6 +54,8 @@ class MtpSyncDb:
         self.__encoder = "convert_none"
         self.__normalize = False
         self.__metadata = {}
+        self.__changes = 0
+        self.__saved_time = time()
 
     def load(self, base_uri):
         """
@@ -91,9 +101,20 @@ class MtpSyncDb:
             stream.get_output_stream().write_all(jsondb.encode("utf-8"))
             tmpfile.copy(dbfile, Gio.FileCopyFlags.OVERWRITE, None, None)
             stream.close()
+            self.__changes = 0
+            self.__saved_time = time()
         except Exception as e:
             Logger.error("MtpSyncDb::__save(): %s", e)
 
+    def journal(self):
+        """
+            Record a change, save db if enough changes are pending
+        """
+        self.__changes += 1
+        if self.__changes >= self.__JOURNAL_CHANGES or\
+                time() - self.__saved_time > self.__JOURNAL_DELAY:
+            self.save()
+
     def set_encoder(self, encoder):
         """
             Set encoder
@@ -165,6 +186,143 @@ class MtpSyncDb:
         return uri
 
 
+class MtpSyncCache:
+    """
+        Local cache for transcoded files
+
+        Converting a file is CPU bound while copying it is IO bound, so we
+        keep converted files around and reuse them for other devices or
+        for later syncs.
+        Entries are keyed by source identity (uri, size, mtime) and encoding
+        parameters (encoder, bitrate, normalize).
+        Cache is size bounded, least recently used entries are removed first.
+    """
+
+    PATH = "%s/transcode" % CACHE_PATH
+
+    def __init__(self):
+        """
+            Init cache
+        """
+        # Value is in MB
+        self.__max_size = App().settings.get_value(
+            "transcode-cache-size").get_int32() * 1024 * 1024
+        # Cache size, computed on first add
+        self.__size = None
+        if self.__max_size > 0:
+            create_dir(self.PATH)
+
+    def get_key(self, src, encoder, bitrate, normalize):
+        """
+            Get cache key for source and encoding parameters
+            @param src as Gio.File
+            @param encoder as str
+            @param bitrate as int
+            @param normalize as bool
+            @return str
+        """
+        info = src.query_info("standard::size,time::modified",
+                              Gio.FileQueryInfoFlags.NONE,
+                              None)
+        string = "%s_%s_%s_%s_%s_%s" % (
+            src.get_uri(),
+            info.get_size(),
+            info.get_attribute_uint64("time::modified"),
+            encoder,
+            bitrate,
+            normalize)
+        return md5(string.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """
+            Get cached file for key, mark it as recently used
+            @param key as str
+            @return Gio.File/None
+        """
+        if not self.enabled:
+            return None
+        f = Gio.File.new_for_path("%s/%s" % (self.PATH, key))
+        if f.query_exists():
+            try:
+                os.utime(f.get_path())
+            except Exception as e:
+                Logger.warning("MtpSyncCache::lookup(): %s", e)
+            return f
+        return None
+
+    def add(self, key, f):
+        """
+            Move file into cache
+            @param key as str
+            @param f as Gio.File
+            @return Gio.File/None
+        """
+        if not self.enabled:
+            return None
+        try:
+            if self.__size is None:
+                self.__size = self.__get_size()
+            path = "%s/%s" % (self.PATH, key)
+            cached = Gio.File.new_for_path(path)
+            if cached.query_exists():
+                self.__size -= os.path.getsize(path)
+            f.move(cached, Gio.FileCopyFlags.OVERWRITE, None, None)
+            self.__size += os.path.getsize(path)
+            if self.__size > self.__max_size:
+                self.__evict(path)
+            return cached
+        except Exception as e:
+            Logger.error("MtpSyncCache::add(): %s", e)
+        return None
+
+    @property
+    def enabled(self):
+        """
+            True if cache is enabled
+            @return bool
+        """
+        return self.__max_size > 0
+
+############
+# Private  #
+############
+    def __get_size(self):
+        """
+            Get cache size
+            @return int
+        """
+        size = 0
+        for entry in os.scandir(self.PATH):
+            if entry.is_file():
+                size += entry.stat().st_size
+        return size
+
+    def __evict(self, keep):
+        """
+            Remove least recently used entries until cache fits in max size
+            @param keep as str, path not to remove
+        """
+        entries = []
+        size = 0
+        for entry in os.scandir(self.PATH):
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            size += stat.st_size
+            if entry.path != keep:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        for (mtime, entry_size, path) in entries:
+            if size <= self.__max_size:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+            except Exception as e:
+                Logger.warning("MtpSyncCache::__evict(): %s", e)
+        self.__size = size
+
+
 class MtpSync(GObject.Object):
     """
         Synchronisation to MTP devices
@@ -212,6 +370,7 @@ class MtpSync(GObject.Object):
         self.__total = 0  # Total files to sync
         self.__done = 0   # Handled files on sync
         self.__mtp_syncdb = MtpSyncDb()
+        self.__transcode_cache = MtpSyncCache()
 
     def check_encoder_status(self, encoder):
         """
@@ -296,9 +455,9 @@ class MtpSync(GObject.Object):
         except Exception as e:
             Logger.error("MtpSync::__sync(): %s" % e)
         finally:
+            # Always save, db only contains fully synced files
             Logger.info("Save sync db")
-            if not self.__cancellable.is_cancelled():
-                self.__mtp_syncdb.save()
+            self.__mtp_syncdb.save()
             self.cancel()
             if self.__errors_count != 0:
                 Logger.debug("Sync errors")
@@ -345,6 +504,7 @@ class MtpSync(GObject.Object):
         """
         uris = []
         art_uris = []
+        handled_uris = set()
         for track in tracks:
             f = Gio.File.new_for_uri(track.uri)
             album_device_uri = "%s/%s" % (self.__uri,
@@ -357,7 +517,14 @@ class MtpSync(GObject.Object):
             dst_uri = "%s/%s" % (album_device_uri, escape(f.get_basename()))
             (convertion_needed,
              dst_uri) = self.__is_convertion_needed(src_uri, dst_uri)
+            # Same track may be in a synced album and in a synced playlist
+            if dst_uri in handled_uris:
+                continue
+            handled_uris.add(dst_uri)
             uris.append((src_uri, dst_uri))
+            if album_device_uri in handled_uris:
+                continue
+            handled_uris.add(album_device_uri)
             art_uri = App().art.get_album_artwork_uri(track.album)
             if art_uri is not None:
                 art_filename = Gio.File.new_for_uri(art_uri).get_basename()
@@ -421,28 +588,46 @@ class MtpSync(GObject.Object):
             Delete old URIs from device
             @param uris as [str]
         """
-        on_device_uris = self.__on_device_uris()
+        wanted_uris = set()
         for (src_uri, dst_uri) in uris:
-            dst = Gio.File.new_for_uri(dst_uri)
-            if dst.get_uri() in on_device_uris:
-                on_device_uris.remove(dst.get_uri())
-        for uri in on_device_uris:
+            wanted_uris.add(Gio.File.new_for_uri(dst_uri).get_uri())
+        old_uris = set(self.__on_device_uris()) - wanted_uris
+        parent_uris = set()
+        for uri in old_uris:
             if self.__cancellable.is_cancelled():
                 break
             try:
                 f = Gio.File.new_for_uri(uri)
-                parent = f.get_parent()
+                parent_uris.add(f.get_parent().get_uri())
                 f.delete(self.__cancellable)
                 self.__mtp_syncdb.delete_uri(uri)
-                infos = parent.enumerate_children(
-                    "standard::name,standard::type",
+                self.__mtp_syncdb.journal()
+            except Exception as e:
+                Logger.error("MtpSync::__delete_old_uris(): %s", e)
+        self.__delete_empty_dirs(parent_uris)
+
+    def __delete_empty_dirs(self, uris):
+        """
+            Delete empty directories, deepest first
+            @param uris as {str}
+        """
+        for uri in sorted(uris, key=len, reverse=True):
+            if self.__cancellable.is_cancelled():
+                break
+            if uri == self.__uri:
+                continue
+            try:
+                d = Gio.File.new_for_uri(uri)
+                infos = d.enumerate_children(
+                    "standard::name",
                     Gio.FileQueryInfoFlags.NOFOLLOW_SYMLINKS,
                     None)
-                if len(list(infos)) == 0:
-                    parent.delete(self.__cancellable)
+                empty = infos.next_file(None) is None
                 infos.close(None)
+                if empty:
+                    d.delete(self.__cancellable)
             except Exception as e:
-                Logger.error("MtpSync::__delete_old_uris(): %s", e)
+                Logger.error("MtpSync::__delete_empty_dirs(): %s", e)
 
     def __on_device_uris(self):
         """
@@ -523,32 +708,73 @@ class MtpSync(GObject.Object):
                 self.__mtp_syncdb.get_mtime(dst_uri) < mtime:
             Logger.debug("MtpSync::__copy_file(): %s -> %s"
                          % (src_uri, dst_uri))
-            if convertion_needed:
-                convert_uri = "file:///tmp/lollypop_convert"
-                convert_file = Gio.File.new_for_uri(convert_uri)
-                pipeline = self.__convert(src, convert_file)
-                # Check if encoding is finished
-                if pipeline is not None:
-                    bus = pipeline.get_bus()
-                    bus.add_signal_watch()
-                    bus.connect("message::eos", self.__on_bus_eos)
-                    self.__encoding = True
-                    while self.__encoding and\
-                            not self.__cancellable.is_cancelled():
-                        sleep(1)
-                    bus.disconnect_by_func(self.__on_bus_eos)
-                    bus.remove_signal_watch()
-                    pipeline.set_state(Gst.State.NULL)
-                    convert_file.move(
-                        dst, Gio.FileCopyFlags.OVERWRITE, None, None)
-                    # To be sure
-                    try:
-                        convert_file.delete(None)
-                    except:
-                        pass
-            else:
-                src.copy(dst, Gio.FileCopyFlags.OVERWRITE, None, None)
+            try:
+                if convertion_needed:
+                    key = self.__transcode_cache.get_key(
+                        src,
+                        self.__mtp_syncdb.encoder,
+                        self.__convert_bitrate,
+                        self.__mtp_syncdb.normalize)
+                    cached = self.__transcode_cache.lookup(key)
+                    if cached is not None:
+                        Logger.debug("MtpSync::__copy_file(): cache hit %s"
+                                     % src_uri)
+                        cached.copy(dst, Gio.FileCopyFlags.OVERWRITE,
+                                    None, None)
+                    elif not self.__convert_file(src, dst, key):
+                        raise Exception("Convertion failed: %s" % src_uri)
+                else:
+                    src.copy(dst, Gio.FileCopyFlags.OVERWRITE, None, None)
+            except:
+                # Never keep a partial file on device
+                try:
+                    dst.delete(None)
+                except:
+                    pass
+                raise
             self.__mtp_syncdb.set_mtime(dst_uri, mtime)
+            self.__mtp_syncdb.journal()
+
+    def __convert_file(self, src, dst, key):
+        """
+            Convert source to destination, keep a copy in transcode cache
+            @param src as Gio.File
+            @param dst as Gio.File
+            @param key as str
+            @return True if file fully converted
+        """
+        convert_uri = "file:///tmp/lollypop_convert"
+        convert_file = Gio.File.new_for_uri(convert_uri)
+        pipeline = self.__convert(src, convert_file)
+        if pipeline is None:
+            return False
+        # Check if encoding is finished
+        bus = pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message::eos", self.__on_bus_eos)
+        bus.connect("message::error", self.__on_bus_error)
+        self.__encoding = True
+        self.__encoded = False
+        while self.__encoding and\
+                not self.__cancellable.is_cancelled():
+            sleep(1)
+        bus.disconnect_by_func(self.__on_bus_eos)
+        bus.disconnect_by_func(self.__on_bus_error)
+        bus.remove_signal_watch()
+        pipeline.set_state(Gst.State.NULL)
+        try:
+            # Do not sync or cache partial files
+            if self.__encoded:
+                convert_file.copy(dst, Gio.FileCopyFlags.OVERWRITE,
+                                  None, None)
+                self.__transcode_cache.add(key, convert_file)
+        finally:
+            # To be sure
+            try:
+                convert_file.delete(None)
+            except:
+                pass
+        return self.__encoded
 
     def __convert(self, src, dst):
         """
@@ -590,4 +816,15 @@ class MtpSync(GObject.Object):
             @param bus as Gst.Bus
             @param message as Gst.Message
         """
+        self.__encoded = True
+        self.__encoding = False
+
+    def __on_bus_error(self, bus, message):
+        """
+            Stop encoding
+            @param bus as Gst.Bus
+            @param message as Gst.Message
+        """
+        Logger.error("MtpSync::__on_bus_error(): %s",
+                     message.parse_error()[0].message)
         self.__encoding = False
@@ -17,6 +17,7 @@ from gettext import gettext as _
 
 from lollypop.define import App
 from lollypop.logger import Logger
+from lollypop.tagreader_fast import FastTagReader
 from lollypop.utils import format_artist_name, get_iso_date_from_string
 
 
@@ -29,6 +30,7 @@ class Discoverer:
         """
             Init tag reader
         """
+        self.__fast_tag_reader = FastTagReader()
         self.init_discoverer()
 
     def init_discoverer(self):
@@ -47,6 +49,22 @@ class Discoverer:
         info = self._discoverer.discover_uri(uri)
         return info
 
+    def get_tags(self, uri):
+        """
+            Return tags and duration for file at uri
+            Common formats are read without GStreamer
+            @param uri as str
+            @Exception GLib.Error
+            @return (Gst.TagList/FastTagList, int) as (tags, duration in ms)
+        """
+        if uri.startswith("file:"):
+            path = GLib.filename_from_uri(uri)[0]
+            result = self.__fast_tag_reader.get_tags(path)
+            if result is not None:
+                return result
+        info = self.get_info(uri)
+        return (info.get_tags(), int(info.get_duration() / 1000000))
+
 
 class TagReader:
     """
@@ -0,0 +1,761 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import Gst
+
+import struct
+
+from lollypop.logger import Logger
+
+
+class FastTagSample:
+    """
+        Raw ID3v2 frame, mimic Gst.Sample, Gst.Buffer and Gst.MapInfo
+    """
+
+    def __init__(self, data):
+        """
+            Init sample
+            @param data as bytes
+        """
+        self.data = data
+
+    def get_buffer(self):
+        """
+            Get buffer
+            @return FastTagSample
+        """
+        return self
+
+    def map(self, flags):
+        """
+            Map buffer
+            @param flags as Gst.MapFlags
+            @return (bool, FastTagSample)
+        """
+        return (True, self)
+
+
+class FastTagList:
+    """
+        Tags read by FastTagReader, mimic Gst.TagList getters used by
+        TagReader
+    """
+
+    def __init__(self):
+        """
+            Init tag list
+        """
+        self.__tags = {}
+
+    def add(self, tag, value):
+        """
+            Add a value for tag
+            @param tag as str
+            @param value as object
+        """
+        if tag in self.__tags.keys():
+            self.__tags[tag].append(value)
+        else:
+            self.__tags[tag] = [value]
+
+    def get_tag_size(self, tag):
+        """
+            Get values count for tag
+            @param tag as str
+            @return int
+        """
+        return len(self.__tags.get(tag, []))
+
+    def get_string_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, str)
+        """
+        return self.__get_index(tag, index)
+
+    def get_uint_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, int)
+        """
+        return self.__get_index(tag, index)
+
+    def get_double_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, float)
+        """
+        return self.__get_index(tag, index)
+
+    def get_sample_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, FastTagSample)
+        """
+        return self.__get_index(tag, index)
+
+    def get_date_index(self, tag, index):
+        """
+            Dates are only stored as date times
+            @param tag as str
+            @param index as int
+            @return (bool, None)
+        """
+        return (False, None)
+
+    def get_date_time_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, Gst.DateTime)
+        """
+        (exists, value) = self.__get_index(tag, index)
+        if exists:
+            datetime = Gst.DateTime.new_from_iso8601_string(value)
+            if datetime is not None:
+                return (True, datetime)
+        return (False, None)
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_index(self, tag, index):
+        """
+            Get value at index
+            @param tag as str
+            @param index as int
+            @return (bool, object)
+        """
+        values = self.__tags.get(tag, [])
+        if index < len(values):
+            return (True, values[index])
+        return (False, None)
+
+
+class FastTagReader:
+    """
+        Read tags and duration of FLAC, MP3, Ogg Vorbis/Opus and MP4
+        files without building a GStreamer pipeline
+        Only headers and tag blocks are read, tags are mapped like
+        GStreamer does
+    """
+
+    # Bigger tag blocks are left to GStreamer
+    MAX_BLOCK_SIZE = 16777216
+
+    __VORBIS_STRINGS = {
+        "TITLE": "title",
+        "VERSION": "version",
+        "ALBUM": "album",
+        "ARTIST": "artist",
+        "PERFORMER": "performer",
+        "COMPOSER": "composer",
+        "GENRE": "genre",
+        "ALBUMARTIST": "album-artist",
+        "ALBUM ARTIST": "album-artist",
+        "ARTISTSORT": "artist-sortname",
+        "ARTISTSORTORDER": "artist-sortname",
+        "MUSICBRAINZ_SORTNAME": "artist-sortname",
+        "ALBUMARTISTSORT": "album-artist-sortname",
+        "ALBUMARTISTSORTORDER": "album-artist-sortname",
+        "MUSICBRAINZ_TRACKID": "musicbrainz-trackid",
+        "MUSICBRAINZ_ARTISTID": "musicbrainz-artistid",
+        "MUSICBRAINZ_ALBUMID": "musicbrainz-albumid",
+        "MUSICBRAINZ_ALBUMARTISTID": "musicbrainz-albumartistid"}
+    __VORBIS_NUMBERS = {
+        "TRACKNUMBER": "track-number",
+        "DISCNUMBER": "album-disc-number"}
+    __VORBIS_IGNORED = ["METADATA_BLOCK_PICTURE", "COVERART", "COVERARTMIME"]
+
+    __ID3_STRINGS = {
+        b"TIT2": "title",
+        b"TALB": "album",
+        b"TPE1": "artist",
+        b"TPE2": "album-artist",
+        b"TPE4": "interpreted-by",
+        b"TCOM": "composer",
+        b"TCON": "genre",
+        b"TSOP": "artist-sortname",
+        b"TSO2": "album-artist-sortname"}
+    __ID3_NUMBERS = {
+        b"TRCK": "track-number",
+        b"TPOS": "album-disc-number"}
+    __ID3_TXXX = {
+        "MusicBrainz Artist Id": "musicbrainz-artistid",
+        "MusicBrainz Album Id": "musicbrainz-albumid",
+        "MusicBrainz Album Artist Id": "musicbrainz-albumartistid"}
+    # Frames read by TagReader from private-id3v2-frame
+    __ID3_PRIVATE = [b"POPM", b"TDOR", b"USLT", b"SYLT"]
+    __ID3_ENCODINGS = ["latin-1", "utf-16", "utf-16-be", "utf-8"]
+
+    __MP4_STRINGS = {
+        b"\xa9nam": "title",
+        b"\xa9ART": "artist",
+        b"aART": "album-artist",
+        b"\xa9alb": "album",
+        b"\xa9gen": "genre",
+        b"\xa9wrt": "composer",
+        b"\xa9lyr": "lyrics",
+        b"soar": "artist-sortname",
+        b"soaa": "album-artist-sortname"}
+    __MP4_NUMBERS = {
+        b"trkn": "track-number",
+        b"disk": "album-disc-number"}
+    __MP4_FREEFORM = {
+        "MusicBrainz Track Id": "musicbrainz-trackid",
+        "MusicBrainz Artist Id": "musicbrainz-artistid",
+        "MusicBrainz Album Id": "musicbrainz-albumid",
+        "MusicBrainz Album Artist Id": "musicbrainz-albumartistid"}
+
+    # MPEG audio bitrates in kbps for (MPEG 1, layer) and (MPEG 2, layer)
+    __MPEG_BITRATES = {
+        (True, 1): [0, 32, 64, 96, 128, 160, 192, 224,
+                    256, 288, 320, 352, 384, 416, 448],
+        (True, 2): [0, 32, 48, 56, 64, 80, 96, 112,
+                    128, 160, 192, 224, 256, 320, 384],
+        (True, 3): [0, 32, 40, 48, 56, 64, 80, 96,
+                    112, 128, 160, 192, 224, 256, 320],
+        (False, 1): [0, 32, 48, 56, 64, 80, 96, 112,
+                     128, 144, 160, 176, 192, 224, 256],
+        (False, 2): [0, 8, 16, 24, 32, 40, 48, 56,
+                     64, 80, 96, 112, 128, 144, 160],
+        (False, 3): [0, 8, 16, 24, 32, 40, 48, 56,
+                     64, 80, 96, 112, 128, 144, 160]}
+    # Sample rates for MPEG 1, 2 and 2.5
+    __MPEG_SAMPLE_RATES = {3: [44100, 48000, 32000],
+                           2: [22050, 24000, 16000],
+                           0: [11025, 12000, 8000]}
+
+    def get_tags(self, path):
+        """
+            Get tags and duration for file
+            @param path as str
+            @return (FastTagList, int) as (tags, duration in ms) or None
+                    if file is not handled
+        """
+        try:
+            tags = FastTagList()
+            with open(path, "rb") as f:
+                header = f.read(12)
+                f.seek(0)
+                if header[0:4] == b"fLaC":
+                    duration = self.__read_flac(f, tags)
+                elif header[0:4] == b"OggS":
+                    duration = self.__read_ogg(f, tags)
+                elif header[4:8] == b"ftyp":
+                    duration = self.__read_mp4(f, tags)
+                elif header[0:3] == b"ID3":
+                    id3_tags = FastTagList()
+                    start = self.__read_id3(f, id3_tags)
+                    f.seek(start)
+                    if f.read(4) == b"fLaC":
+                        # GStreamer ignores ID3 tags in FLAC files
+                        f.seek(start)
+                        duration = self.__read_flac(f, tags)
+                    else:
+                        tags = id3_tags
+                        duration = self.__read_mpeg_duration(f, start)
+                else:
+                    return None
+            if duration is not None and duration > 0:
+                return (tags, duration)
+        except Exception as e:
+            Logger.debug("FastTagReader::get_tags(): %s: %s", path, e)
+        return None
+
+#######################
+# PRIVATE             #
+#######################
+    def __read_block(self, f, size):
+        """
+            Read a tag block
+            @param f as file
+            @param size as int
+            @return bytes
+        """
+        if size > self.MAX_BLOCK_SIZE:
+            raise Exception("Block too big: %s" % size)
+        data = f.read(size)
+        if len(data) != size:
+            raise Exception("Truncated block")
+        return data
+
+    def __add_number(self, tags, tag, value):
+        """
+            Add number like "3" or "3/12" to tags
+            @param tags as FastTagList
+            @param tag as str
+            @param value as str
+        """
+        try:
+            number = int(value.split("/")[0].strip())
+            if number > 0:
+                tags.add(tag, number)
+        except ValueError:
+            pass
+
+    def __add_bpm(self, tags, value):
+        """
+            Add BPM to tags
+            @param tags as FastTagList
+            @param value as str
+        """
+        try:
+            tags.add("beats-per-minute", float(value))
+        except ValueError:
+            pass
+
+    def __read_vorbis_comment(self, data, tags):
+        """
+            Read a Vorbis comment block
+            @param data as bytes
+            @param tags as FastTagList
+        """
+        (vendor_length,) = struct.unpack("<I", data[0:4])
+        position = 4 + vendor_length
+        (count,) = struct.unpack("<I", data[position:position + 4])
+        position += 4
+        for i in range(0, count):
+            (length,) = struct.unpack("<I", data[position:position + 4])
+            position += 4
+            comment = data[position:position + length]
+            comment = comment.decode("utf-8", "replace")
+            position += length
+            (key, separator, value) = comment.partition("=")
+            key = key.upper()
+            if not separator or key in self.__VORBIS_IGNORED:
+                continue
+            elif key in self.__VORBIS_STRINGS.keys():
+                tags.add(self.__VORBIS_STRINGS[key], value)
+            elif key in self.__VORBIS_NUMBERS.keys():
+                self.__add_number(tags, self.__VORBIS_NUMBERS[key], value)
+            elif key == "BPM":
+                self.__add_bpm(tags, value)
+            elif key == "DATE":
+                tags.add("datetime", value.strip()[0:10])
+            else:
+                tags.add("extended-comment", "%s=%s" % (key, value))
+
+    def __read_flac(self, f, tags):
+        """
+            Read FLAC metadata blocks
+            @param f as file
+            @param tags as FastTagList
+            @return duration in ms as int
+        """
+        if f.read(4) != b"fLaC":
+            raise Exception("Not a FLAC file")
+        duration = 0
+        last = False
+        while not last:
+            header = f.read(4)
+            if len(header) != 4:
+                raise Exception("Truncated FLAC file")
+            last = header[0] & 0x80
+            block_type = header[0] & 0x7F
+            length = int.from_bytes(header[1:4], "big")
+            if block_type == 0:
+                # STREAMINFO: sample rate (20 bits) ... samples (36 bits)
+                value = int.from_bytes(self.__read_block(f, length)[10:18],
+                                       "big")
+                sample_rate = value >> 44
+                samples = value & 0xFFFFFFFFF
+                if sample_rate > 0:
+                    duration = samples * 1000 // sample_rate
+            elif block_type == 4:
+                self.__read_vorbis_comment(self.__read_block(f, length),
+                                           tags)
+            else:
+                f.seek(length, 1)
+        return duration
+
+    def __read_ogg(self, f, tags):
+        """
+            Read Ogg Vorbis/Opus headers
+            @param f as file
+            @param tags as FastTagList
+            @return duration in ms as int
+        """
+        # Identification and comment packets
+        packets = []
+        packet = b""
+        serial = None
+        while len(packets) < 2:
+            header = f.read(27)
+            if len(header) != 27 or header[0:4] != b"OggS":
+                raise Exception("Invalid Ogg page")
+            (page_serial,) = struct.unpack("<I", header[14:18])
+            lacings = f.read(header[26])
+            data = f.read(sum(lacings))
+            if serial is None:
+                serial = page_serial
+            elif page_serial != serial:
+                continue
+            position = 0
+            for lacing in lacings:
+                packet += data[position:position + lacing]
+                position += lacing
+                if lacing < 255:
+                    packets.append(packet)
+                    packet = b""
+            if len(packet) > self.MAX_BLOCK_SIZE:
+                raise Exception("Block too big")
+        (identification, comment) = packets[0:2]
+        if identification.startswith(b"\x01vorbis") and\
+                comment.startswith(b"\x03vorbis"):
+            (sample_rate,) = struct.unpack("<I", identification[12:16])
+            pre_skip = 0
+            self.__read_vorbis_comment(comment[7:], tags)
+        elif identification.startswith(b"OpusHead") and\
+                comment.startswith(b"OpusTags"):
+            # Opus granule position is always at 48kHz
+            sample_rate = 48000
+            (pre_skip,) = struct.unpack("<H", identification[10:12])
+            self.__read_vorbis_comment(comment[8:], tags)
+        else:
+            raise Exception("Unsupported Ogg codec")
+        granule = self.__get_ogg_last_granule(f, serial)
+        return max(0, granule - pre_skip) * 1000 // sample_rate
+
+    def __get_ogg_last_granule(self, f, serial):
+        """
+            Get granule position of last page for serial
+            @param f as file
+            @param serial as int
+            @return int
+        """
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        data = f.read()
+        position = data.rfind(b"OggS")
+        while position != -1:
+            header = data[position:position + 18]
+            if len(header) == 18:
+                (granule, page_serial) = struct.unpack("<qI", header[6:18])
+                if page_serial == serial and granule >= 0:
+                    return granule
+            position = data.rfind(b"OggS", 0, position)
+        raise Exception("No Ogg granule position")
+
+    def __read_id3(self, f, tags):
+        """
+            Read ID3v2 tag at file start
+            @param f as file
+            @param tags as FastTagList
+            @return tag size as int
+        """
+        header = f.read(10)
+        version = header[3]
+        flags = header[5]
+        size = self.__get_syncsafe(header[6:10])
+        # Unsynchronisation or extended header, leave it to GStreamer
+        if version not in [3, 4] or flags & 0xC0:
+            raise Exception("Unsupported ID3v2 tag")
+        data = self.__read_block(f, size)
+        position = 0
+        while position + 10 <= len(data):
+            frame_id = data[position:position + 4]
+            if not frame_id.isalnum():
+                break
+            if version == 4:
+                frame_size = self.__get_syncsafe(
+                    data[position + 4:position + 8])
+                unsupported = data[position + 9] & 0x4F
+            else:
+                (frame_size,) = struct.unpack(
+                    ">I", data[position + 4:position + 8])
+                unsupported = data[position + 9] & 0xE0
+            frame = data[position:position + 10 + frame_size]
+            position += 10 + frame_size
+            # Compression, encryption, grouping...
+            if unsupported:
+                raise Exception("Unsupported ID3v2 frame")
+            self.__add_id3_frame(tags, frame_id, frame)
+        footer = 10 if flags & 0x10 else 0
+        return 10 + size + footer
+
+    def __add_id3_frame(self, tags, frame_id, frame):
+        """
+            Add ID3v2 frame to tags
+            @param tags as FastTagList
+            @param frame_id as bytes
+            @param frame as bytes with header
+        """
+        if frame_id in self.__ID3_PRIVATE:
+            tags.add("private-id3v2-frame", FastTagSample(frame))
+        elif frame_id == b"UFID":
+            (owner, separator, identifier) = frame[10:].partition(b"\x00")
+            if owner == b"http://musicbrainz.org":
+                tags.add("musicbrainz-trackid",
+                         identifier.decode("latin-1"))
+        elif frame_id[0:1] == b"T":
+            values = self.__get_id3_strings(frame[10:])
+            if frame_id in self.__ID3_STRINGS.keys():
+                for value in values:
+                    # ID3v1 genre references need GStreamer
+                    if frame_id == b"TCON" and (value.startswith("(") or
+                                                value.isdigit()):
+                        raise Exception("ID3v1 genre: %s" % value)
+                    tags.add(self.__ID3_STRINGS[frame_id], value)
+            elif frame_id in self.__ID3_NUMBERS.keys() and values:
+                self.__add_number(tags, self.__ID3_NUMBERS[frame_id],
+                                  values[0])
+            elif frame_id == b"TBPM" and values:
+                self.__add_bpm(tags, values[0])
+            elif frame_id in [b"TDRC", b"TYER"] and values:
+                tags.add("datetime", values[0].strip()[0:10])
+            elif frame_id == b"TXXX" and len(values) > 1:
+                (description, value) = values[0:2]
+                if description in self.__ID3_TXXX.keys():
+                    tags.add(self.__ID3_TXXX[description], value)
+                else:
+                    tags.add("extended-comment",
+                             "%s=%s" % (description, value))
+
+    def __get_id3_strings(self, data):
+        """
+            Decode ID3v2 text frame content
+            @param data as bytes
+            @return [str]
+        """
+        encoding = self.__ID3_ENCODINGS[data[0]]
+        text = data[1:].decode(encoding, "replace")
+        values = []
+        for value in text.split("\x00"):
+            value = value.strip("\ufeff")
+            if value:
+                values.append(value)
+        return values
+
+    def __get_syncsafe(self, data):
+        """
+            Decode a 28 bits syncsafe integer
+            @param data as bytes
+            @return int
+        """
+        return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+    def __read_mpeg_duration(self, f, start):
+        """
+            Get MPEG audio duration from Xing/VBRI header or bitrate
+            @param f as file
+            @param start as int (first audio byte)
+            @return duration in ms as int/None if not a valid MPEG stream
+        """
+        f.seek(start)
+        data = f.read(65536)
+        # Only padding is allowed before first frame
+        position = len(data) - len(data.lstrip(b"\x00"))
+        header = self.__get_mpeg_header(data[position:position + 4])
+        if header is None:
+            return None
+        (mpeg1, layer, bitrate, sample_rate, mono, padding) = header
+        if layer == 1:
+            samples_per_frame = 384
+            frame_length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+        else:
+            if layer == 2 or mpeg1:
+                samples_per_frame = 1152
+            else:
+                samples_per_frame = 576
+            frame_length = samples_per_frame // 8 * bitrate * 1000 //\
+                sample_rate + padding
+        # Random bytes may look like a frame header, check next one
+        next_position = position + frame_length
+        next_header = self.__get_mpeg_header(
+            data[next_position:next_position + 4])
+        if next_header is None or\
+                next_header[0:2] != header[0:2] or\
+                next_header[3] != header[3]:
+            return None
+        # Xing/Info header is after side information
+        if mpeg1:
+            xing = position + (21 if mono else 36)
+        else:
+            xing = position + (13 if mono else 21)
+        frames = None
+        if data[xing:xing + 4] in [b"Xing", b"Info"]:
+            (flags,) = struct.unpack(">I", data[xing + 4:xing + 8])
+            if flags & 0x01:
+                (frames,) = struct.unpack(">I", data[xing + 8:xing + 12])
+                samples = frames * samples_per_frame
+                # LAME tag: encoder delay and padding (12 bits each)
+                lame = xing + 8
+                for (flag, length) in [(0x01, 4), (0x02, 4),
+                                       (0x04, 100), (0x08, 4)]:
+                    if flags & flag:
+                        lame += length
+                if data[lame:lame + 4] == b"LAME":
+                    value = int.from_bytes(data[lame + 21:lame + 24], "big")
+                    padding = (value >> 12) + (value & 0xFFF)
+                    if padding < samples:
+                        samples -= padding
+                return samples * 1000 // sample_rate
+        elif data[position + 36:position + 40] == b"VBRI":
+            (frames,) = struct.unpack(
+                ">I", data[position + 50:position + 54])
+            return frames * samples_per_frame * 1000 // sample_rate
+        # Constant bitrate
+        f.seek(0, 2)
+        size = f.tell() - start - position
+        f.seek(-128, 2)
+        if f.read(3) == b"TAG":
+            size -= 128
+        return size * 8 // bitrate
+
+    def __get_mpeg_header(self, data):
+        """
+            Decode MPEG audio frame header
+            @param data as bytes
+            @return (bool, int, int, int, bool, int) as
+                    (MPEG 1, layer, bitrate in kbps, sample rate, mono,
+                     padding) or None if not a valid header
+        """
+        if len(data) != 4:
+            return None
+        (value,) = struct.unpack(">I", data)
+        if value >> 21 != 0x7FF:
+            return None
+        version = (value >> 19) & 0x03
+        layer = 4 - ((value >> 17) & 0x03)
+        bitrate_index = (value >> 12) & 0x0F
+        sample_rate_index = (value >> 10) & 0x03
+        if version == 1 or layer == 4 or bitrate_index in [0, 15] or\
+                sample_rate_index == 3:
+            return None
+        mpeg1 = version == 3
+        bitrate = self.__MPEG_BITRATES[(mpeg1, layer)][bitrate_index]
+        sample_rate = self.__MPEG_SAMPLE_RATES[version][sample_rate_index]
+        mono = (value >> 6) & 0x03 == 3
+        padding = (value >> 9) & 0x01
+        return (mpeg1, layer, bitrate, sample_rate, mono, padding)
+
+    def __read_mp4(self, f, tags):
+        """
+            Read MP4 moov atom
+            @param f as file
+            @param tags as FastTagList
+            @return duration in ms as int
+        """
+        f.seek(0, 2)
+        size = f.tell()
+        position = 0
+        moov = None
+        while position + 8 <= size:
+            f.seek(position)
+            (atom_size, atom_type) = struct.unpack(">I4s", f.read(8))
+            header_size = 8
+            if atom_size == 1:
+                (atom_size,) = struct.unpack(">Q", f.read(8))
+                header_size = 16
+            elif atom_size == 0:
+                atom_size = size - position
+            if atom_size < header_size:
+                raise Exception("Invalid MP4 atom")
+            if atom_type == b"moov":
+                moov = self.__read_block(f, atom_size - header_size)
+                break
+            position += atom_size
+        if moov is None:
+            raise Exception("No moov atom")
+        duration = 0
+        for (atom_type, data) in self.__get_mp4_atoms(moov):
+            if atom_type == b"mvhd":
+                if data[0] == 1:
+                    (timescale, length) = struct.unpack(">IQ", data[20:32])
+                else:
+                    (timescale, length) = struct.unpack(">II", data[12:20])
+                if timescale > 0:
+                    duration = length * 1000 // timescale
+            elif atom_type == b"udta":
+                for (udta_type, udta) in self.__get_mp4_atoms(data):
+                    if udta_type != b"meta":
+                        continue
+                    # meta is a full atom: version and flags first
+                    for (meta_type, meta) in self.__get_mp4_atoms(udta[4:]):
+                        if meta_type == b"ilst":
+                            self.__read_mp4_ilst(meta, tags)
+        return duration
+
+    def __read_mp4_ilst(self, data, tags):
+        """
+            Read MP4 metadata items
+            @param data as bytes
+            @param tags as FastTagList
+        """
+        for (item_type, item) in self.__get_mp4_atoms(data):
+            name = None
+            values = []
+            for (atom_type, atom) in self.__get_mp4_atoms(item):
+                if atom_type == b"name":
+                    name = atom[4:].decode("utf-8", "replace")
+                elif atom_type == b"data":
+                    # Type indicator and locale first
+                    values.append(atom[8:])
+            if item_type in self.__MP4_STRINGS.keys():
+                for value in values:
+                    tags.add(self.__MP4_STRINGS[item_type],
+                             value.decode("utf-8", "replace"))
+            elif item_type in self.__MP4_NUMBERS.keys() and values:
+                if len(values[0]) >= 4:
+                    (number,) = struct.unpack(">H", values[0][2:4])
+                    if number > 0:
+                        tags.add(self.__MP4_NUMBERS[item_type], number)
+            elif item_type == b"tmpo" and values:
+                tags.add("beats-per-minute",
+                         float(int.from_bytes(values[0], "big")))
+            elif item_type == b"\xa9day" and values:
+                tags.add("datetime",
+                         values[0].decode("utf-8", "replace").strip()[0:10])
+            elif item_type == b"gnre":
+                # ID3v1 genre references need GStreamer
+                raise Exception("MP4 gnre atom")
+            elif item_type == b"----" and name in self.__MP4_FREEFORM.keys():
+                for value in values:
+                    tags.add(self.__MP4_FREEFORM[name],
+                             value.decode("utf-8", "replace"))
+
+    def __get_mp4_atoms(self, data):
+        """
+            Get children atoms
+            @param data as bytes
+            @return [(bytes, bytes)] as [(type, content)]
+        """
+        atoms = []
+        position = 0
+        while position + 8 <= len(data):
+            (atom_size, atom_type) = struct.unpack(
+                ">I4s", data[position:position + 8])
+            header_size = 8
+            if atom_size == 1:
+                (atom_size,) = struct.unpack(
+                    ">Q", data[position + 8:position + 16])
+                header_size = 16
+            elif atom_size == 0:
+                atom_size = len(data) - position
+            if atom_size < header_size:
+                raise Exception("Invalid MP4 atom")
+            atoms.append((atom_type,
+                          data[position + header_size:position + atom_size]))
+            position += atom_size
+        return atoms
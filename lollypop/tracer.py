@@ -0,0 +1,289 @@
+# Copyright (c) 2014-2020 Cedric Bellegarde <cedric.bellegarde@adishatz.org>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from gi.repository import GLib
+
+import json
+import re
+from functools import wraps
+from threading import Lock, current_thread, get_ident
+from time import perf_counter
+
+from lollypop.logger import Logger
+
+
+class TracerSpan:
+    """
+        A span recorded on exit
+    """
+
+    def __init__(self, category, name):
+        """
+            Init span
+            @param category as str
+            @param name as str
+        """
+        self.__category = category
+        self.__name = name
+        self.__start = 0
+
+    def __enter__(self):
+        self.__start = perf_counter()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        Tracer.add(self.__category, self.__name,
+                   self.__start, perf_counter())
+
+
+class TracerNullSpan:
+    """
+        Span doing nothing, used when tracing is disabled
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+
+class TracerConnection:
+    """
+        Proxy to a sqlite3 connection recording executed statements
+    """
+
+    def __init__(self, connection):
+        """
+            Init proxy
+            @param connection as sqlite3.Connection
+        """
+        self.__connection = connection
+
+    def execute(self, request, *args):
+        """
+            Execute request
+            @param request as str
+            @return sqlite3.Cursor
+        """
+        with TracerSpan("sql", Tracer.get_sql_name(request)):
+            return self.__connection.execute(request, *args)
+
+    def executemany(self, request, *args):
+        """
+            Execute request for each args
+            @param request as str
+            @return sqlite3.Cursor
+        """
+        with TracerSpan("sql", Tracer.get_sql_name(request)):
+            return self.__connection.executemany(request, *args)
+
+    def commit(self):
+        """
+            Commit connection
+        """
+        with TracerSpan("sql", "COMMIT"):
+            self.__connection.commit()
+
+    def __getattr__(self, attr):
+        return getattr(self.__connection, attr)
+
+
+class Tracer:
+    """
+        Low overhead tracing of hot paths
+        Enabled by setting LOLLYPOP_TRACE to an output file, trace is
+        written in Chrome trace format (chrome://tracing, Perfetto) on quit
+    """
+    PATH = GLib.environ_getenv(GLib.get_environ(), "LOLLYPOP_TRACE")
+    ENABLED = PATH is not None
+    # Keep memory bounded on long sessions, histograms are still updated
+    MAX_EVENTS = 1000000
+    # Histograms buckets: < 0.1ms, < 0.2ms, < 0.4ms, ... >= 0.1 * 2^15 ms
+    BUCKETS = 16
+
+    __NULL_SPAN = TracerNullSpan()
+    __lock = Lock()
+    __origin = perf_counter()
+    __events = []
+    __histograms = {}
+    __threads = {}
+    __installed = False
+
+    @staticmethod
+    def span(category, name):
+        """
+            Get a span to be used as a context manager
+            @param category as str
+            @param name as str
+            @return TracerSpan
+        """
+        if not Tracer.ENABLED:
+            return Tracer.__NULL_SPAN
+        return TracerSpan(category, name)
+
+    @staticmethod
+    def trace(category):
+        """
+            Decorator recording function calls, no overhead if disabled
+            @param category as str
+        """
+        def decorator(f):
+            if not Tracer.ENABLED:
+                return f
+            module = str(getattr(f, "__module__", "")).split(".")[-1]
+            name = "%s.%s" % (module, getattr(f, "__qualname__", str(f)))
+
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    Tracer.add(category, name, start, perf_counter())
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def add(category, name, start, end):
+        """
+            Record a span
+            @param category as str
+            @param name as str
+            @param start as float (perf_counter())
+            @param end as float (perf_counter())
+        """
+        if not Tracer.ENABLED:
+            return
+        duration = end - start
+        tid = get_ident()
+        key = (category, name)
+        bucket = 0
+        limit = 0.0001
+        while duration >= limit and bucket < Tracer.BUCKETS - 1:
+            limit *= 2
+            bucket += 1
+        with Tracer.__lock:
+            if tid not in Tracer.__threads.keys():
+                Tracer.__threads[tid] = current_thread().getName()
+            if len(Tracer.__events) < Tracer.MAX_EVENTS:
+                Tracer.__events.append((category, name, tid,
+                                        start - Tracer.__origin, duration))
+            histogram = Tracer.__histograms.get(key, None)
+            if histogram is None:
+                histogram = [0, 0.0, 0.0, [0] * Tracer.BUCKETS]
+                Tracer.__histograms[key] = histogram
+            histogram[0] += 1
+            histogram[1] += duration
+            histogram[2] = max(histogram[2], duration)
+            histogram[3][bucket] += 1
+
+    @staticmethod
+    def wrap_sql(connection):
+        """
+            Wrap sqlite3 connection if tracing enabled
+            @param connection as sqlite3.Connection
+            @return sqlite3.Connection/TracerConnection
+        """
+        if not Tracer.ENABLED or isinstance(connection, TracerConnection):
+            return connection
+        return TracerConnection(connection)
+
+    @staticmethod
+    def get_sql_name(request):
+        """
+            Get a short name for request
+            @param request as str
+            @return str
+        """
+        return re.sub(r"\s+", " ", request).strip()[:80]
+
+    @staticmethod
+    def install():
+        """
+            Trace main loop callbacks added with GLib.idle_add() and
+            GLib.timeout_add()
+        """
+        if not Tracer.ENABLED or Tracer.__installed:
+            return
+        Tracer.__installed = True
+        Logger.info("Tracing enabled: %s", Tracer.PATH)
+
+        def wrap(add):
+            @wraps(add)
+            def wrapper(*args, **kwargs):
+                args = list(args)
+                for i, arg in enumerate(args):
+                    if callable(arg):
+                        args[i] = Tracer.trace("mainloop")(arg)
+                        break
+                return add(*args, **kwargs)
+            return wrapper
+
+        GLib.idle_add = wrap(GLib.idle_add)
+        GLib.timeout_add = wrap(GLib.timeout_add)
+        GLib.timeout_add_seconds = wrap(GLib.timeout_add_seconds)
+
+    @staticmethod
+    def get_histograms():
+        """
+            Get per operation histograms
+            @return {(category, name): (count, total, max, [int])}
+        """
+        with Tracer.__lock:
+            return {key: (value[0], value[1], value[2], list(value[3]))
+                    for key, value in Tracer.__histograms.items()}
+
+    @staticmethod
+    def export(path=None):
+        """
+            Write Chrome trace JSON and log slowest operations
+            @param path as str
+        """
+        if not Tracer.ENABLED:
+            return
+        if path is None:
+            path = Tracer.PATH
+        with Tracer.__lock:
+            events = list(Tracer.__events)
+            threads = dict(Tracer.__threads)
+        trace_events = []
+        for (tid, name) in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M",
+                                 "pid": 1, "tid": tid,
+                                 "args": {"name": name}})
+        for (category, name, tid, start, duration) in events:
+            trace_events.append({"name": name, "cat": category, "ph": "X",
+                                 "pid": 1, "tid": tid,
+                                 "ts": int(start * 1000000),
+                                 "dur": int(duration * 1000000)})
+        histograms = Tracer.get_histograms()
+        metadata = {}
+        for ((category, name), value) in histograms.items():
+            metadata["%s: %s" % (category, name)] = {
+                "count": value[0],
+                "total_ms": value[1] * 1000,
+                "max_ms": value[2] * 1000,
+                "buckets": value[3]}
+        try:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": trace_events,
+                           "displayTimeUnit": "ms",
+                           "metadata": {"histograms": metadata}}, f)
+        except Exception as e:
+            Logger.error("Tracer::export(): %s", e)
+        items = sorted(histograms.items(), key=lambda x: x[1][1],
+                       reverse=True)
+        for ((category, name), value) in items[:20]:
+            Logger.info("Tracer: %s: %s: %d calls, %.1fms, max %.1fms",
+                        category, name, value[0],
+                        value[1] * 1000, value[2] * 1000)
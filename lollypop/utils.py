@@ -24,6 +24,7 @@ from threading import current_thread
 from functools import wraps
 
 from lollypop.logger import Logger
+from lollypop.tracer import Tracer
 from lollypop.define import App, Type, NetworkAccessACL
 from lollypop.define import StorageType
 from lollypop.shown import ShownLists
@@ -560,7 +561,11 @@ def profile(f):
 
         ret = f(*args, **kwargs)
 
-        elapsed_time = time.perf_counter() - start_time
+        end_time = time.perf_counter()
+        elapsed_time = end_time - start_time
+        if Tracer.ENABLED:
+            Tracer.add("profile", "%s.%s" % (f.__module__, f.__name__),
+                       start_time, end_time)
         Logger.info("%s::%s: execution time %d:%f" % (
             f.__module__, f.__name__, elapsed_time / 60, elapsed_time % 60))
 
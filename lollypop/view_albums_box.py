@@ -46,6 +46,7 @@ class AlbumsBoxView(FlowBoxView, SignalsHelper):
         self._genre_ids = genre_ids
         self._artist_ids = artist_ids
         self._storage_type = storage_type
+        self._virtualized = bool(view_type & ViewType.SCROLLED)
         self.__populate_wanted = True
         if genre_ids and genre_ids[0] < 0:
             if genre_ids[0] == Type.WEB:
@@ -124,8 +125,7 @@ class AlbumsBoxView(FlowBoxView, SignalsHelper):
         """
             Clear view
         """
-        for child in self._box.get_children():
-            child.destroy()
+        FlowBoxView.clear(self)
 
     @property
     def args(self):
@@ -36,6 +36,8 @@ class AlbumsLineView(AlbumsBoxView, HorizontalScrollingHelper):
             @param storage_type as StorageType
         """
         AlbumsBoxView.__init__(self, [], [], storage_type, view_type)
+        # Horizontal line, only a few albums
+        self._virtualized = False
         self.set_property("valign", Gtk.Align.START)
         self._label = Gtk.Label.new()
         self._label.set_ellipsize(Pango.EllipsizeMode.END)
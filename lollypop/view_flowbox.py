@@ -10,7 +10,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gtk
+from gi.repository import Gtk, GLib
 
 from locale import strcoll
 
@@ -33,6 +33,11 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
         LazyLoadingView.__init__(self, storage_type, view_type)
         self._items = []
+        # Only keep children near visible area populated
+        self._virtualized = False
+        self.__virtual_children = set()
+        self.__virtual_window = None
+        self.__virtual_timeout_id = None
         self.__hovered_child = None
         self.__font_height = get_font_height()
         self._box = Gtk.FlowBox()
@@ -43,6 +48,7 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         self._box.set_max_children_per_line(1000)
         self._box.set_property("valign", Gtk.Align.START)
         self._box.connect("child-activated", self._on_child_activated)
+        self._box.connect("size-allocate", self.__on_box_size_allocate)
         self._box.show()
         if App().animations:
             self.__event_controller = Gtk.EventControllerMotion.new(self._box)
@@ -78,6 +84,7 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
         for child in self._box.get_children():
             if child.data == value:
+                self.__virtual_children.discard(child)
                 child.destroy()
                 break
 
@@ -85,6 +92,7 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
             Clear flowbox
         """
+        self.__virtual_children = set()
         for child in self._box.get_children():
             child.destroy()
 
@@ -130,9 +138,42 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
         return strcoll(widget1.sortname, widget2.sortname)
 
+    def _can_lazy_load(self, widget):
+        """
+            Only load children near visible area if virtualized
+            @param widget as Gtk.Widget
+            @return bool
+        """
+        if not self._virtualized:
+            return True
+        if self.__virtual_window is None:
+            self.__virtual_window = self.__get_virtual_window()
+        window = self.__virtual_window
+        if window is None:
+            return True
+        index = widget.get_index()
+        return index >= window[0] and index < window[1]
+
     def _on_child_activated(self, flowbox, child):
         pass
 
+    def _on_populated(self, widget):
+        """
+            Track populated children
+            @param widget as Gtk.Widget
+        """
+        if self._virtualized:
+            self.__virtual_children.add(widget)
+        LazyLoadingView._on_populated(self, widget)
+
+    def _on_value_changed(self, adj):
+        """
+            Update populated children
+            @param adj as Gtk.Adjustment
+        """
+        LazyLoadingView._on_value_changed(self, adj)
+        self.__queue_virtual_update()
+
     def _on_container_folded(self, leaflet, folded):
         """
             Handle libhandy folded status
@@ -181,10 +222,83 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
         """
         LazyLoadingView._on_destroy(self, widget)
         self.__event_controller = None
+        if self.__virtual_timeout_id is not None:
+            GLib.source_remove(self.__virtual_timeout_id)
+            self.__virtual_timeout_id = None
+        self.__virtual_children = set()
 
 #######################
 # PRIVATE             #
 #######################
+    def __get_virtual_window(self):
+        """
+            Get indexes of children to keep populated: visible rows plus
+            one page above and below
+            @return (int, int) or None if layout is unknown
+        """
+        if self.scrolled is None:
+            return None
+        first = self._box.get_child_at_index(0)
+        if first is None:
+            return None
+        coordinates = first.translate_coordinates(self.scrolled, 0, 0)
+        if coordinates is None:
+            return None
+        y = coordinates[1]
+        # Homogeneous flowbox: search first child on second line
+        per_line = 1
+        while True:
+            child = self._box.get_child_at_index(per_line)
+            if child is None:
+                return (0, per_line)
+            coordinates = child.translate_coordinates(self.scrolled, 0, 0)
+            if coordinates is None:
+                return None
+            if coordinates[1] != y:
+                break
+            per_line += 1
+        row_height = coordinates[1] - y
+        if row_height <= 0:
+            return None
+        height = self.scrolled.get_allocated_height()
+        margin = height // row_height + 1
+        first_row = max(0, -y // row_height - margin)
+        last_row = (height - y) // row_height + margin
+        return (first_row * per_line, (last_row + 1) * per_line)
+
+    def __queue_virtual_update(self):
+        """
+            Queue an update of populated children
+        """
+        self.__virtual_window = None
+        if self._virtualized and self.__virtual_timeout_id is None:
+            self.__virtual_timeout_id = GLib.timeout_add(
+                100, self.__update_virtual_children)
+
+    def __update_virtual_children(self):
+        """
+            Populate children near visible area, release others
+        """
+        self.__virtual_timeout_id = None
+        window = self.__virtual_window = self.__get_virtual_window()
+        if window is None:
+            return
+        (start, end) = window
+        # Do not interfere with lazy loading, it only loads visible children
+        if self.is_populated:
+            for child in list(self.__virtual_children):
+                index = child.get_index()
+                if index < start or index >= end:
+                    child.release()
+                    self.__virtual_children.remove(child)
+        for index in range(start, end):
+            child = self._box.get_child_at_index(index)
+            if child is None:
+                break
+            if child.artwork is None:
+                child.populate()
+                self.__virtual_children.add(child)
+
     def __popup_menu(self, child):
         """
             Popup album menu at position
@@ -206,6 +320,14 @@ class FlowBoxView(LazyLoadingView, GesturesHelper):
             set_cursor_type(self.__hovered_child, "left_ptr")
             self.__hovered_child = None
 
+    def __on_box_size_allocate(self, widget, allocation):
+        """
+            Update populated children
+            @param widget as Gtk.Widget
+            @param allocation as Gdk.Rectangle
+        """
+        self.__queue_virtual_update()
+
     def __on_box_motion(self, event_controller, x, y):
         """
             Update current selected child
@@ -116,6 +116,14 @@ class LazyLoadingView(View):
         """
         return None
 
+    def _can_lazy_load(self, widget):
+        """
+            True if widget should be populated by lazy loading
+            @param widget as Gtk.Widget
+            @return bool
+        """
+        return True
+
     def _on_map(self, widget):
         """
             Restore backup and load
@@ -162,8 +170,10 @@ class LazyLoadingView(View):
         if self.__priority_queue:
             widget = self.__priority_queue.pop(0)
             self.__lazy_queue.remove(widget)
-        elif self.__lazy_queue:
+        while widget is None and self.__lazy_queue:
             widget = self.__lazy_queue.pop(0)
+            if not self._can_lazy_load(widget):
+                widget = None
 
         if widget is not None:
             widget.connect("populated", self._on_populated)
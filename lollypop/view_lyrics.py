@@ -117,7 +117,8 @@ class LyricsView(View, SignalsHelper):
         return [
             (App().window.container.widget, "notify::folded",
              "_on_container_folded"),
-            (App().player, "current-changed", "_on_current_changed")
+            (App().player, "current-changed", "_on_current_changed"),
+            (App().player, "next-changed", "_on_next_changed")
         ]
 
     def populate(self, track):
@@ -144,16 +145,7 @@ class LyricsView(View, SignalsHelper):
                     GLib.source_remove(self.__lyrics_timeout_id)
                     self.__lyrics_timeout_id = None
                 if track.storage_type & StorageType.COLLECTION:
-                    from lollypop.tagreader import TagReader, Discoverer
-                    tagreader = TagReader()
-                    discoverer = Discoverer()
-                    try:
-                        info = discoverer.get_info(track.uri)
-                    except:
-                        info = None
-                    if info is not None:
-                        tags = info.get_tags()
-                        lyrics = tagreader.get_lyrics(tags)
+                    lyrics = self.__lyrics_helper.lyrics
         if lyrics:
             self.__lyrics_label.set_text(lyrics)
             self.__lyrics_text = lyrics
@@ -209,6 +201,16 @@ class LyricsView(View, SignalsHelper):
         """
         self.populate(App().player.current_track)
 
+    def _on_next_changed(self, player):
+        """
+            Prefetch lyrics for next track
+            @param player as Player
+        """
+        track = player.next_track
+        if isinstance(track, Track) and track.id is not None and\
+                track.storage_type & StorageType.COLLECTION:
+            self.__lyrics_helper.prefetch(track)
+
     def _on_container_folded(self, leaflet, folded):
         """
             Handle libhandy folded status
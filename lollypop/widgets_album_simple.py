@@ -25,6 +25,10 @@ class AlbumSimpleWidget(Gtk.FlowBoxChild):
         "populated": (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
+    # Content widgets released by hidden albums, reused by others
+    __POOL = []
+    __POOL_SIZE = 200
+
     def __init__(self, album, genre_ids, artist_ids, view_type, font_height):
         """
             Init simple album widget
@@ -43,6 +47,7 @@ class AlbumSimpleWidget(Gtk.FlowBoxChild):
         self.__view_type = view_type
         self.__font_height = font_height
         self.set_property("halign", Gtk.Align.CENTER)
+        self.connect("destroy", self.__on_destroy)
         if view_type & ViewType.ALBUM:
             self.set_property("margin", MARGIN_MEDIUM)
         else:
@@ -64,18 +69,26 @@ class AlbumSimpleWidget(Gtk.FlowBoxChild):
             Populate widget content
         """
         if self.__artwork is None:
-            grid = Gtk.Grid()
-            grid.set_orientation(Gtk.Orientation.VERTICAL)
-            grid.set_row_spacing(MARGIN_MEDIUM)
-            self.__label = Gtk.Label.new()
-            self.__label.set_justify(Gtk.Justification.CENTER)
-            self.__label.set_ellipsize(Pango.EllipsizeMode.END)
-            self.__label.set_property("halign", Gtk.Align.CENTER)
-            self.__label.set_property("has-tooltip", True)
-            self.__label.connect("query-tooltip", on_query_tooltip)
+            if self.__POOL:
+                (grid, self.__artwork, self.__label) = self.__POOL.pop()
+            else:
+                grid = Gtk.Grid()
+                grid.set_orientation(Gtk.Orientation.VERTICAL)
+                grid.set_row_spacing(MARGIN_MEDIUM)
+                self.__label = Gtk.Label.new()
+                self.__label.set_justify(Gtk.Justification.CENTER)
+                self.__label.set_ellipsize(Pango.EllipsizeMode.END)
+                self.__label.set_property("halign", Gtk.Align.CENTER)
+                self.__label.set_property("has-tooltip", True)
+                self.__label.connect("query-tooltip", on_query_tooltip)
+                self.__artwork = Gtk.Image.new()
+                grid.add(self.__artwork)
+                grid.add(self.__label)
             style_context = self.__label.get_style_context()
             if self.__view_type & ViewType.SMALL:
                 style_context.add_class("text-small")
+            else:
+                style_context.remove_class("text-small")
             album_name = GLib.markup_escape_text(self.__album.name)
             if self.__view_type & ViewType.ALBUM:
                 self.__label.set_markup(album_name)
@@ -93,16 +106,31 @@ class AlbumSimpleWidget(Gtk.FlowBoxChild):
                 self.__label.set_markup(
                     "<b>%s</b>\n<span alpha='50000'>%s</span>" % (album_name,
                                                                   artist_name))
-            self.__artwork = Gtk.Image.new()
-            grid.add(self.__artwork)
-            grid.add(self.__label)
             self.set_artwork()
             self.set_selection()
-            self.connect("destroy", self.__on_destroy)
             self.add(grid)
         else:
             self.set_artwork()
 
+    def release(self):
+        """
+            Release widget content, widget keeps its size
+        """
+        if self.__artwork is None:
+            return
+        grid = self.get_child()
+        self.__artwork.set_from_surface(None)
+        self.__artwork.unset_state_flags(Gtk.StateFlags.SELECTED |
+                                         Gtk.StateFlags.VISITED)
+        self.__artwork.get_style_context().remove_class("load-animation")
+        self.remove(grid)
+        if len(self.__POOL) < self.__POOL_SIZE:
+            self.__POOL.append((grid, self.__artwork, self.__label))
+        else:
+            grid.destroy()
+        self.__artwork = None
+        self.__label = None
+
     def update_art_size(self):
         """
             Update art size based on current window state
@@ -30,6 +30,8 @@ class CollectionWebService(SaveWebHelper,
     """
     MIN_ITEMS_PER_STORAGE_TYPE = 20
     MAX_ITEMS_PER_STORAGE_TYPE = 50
+    # Web requests running in parallel per storage type
+    MAX_FETCHES = 4
     __METHODS = {
         StorageType.SPOTIFY_SIMILARS:
             SpotifyCollectionWebService.search_similar_albums,
@@ -96,17 +98,27 @@ class CollectionWebService(SaveWebHelper,
                     storage_types.append(storage_type)
             # Update needed storage types
             if storage_types:
-                for storage_type in storage_types:
-                    if self.__cancellable.is_cancelled():
-                        raise Exception("cancelled")
-                    self.__METHODS[storage_type](self, self.__cancellable)
+                App().task_helper.map_sync(self.__populate_storage_type,
+                                           storage_types,
+                                           len(storage_types))
+                if self.__cancellable.is_cancelled():
+                    raise Exception("cancelled")
                 self.clean_old_albums(storage_types)
-                App().artists.update_featuring()
+                App().scanner.update_featuring()
         except Exception as e:
             Logger.warning("CollectionWebService::__populate_db(): %s", e)
         self.__is_running = False
         Logger.info("Collection download finished")
 
+    def __populate_storage_type(self, storage_type):
+        """
+            Add albums for storage type
+            @param storage_type as StorageType
+        """
+        if self.__cancellable.is_cancelled():
+            raise Exception("cancelled")
+        self.__METHODS[storage_type](self, self.__cancellable)
+
     def clean_old_albums(self, storage_types):
         """
             Clean old albums from DB
@@ -121,11 +133,12 @@ class CollectionWebService(SaveWebHelper,
             if diff > 0:
                 album_ids = App().albums.get_oldest_for_storage_type(
                     storage_type, diff)
-                for album_id in album_ids:
-                    # EPHEMERAL with not tracks will be cleaned below
-                    App().albums.set_storage_type(album_id,
-                                                  StorageType.EPHEMERAL)
-                    App().tracks.remove_album(album_id, False)
+                App().scanner.add_featuring_album_ids(album_ids)
+                # EPHEMERAL with not tracks will be cleaned below
+                App().albums.set_storage_type_for_ids(album_ids,
+                                                      StorageType.EPHEMERAL,
+                                                      False)
+                App().tracks.remove_albums(album_ids, False)
         # On cancel, clean not needed, done in Application::quit()
         if not self.__cancellable.is_cancelled():
             App().tracks.clean(False)
@@ -43,19 +43,32 @@ class DeezerCollectionWebService(DeezerWebHelper):
                 decode = json.loads(data.decode("utf-8"))
                 for album in decode["data"]:
                     album_ids.append(album["id"])
-            for album_id in album_ids:
-                if cancellable.is_cancelled():
-                    raise Exception("Cancelled")
-                payload = DeezerWebHelper.get_album_payload(
-                    self, album_id, cancellable)
-                if payload is None:
-                    continue
-                lollypop_payload = DeezerWebHelper.lollypop_album_payload(
-                    self, payload)
-                self.save_album_payload_to_db(lollypop_payload,
-                                              StorageType.DEEZER_CHARTS,
-                                              True,
-                                              cancellable)
+            payloads = App().task_helper.map_sync(
+                self.__get_lollypop_album_payload, album_ids,
+                self.MAX_FETCHES, cancellable)
+            self.save_album_payloads_to_db(
+                [payload for payload in payloads if payload is not None],
+                StorageType.DEEZER_CHARTS,
+                True,
+                cancellable)
         except Exception as e:
             Logger.warning(
                 "DeezerCollectionWebService::search_charts(): %s", e)
+
+#######################
+# PRIVATE             #
+#######################
+    def __get_lollypop_album_payload(self, album_id, cancellable):
+        """
+            Get lollypop payload for album
+            @param album_id as int
+            @param cancellable as Gio.Cancellable
+            @return {}/None
+        """
+        if cancellable.is_cancelled():
+            raise Exception("Cancelled")
+        payload = DeezerWebHelper.get_album_payload(
+            self, album_id, cancellable)
+        if payload is None:
+            return None
+        return DeezerWebHelper.lollypop_album_payload(self, payload)
@@ -12,7 +12,7 @@
 
 import json
 from time import time
-from random import shuffle
+from random import shuffle, choice
 from locale import getdefaultlocale
 
 from lollypop.logger import Logger
@@ -38,32 +38,33 @@ class SpotifyCollectionWebService(SpotifyWebHelper):
             @param cancellable as Gio.Cancellable
         """
         Logger.info("Get similar albums from Spotify")
+        from lollypop.similars import Similars
         from lollypop.similars_spotify import SpotifySimilars
+        cache = Similars()
         similars = SpotifySimilars()
         try:
             storage_type = get_default_storage_type()
             artists = App().artists.get_randoms(
                 self.MAX_ITEMS_PER_STORAGE_TYPE, storage_type)
-            artist_names = [name for (aid, name, sortname) in artists]
-            similar_ids = similars.get_similar_artist_ids(artist_names,
-                                                          cancellable)
+            names = [name for (aid, name, sortname) in artists]
+            similar_ids = []
+            for cached in App().task_helper.map_sync(
+                    self.__get_cached_similar_spotify_ids, names,
+                    self.MAX_FETCHES, cache, similars, cancellable):
+                if cached is not None:
+                    similar_ids += [similar for (similar, similar_id)
+                                    in cached]
             # Add albums
             shuffle(similar_ids)
-            for similar_id in similar_ids[:self.MAX_ITEMS_PER_STORAGE_TYPE]:
-                albums_payload = self.__get_artist_albums_payload(similar_id,
-                                                                  cancellable)
-                shuffle(albums_payload)
-                for album in albums_payload:
-                    if cancellable.is_cancelled():
-                        raise Exception("Cancelled")
-                    lollypop_payload = SpotifyWebHelper.lollypop_album_payload(
-                        self, album)
-                    self.save_album_payload_to_db(
-                                           lollypop_payload,
-                                           StorageType.SPOTIFY_SIMILARS,
-                                           True,
-                                           cancellable)
-                    break
+            payloads = App().task_helper.map_sync(
+                self.__get_random_album_payload,
+                similar_ids[:self.MAX_ITEMS_PER_STORAGE_TYPE],
+                self.MAX_FETCHES, cancellable)
+            self.save_album_payloads_to_db(
+                [payload for payload in payloads if payload is not None],
+                StorageType.SPOTIFY_SIMILARS,
+                True,
+                cancellable)
         except Exception as e:
             Logger.warning("SpotifyWebService::search_similar_albums(): %s", e)
 
@@ -89,17 +90,16 @@ class SpotifyCollectionWebService(SpotifyWebHelper):
                     uri, headers, cancellable)
                 if status:
                     decode = json.loads(data.decode("utf-8"))
-                    for album in decode["albums"]["items"]:
-                        if cancellable.is_cancelled():
-                            raise Exception("Cancelled")
-                        lollypop_payload =\
-                            SpotifyWebHelper.lollypop_album_payload(
-                                self, album)
-                        self.save_album_payload_to_db(
-                                             lollypop_payload,
-                                             StorageType.SPOTIFY_NEW_RELEASES,
-                                             True,
-                                             cancellable)
+                    payloads = [SpotifyWebHelper.lollypop_album_payload(
+                                    self, album)
+                                for album in decode["albums"]["items"]]
+                    self.save_album_payloads_to_db(
+                                         payloads,
+                                         StorageType.SPOTIFY_NEW_RELEASES,
+                                         True,
+                                         cancellable)
+                    if cancellable.is_cancelled():
+                        raise Exception("Cancelled")
                     # Check if storage type needs to be updated
                     # Check if albums newer than a week are enough
                     timestamp = time() - 604800
@@ -114,6 +114,50 @@ class SpotifyCollectionWebService(SpotifyWebHelper):
 #######################
 # PRIVATE             #
 #######################
+    def __get_cached_similar_spotify_ids(self, artist_name, cache,
+                                         similars, cancellable):
+        """
+            Get similar artists Spotify ids, from cache if possible
+            @param artist_name as str
+            @param cache as Similars
+            @param similars as SpotifySimilars
+            @param cancellable as Gio.Cancellable
+            @return [(str, None)]
+        """
+        if cancellable.is_cancelled():
+            raise Exception("Cancelled")
+        return cache.get_cached(artist_name, "SPOTIFY_IDS",
+                                self.__get_similar_spotify_ids,
+                                cancellable, similars)
+
+    def __get_random_album_payload(self, spotify_id, cancellable):
+        """
+            Get lollypop payload for a random artist album
+            @param spotify_id as str
+            @param cancellable as Gio.Cancellable
+            @return {}/None
+        """
+        if cancellable.is_cancelled():
+            raise Exception("Cancelled")
+        albums_payload = self.__get_artist_albums_payload(spotify_id,
+                                                          cancellable)
+        if not albums_payload:
+            return None
+        return SpotifyWebHelper.lollypop_album_payload(
+            self, choice(albums_payload))
+
+    def __get_similar_spotify_ids(self, artist_name, cancellable, similars):
+        """
+            Get similar artists Spotify ids
+            @param artist_name as str
+            @param cancellable as Gio.Cancellable
+            @param similars as SpotifySimilars
+            @return [(str, None)]
+        """
+        return [(spotify_id, None)
+                for spotify_id in similars.get_similar_artist_ids(
+                    [artist_name], cancellable)]
+
     def __get_artist_albums_payload(self, spotify_id, cancellable):
         """
             Get albums payload for artist
@@ -15,6 +15,7 @@ from gi.repository import Gio, GLib
 # from lollypop.utils import get_network_available
 from lollypop.define import NetworkAccessACL, App, Type
 from lollypop.ws_token import TokenWebService
+from lollypop.database_scrobbles import ScrobblesDatabase
 from lollypop.logger import Logger
 
 
@@ -28,6 +29,7 @@ class DirectorWebService:
             Init object
         """
         self.__token_ws = TokenWebService()
+        self.__scrobbles = ScrobblesDatabase()
         self.__collection_ws = None
         self.__lastfm_ws = None
         self.__librefm_ws = None
@@ -102,6 +104,14 @@ class DirectorWebService:
         """
         return self.__token_ws
 
+    @property
+    def scrobbles(self):
+        """
+            Get scrobble journal
+            @return ScrobblesDatabase
+        """
+        return self.__scrobbles
+
     @property
     def collection_ws(self):
         """
@@ -14,12 +14,12 @@ from gi.repository import Soup, Gio
 
 import json
 from hashlib import md5
-from pickle import load, dump
+from threading import Lock
 
 from lollypop.helper_passwords import PasswordsHelper
 from lollypop.logger import Logger
 from lollypop.utils import get_network_available
-from lollypop.define import LOLLYPOP_DATA_PATH, App
+from lollypop.define import App
 from lollypop.define import LASTFM_API_KEY, LASTFM_API_SECRET
 
 
@@ -28,13 +28,16 @@ class LastFMWebService:
         Handle scrobbling to Last.fm and all authenticated API calls
     """
 
+    # Last.fm accepts up to 50 scrobbles per call
+    __BATCH_SIZE = 50
+
     def __init__(self, name):
         """
             Init service
             @param name as str
         """
         self.__name = name
-        self.__queue = []
+        self.__submit_lock = Lock()
         if name == "LIBREFM":
             self.__uri = "https://libre.fm/2.0/"
         else:
@@ -43,28 +46,17 @@ class LastFMWebService:
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (import old queue, submit pending scrobbles)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("LastFMWebService::__init__(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        App().task_helper.run(self.__import_queue)
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, pending scrobbles are already on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("LastFMWebService::stop: %s", e)
         return True
 
     def listen(self, track, timestamp):
@@ -73,10 +65,7 @@ class LastFMWebService:
             @param track as Track
             @param timestamp as int
         """
-        if App().settings.get_value("disable-scrobbling") or\
-                not get_network_available():
-            self.__queue.append((track, timestamp))
-        elif track.id is not None and track.id >= 0:
+        if track.id is not None and track.id >= 0:
             App().task_helper.run(self.__listen, track, timestamp)
 
     def playing_now(self, track):
@@ -186,27 +175,51 @@ class LastFMWebService:
         api_sig += LASTFM_API_SECRET
         return md5(api_sig.encode("utf-8")).hexdigest()
 
+    def __import_queue(self):
+        """
+            Import queue saved by previous versions into journal
+        """
+        App().ws_director.scrobbles.import_queue(self.__name)
+        self.__submit()
+
     def __listen(self, track, timestamp):
         """
-            Scrobble track
+            Journal scrobble and submit pending scrobbles
             @param track as Track
             @param timestamp as int
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
+        App().ws_director.scrobbles.add(self.__name, track, timestamp)
+        self.__submit()
+
+    def __submit(self):
+        """
+            Submit pending scrobbles from journal in batches
+        """
+        if App().settings.get_value("disable-scrobbling") or\
+                not get_network_available() or\
+                not self.__submit_lock.acquire(False):
+            return
         try:
-            for (track, timestamp) in tracks:
+            scrobbles = App().ws_director.scrobbles
+            while not self.__cancellable.is_cancelled():
+                listens = scrobbles.get_pending(self.__name,
+                                                self.__BATCH_SIZE)
+                if not listens:
+                    break
                 token = App().ws_director.token_ws.get_token(
                     self.__name, self.__cancellable)
                 if token is None:
-                    return
+                    break
+                listen_ids = [listen["id"] for listen in listens]
                 args = self.__get_args_for_method("track.scrobble")
-                args.append(("artist", track.artists[0]))
-                args.append(("track", track.name))
-                args.append(("album", track.album.name))
-                if track.mbid and track.mbid.find(":") == -1:
-                    args.append(("mbid", track.mbid))
-                args.append(("timestamp", str(timestamp)))
+                for (i, listen) in enumerate(listens):
+                    args.append(("artist[%s]" % i, listen["artist"]))
+                    args.append(("track[%s]" % i, listen["title"]))
+                    args.append(("album[%s]" % i, listen["album"]))
+                    if listen["mb_track_id"]:
+                        args.append(("mbid[%s]" % i, listen["mb_track_id"]))
+                    args.append(("timestamp[%s]" % i,
+                                 str(listen["timestamp"])))
                 args.append(("sk", token))
                 api_sig = self.__get_sig_for_args(args)
                 args.append(("api_sig", api_sig))
@@ -221,8 +234,15 @@ class LastFMWebService:
                                                            self.__cancellable)
                 if data is not None:
                     Logger.debug("%s: %s", self.__uri, data)
+                if data is not None and data.find(b'status="ok"') != -1:
+                    scrobbles.set_delivered(self.__name, listen_ids)
+                else:
+                    scrobbles.set_failed(self.__name, listen_ids)
+                    break
         except Exception as e:
-            Logger.error("LastFMWebService::__listen(): %s" % e)
+            Logger.error("LastFMWebService::__submit(): %s" % e)
+        finally:
+            self.__submit_lock.release()
 
     def __playing_now(self, track):
         """
@@ -14,10 +14,10 @@
 from gi.repository import Soup, GObject, Gio
 
 import json
-from pickle import load, dump
+from threading import Lock
 
 from lollypop.logger import Logger
-from lollypop.define import App, LOLLYPOP_DATA_PATH
+from lollypop.define import App
 from lollypop.utils import get_network_available
 
 
@@ -30,6 +30,9 @@ class ListenBrainzWebService(GObject.GObject):
 
     user_token = GObject.Property(type=str, default="plop")
 
+    # Listens per import request
+    __BATCH_SIZE = 100
+
     def __init__(self):
         """
             Init ListenBrainz object
@@ -38,35 +41,24 @@ class ListenBrainzWebService(GObject.GObject):
         try:
             self.__uri = "https://api.listenbrainz.org/1/submit-listens"
             self.__name = "listenbrainz"
-            self.__queue = []
+            self.__submit_lock = Lock()
             self.start()
         except Exception as e:
             Logger.info("LastFM::__init__(): %s", e)
 
     def start(self):
         """
-            Start web service (load save queue)
+            Start web service (import old queue, submit pending listens)
         """
-        try:
-            self.__cancellable = Gio.Cancellable()
-            self.__queue = load(
-                open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name, "rb"))
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::__init__(): %s", e)
-            self.__queue = []
+        self.__cancellable = Gio.Cancellable()
+        App().task_helper.run(self.__import_queue)
 
     def stop(self):
         """
-            Stop current tasks and save queue to disk
+            Stop current tasks, pending listens are already on disk
             @return bool
         """
         self.__cancellable.cancel()
-        try:
-            with open(LOLLYPOP_DATA_PATH + "/%s_queue.bin" % self.__name,
-                      "wb") as f:
-                dump(list(self.__queue), f)
-        except Exception as e:
-            Logger.info("ListenBrainzWebService::stop: %s", e)
         return True
 
     def listen(self, track, timestamp):
@@ -78,9 +70,6 @@ class ListenBrainzWebService(GObject.GObject):
         if not App().settings.get_value(
                 "listenbrainz-user-token").get_string():
             return
-        elif App().settings.get_value("disable-scrobbling") or\
-                not get_network_available():
-            self.__queue.append((track, timestamp))
         elif track.id is not None and track.id >= 0:
             App().task_helper.run(self.__listen, track, timestamp)
 
@@ -110,37 +99,62 @@ class ListenBrainzWebService(GObject.GObject):
 #######################
 # PRIVATE             #
 #######################
+    def __import_queue(self):
+        """
+            Import queue saved by previous versions into journal
+        """
+        App().ws_director.scrobbles.import_queue(self.__name)
+        self.__submit()
+
     def __listen(self, track, timestamp):
         """
-            Scrobble track
+            Journal listen and submit pending listens
             @param track as Track
             @param timestamp as int
         """
-        tracks = self.__queue + [(track, timestamp)]
-        self.__queue = []
+        App().ws_director.scrobbles.add(self.__name, track, timestamp)
+        self.__submit()
+
+    def __submit(self):
+        """
+            Submit pending listens from journal in batches
+        """
+        if App().settings.get_value("disable-scrobbling") or\
+                not get_network_available() or\
+                not App().settings.get_value(
+                    "listenbrainz-user-token").get_string() or\
+                not self.__submit_lock.acquire(False):
+            return
         try:
-            for (track, timestamp) in tracks:
-                payload = self.__get_payload(track)
-                payload[0]["listened_at"] = timestamp
+            scrobbles = App().ws_director.scrobbles
+            while not self.__cancellable.is_cancelled():
+                listens = scrobbles.get_pending(self.__name,
+                                                self.__BATCH_SIZE)
+                if not listens:
+                    break
+                listen_ids = [listen["id"] for listen in listens]
+                payload = []
+                for listen in listens:
+                    item = self.__get_payload(listen)
+                    item["listened_at"] = listen["timestamp"]
+                    payload.append(item)
                 post_data = {
-                    "listen_type": "single",
+                    "listen_type": "single" if len(payload) == 1
+                    else "import",
                     "payload": payload
                 }
-                body = json.dumps(post_data).encode("utf-8")
-                msg = Soup.Message.new("POST", self.__uri)
-                msg.set_request("application/json",
-                                Soup.MemoryUse.STATIC,
-                                body)
-                msg.request_headers.append("Accept-Charset", "utf-8")
-                msg.request_headers.append("Authorization",
-                                           "Token %s" % self.user_token)
-                msg.request_headers.append("Content-Type", "application/json")
-                data = App().task_helper.send_message_sync(msg,
-                                                           self.__cancellable)
-                if data is not None:
-                    Logger.debug("%s: %s", self.__uri, data)
+                data = self.__send(post_data)
+                if data is not None and\
+                        json.loads(data.decode("utf-8")).get(
+                            "status") == "ok":
+                    scrobbles.set_delivered(self.__name, listen_ids)
+                else:
+                    scrobbles.set_failed(self.__name, listen_ids)
+                    break
         except Exception as e:
-            Logger.error("ListenBrainzWebService::__listen(): %s" % e)
+            Logger.error("ListenBrainzWebService::__submit(): %s" % e)
+        finally:
+            self.__submit_lock.release()
 
     def __playing_now(self, track):
         """
@@ -148,46 +162,63 @@ class ListenBrainzWebService(GObject.GObject):
             @param track as Track
         """
         try:
-            payload = self.__get_payload(track)
+            listen = {"artist": track.artists[0],
+                      "title": track.title,
+                      "album": track.album_name,
+                      "mb_artist_ids": [mbid for mbid in track.mb_artist_ids
+                                        if mbid],
+                      "mb_album_id": track.album.mb_album_id,
+                      "mb_track_id": track.mb_track_id,
+                      "tracknumber": track.number}
             post_data = {
                 "listen_type": "playing_now",
-                "payload": payload
+                "payload": [self.__get_payload(listen)]
             }
-            body = json.dumps(post_data).encode("utf-8")
-            msg = Soup.Message.new("POST", self.__uri)
-            msg.set_request("application/json",
-                            Soup.MemoryUse.STATIC,
-                            body)
-            msg.request_headers.append("Accept-Charset", "utf-8")
-            msg.request_headers.append("Authorization",
-                                       "Token %s" % self.user_token)
-            data = App().task_helper.send_message_sync(msg,
-                                                       self.__cancellable)
-            if data is not None:
-                Logger.debug("%s: %s", self.__uri, data)
+            self.__send(post_data)
         except Exception as e:
             Logger.error("ListenBrainzWebService::__playing_now(): %s" % e)
 
-    def __get_payload(self, track):
-        """
-            Build payload from track
-            @param track as Track
-            @return payload as []
+    def __send(self, post_data):
+        """
+            Send data to ListenBrainz
+            @param post_data as {}
+            @return bytes/None
+        """
+        # Do not use self.user_token, may not be bound yet on start
+        user_token = App().settings.get_value(
+            "listenbrainz-user-token").get_string()
+        body = json.dumps(post_data).encode("utf-8")
+        msg = Soup.Message.new("POST", self.__uri)
+        msg.set_request("application/json",
+                        Soup.MemoryUse.STATIC,
+                        body)
+        msg.request_headers.append("Accept-Charset", "utf-8")
+        msg.request_headers.append("Authorization",
+                                   "Token %s" % user_token)
+        data = App().task_helper.send_message_sync(msg,
+                                                   self.__cancellable)
+        if data is not None:
+            Logger.debug("%s: %s", self.__uri, data)
+        return data
+
+    def __get_payload(self, listen):
+        """
+            Build payload from listen
+            @param listen as {}
+            @return payload as {}
         """
         payload = {
             "track_metadata": {
-                "artist_name": track.artists[0],
-                "track_name": track.title,
-                "release_name": track.album_name,
+                "artist_name": listen["artist"],
+                "track_name": listen["title"],
+                "release_name": listen["album"],
                 "additional_info": {
                     "listening_from": "Lollypop",
-                    "artist_mbids": [
-                        mbid for mbid in track.mb_artist_ids if mbid
-                    ],
-                    "release_mbid": track.album.mb_album_id,
-                    "recording_mbid": track.mb_track_id,
-                    "tracknumber": track.number
+                    "artist_mbids": listen["mb_artist_ids"],
+                    "release_mbid": listen["mb_album_id"],
+                    "recording_mbid": listen["mb_track_id"],
+                    "tracknumber": listen["tracknumber"]
                 }
             }
         }
-        return [payload]
+        return payload